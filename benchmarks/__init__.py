@@ -0,0 +1,13 @@
+"""Performance benchmarks of the rayvision_api.
+
+The benchmarks rely on ``pytest-benchmark`` and are not collected by the
+default test run, run them explicitly::
+
+    pytest benchmarks
+
+Each run is saved in ``.benchmarks``, compare the last run with the
+previous one and fail on a mean 10% slower with::
+
+    pytest benchmarks --benchmark-compare --benchmark-compare-fail=mean:10%
+
+"""
@@ -0,0 +1,43 @@
+"""Store the benchmark results and serve the local farm."""
+
+# Import built-in modules
+import logging
+import os
+
+# pylint: disable=import-error
+import pytest
+
+# The folder of the saved runs.
+STORAGE = os.path.join(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__))), '.benchmarks')
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_configure(config):
+    """Save every run, before pytest-benchmark reads its options."""
+    option = config.option
+    if not hasattr(option, 'benchmark_autosave'):
+        return
+    if option.benchmark_storage == 'file://./.benchmarks':
+        option.benchmark_storage = 'file://{}'.format(STORAGE)
+    disabled = option.benchmark_disable or option.benchmark_skip
+    if not (option.benchmark_save or option.benchmark_autosave or disabled):
+        from pytest_benchmark.utils import get_tag  # pylint: disable=import-error
+        option.benchmark_autosave = get_tag()
+
+
+@pytest.fixture(name='farm', scope='module')
+def fixture_farm():
+    """Serve a local farm for the module."""
+    from rayvision_api.testing import MockFarm
+    with MockFarm() as farm:
+        yield farm
+
+
+@pytest.fixture(name='api', scope='module')
+def fixture_api(farm):
+    """Get an API logged in the local farm."""
+    from rayvision_api import RayvisionAPI
+    return RayvisionAPI(access_id=farm.access_id, access_key=farm.access_key,
+                        domain=farm.domain, platform='2', protocol='http',
+                        logger=logging.getLogger(__name__))
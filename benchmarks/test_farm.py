@@ -0,0 +1,67 @@
+"""Benchmark the client end to end against the local farm."""
+
+import copy
+
+# pylint: disable=import-error
+import pytest
+
+pytest.importorskip('pytest_benchmark')
+
+# pylint: disable=wrong-import-position
+from rayvision_api.task.check import RayvisionCheck
+
+HARDWARE_CONFIG = {'model': 'Default', 'ram': '64GB', 'gpuNum': None}
+
+TASK_INFO = {
+    'task_info': {'cg_id': '2000', 'task_id': '', 'user_id': '',
+                  'project_id': '', 'project_name': '',
+                  'hardwareConfigId': '', 'ram': '', 'graphics_cards_num': '',
+                  'frames_per_task': '1', 'input_cg_file': 'scene.mb'},
+    'software_config': {'cg_name': 'Maya', 'cg_version': '2018',
+                        'plugins': {}},
+    'scene_info': {'defaultRenderLayer': {'renderable': '1'}},
+}
+
+
+def _submit(api, farm, frames):
+    """Submit a task with the given number of frames."""
+    farm.state.frames_per_task = frames
+    task_id = api.task.create_task()['taskIdList'][0]
+    api.task.submit_task(task_id)
+    return task_id
+
+
+def test_post(benchmark, api):
+    """One signed request answered by the farm."""
+    benchmark(api.connect.post, api.connect.url.queryTaskInfo,
+              {'taskIds': [1]})
+
+
+@pytest.mark.parametrize('concurrency', [None, 8], ids=['serial', 'pool8'])
+@pytest.mark.parametrize('frames', [1000, 10000, 100000])
+def test_get_all_frames(benchmark, api, farm, frames, concurrency):
+    """All the frames of a task, 100 frames per page."""
+    task_id = _submit(api, farm, frames)
+    result = benchmark.pedantic(api.query.get_all_frames, args=(task_id,),
+                                kwargs={'concurrency': concurrency,
+                                        'end_page': 5000},
+                                rounds=1 if frames >= 100000 else 3)
+    assert len(result) == frames
+
+
+def test_check_execute(benchmark, api):
+    """Check a task in memory, the reference data requested each time."""
+    def _execute():
+        return RayvisionCheck(api).execute(HARDWARE_CONFIG,
+                                           copy.deepcopy(TASK_INFO),
+                                           in_memory=True)
+
+    benchmark(_execute)
+
+
+def test_submit_by_data(benchmark, api):
+    """Create, check, upload and submit one task."""
+    def _submit_by_data():
+        return api.submit_by_data(copy.deepcopy(TASK_INFO), HARDWARE_CONFIG)
+
+    assert benchmark(_submit_by_data)
@@ -0,0 +1,28 @@
+"""Benchmark the overhead of the instrumentation of the requests."""
+
+import re
+
+# pylint: disable=import-error
+import pytest
+
+pytest.importorskip('pytest_benchmark')
+pytest.importorskip('requests_mock')
+
+# pylint: disable=wrong-import-position
+import requests_mock
+
+from rayvision_api.connect import Connect
+from rayvision_api.metrics import MetricsAggregator
+
+
+@pytest.mark.parametrize('instrumentation', [None, MetricsAggregator()],
+                         ids=['disabled', 'aggregator'])
+def test_post(benchmark, instrumentation):
+    """One mocked request, with and without the instrumentation."""
+    connect = Connect('test_access_id', 'test_access_key', 'https',
+                      'task.renderbus.com', '2',
+                      instrumentation=instrumentation)
+    with requests_mock.Mocker() as mocker:
+        mocker.register_uri('POST', re.compile('.+'),
+                            json={'code': 200, 'data': {}})
+        benchmark(connect.post, connect.url.queryTaskInfo, {'taskIds': [1]})
@@ -0,0 +1,57 @@
+"""Benchmark the canonicalisation of the signed request string."""
+
+import copy
+
+# pylint: disable=import-error
+import pytest
+
+pytest.importorskip('pytest_benchmark')
+
+# pylint: disable=wrong-import-position
+from rayvision_api import signature
+from rayvision_api.constants import HEADERS
+
+HEADER = dict(HEADERS, accessId='test_access_id', platform='2',
+              UTCTimestamp='1602979200', nonce='123456')
+
+BODIES = {
+    'small': {'taskIds': [1658434]},
+    'large': {
+        'taskId': 1658434,
+        'renderEnvs': [{'envId': index, 'pluginIds': list(range(20)),
+                        'config': {'name': 'env{}'.format(index),
+                                   'enabled': True}}
+                       for index in range(500)],
+    },
+}
+
+
+def _legacy_headers_body_str(domain_name, api_url, header, body):
+    """The canonicalisation before the copy-free rewrite."""
+    header = copy.deepcopy(header)
+    body = copy.deepcopy(body)
+    try:
+        header.pop('signature')
+        header.pop('Content-Type')
+    except KeyError:
+        pass
+    header_body_dict = signature.headers_body_sort(header, body)
+    return '[POST]{0}:{1}&{2}'.format(domain_name, api_url, '&'.join([
+        '{0}={1}'.format(key, value)
+        for key, value in header_body_dict.items()]))
+
+
+@pytest.mark.parametrize('size', sorted(BODIES))
+def test_headers_body_str_legacy(benchmark, size):
+    """Four deep copies and a recursive flatten per call."""
+    benchmark(_legacy_headers_body_str, 'task.renderbus.com', '/api/url',
+              HEADER, BODIES[size])
+
+
+@pytest.mark.parametrize('size', sorted(BODIES))
+def test_headers_body_str(benchmark, size):
+    """The copy-free single traversal."""
+    result = benchmark(signature.generate_headers_body_str,
+                       'task.renderbus.com', '/api/url', HEADER, BODIES[size])
+    assert result == _legacy_headers_body_str('task.renderbus.com',
+                                              '/api/url', HEADER, BODIES[size])
@@ -0,0 +1,70 @@
+"""Benchmark adding many assets to an upload json."""
+
+import json
+
+# pylint: disable=import-error
+import pytest
+
+pytest.importorskip('pytest_benchmark')
+
+# pylint: disable=wrong-import-position
+from rayvision_api.utils import add_upload_assets
+from rayvision_api.utils import append_to_upload
+from rayvision_api.utils import check_upload_file
+from rayvision_api.utils import convert_path
+
+
+def _paths(count, prefix='/project/textures'):
+    """Generate the paths without holding them in memory."""
+    return ('{}/texture_{}.png'.format(prefix, index)
+            for index in range(count))
+
+
+def _manifest(count):
+    """An upload json with half of the paths already uploaded."""
+    return {'asset': [{'local': path, 'server': convert_path(path)}
+                      for path in _paths(count // 2)]}
+
+
+def _legacy_add(upload_info, files_paths):
+    """The linear scan of each path before the set index."""
+    for files_path in files_paths:
+        if check_upload_file(files_path, upload_info):
+            continue
+        upload_info['asset'].append({
+            'local': files_path,
+            'server': convert_path(files_path),
+        })
+
+
+@pytest.mark.parametrize('count', [10000, 100000, 1000000])
+def test_add_upload_assets(benchmark, count):
+    """Index, dedupe and append, the half of the paths are duplicates."""
+    result = benchmark.pedantic(
+        lambda upload_info: add_upload_assets(upload_info, _paths(count),
+                                              check_exists=False),
+        setup=lambda: ((_manifest(count),), {}), rounds=3)
+    assert result == count - count // 2
+
+
+def test_legacy_add_10k(benchmark):
+    """The quadratic legacy lookup, only affordable for 10k paths."""
+    benchmark.pedantic(
+        lambda upload_info: _legacy_add(upload_info, _paths(10000)),
+        setup=lambda: ((_manifest(10000),), {}), rounds=1)
+
+
+@pytest.mark.parametrize('count', [10000, 100000])
+def test_append_to_upload(benchmark, tmpdir, count):
+    """Read, add and write the upload json once."""
+    upload_path = str(tmpdir.join('upload.json'))
+
+    def _setup():
+        with open(upload_path, 'w') as file_obj:
+            json.dump(_manifest(count), file_obj)
+        return (), {}
+
+    benchmark.pedantic(
+        lambda: append_to_upload(_paths(count), upload_path,
+                                 check_exists=False),
+        setup=_setup, rounds=3)
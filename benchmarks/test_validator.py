@@ -0,0 +1,75 @@
+"""Benchmark the per-call cost of the request data validation."""
+
+import os
+
+# pylint: disable=import-error
+import pytest
+
+pytest.importorskip('pytest_benchmark')
+
+# pylint: disable=wrong-import-position
+from rayvision_api.validator import DataValidator
+from rayvision_api.validator import SCHEMA_REGISTRY
+from rayvision_api.validator import validate_data
+from rayvision_api.file_operator import read_yaml
+from rayvision_api.paths import get_schema_file
+
+CASES = [
+    ('queryTaskInfo', {'taskIds': [1, 2, 3]}),
+    ('getTaskList', {'pageNum': 1, 'pageSize': 100, 'statusList': [0, 5]}),
+    ('createTask', {'count': 1, 'taskUserLevel': 50}),
+]
+
+
+@pytest.mark.parametrize('schema_name,data', CASES)
+def test_validate_uncached(benchmark, schema_name, data):
+    """The legacy path: read, parse and compile the schema every call."""
+
+    def _validate():
+        schema = read_yaml(get_schema_file(schema_name))
+        DataValidator(data, schema_name, schema=schema).validate()
+
+    benchmark(_validate)
+
+
+@pytest.mark.parametrize('schema_name,data', CASES)
+def test_validate_cached(benchmark, schema_name, data):
+    """The registry path: the compiled validator is reused."""
+    SCHEMA_REGISTRY.get_validator(schema_name)
+    benchmark(validate_data, data, schema_name)
+
+
+def _sample_value(rule):
+    """Get a valid value of a schema rule."""
+    if rule.get('allowed'):
+        return rule['allowed'][0]
+    rule_type = rule.get('type')
+    if isinstance(rule_type, list):
+        rule_type = rule_type[0]
+    if rule_type == 'list':
+        item = rule.get('schema')
+        return [_sample_value(item)] if item else [1]
+    return {'integer': 1, 'string': 'name', 'boolean': True,
+            'dict': {}}.get(rule_type, 1)
+
+
+def _sample_data(schema_name):
+    """Get data filling every field of the schema."""
+    schema = read_yaml(get_schema_file(schema_name)) or {}
+    return dict((field, _sample_value(rule)) for field, rule in schema.items())
+
+
+# The schemas of the routes, the empty ones are never validated.
+SCHEMA_NAMES = sorted(
+    name for name in (os.path.splitext(file_name)[0] for file_name in
+                      os.listdir(os.path.dirname(get_schema_file('task')))
+                      if file_name.endswith('.yaml'))
+    if name != 'schema_v1' and read_yaml(get_schema_file(name)))
+
+
+@pytest.mark.parametrize('schema_name', SCHEMA_NAMES)
+def test_validate_schema(benchmark, schema_name):
+    """The cached validation of every schema, every field filled."""
+    data = _sample_data(schema_name)
+    validate_data(data, schema_name)
+    benchmark(validate_data, data, schema_name)
@@ -0,0 +1,29 @@
+"""The asyncio client of the rayvision_api.
+
+Requires Python 3 and ``aiohttp``.
+
+"""
+
+# Import local modules
+from rayvision_api.aio.connect import AsyncConnect
+from rayvision_api.aio.core import AsyncRayvisionAPI
+from rayvision_api.aio.operators import AsyncQueryOperator
+from rayvision_api.aio.operators import AsyncRenderEnvOperator
+from rayvision_api.aio.operators import AsyncTagOperator
+from rayvision_api.aio.operators import AsyncTaskOperator
+from rayvision_api.aio.operators import AsyncTransmitOperator
+from rayvision_api.aio.operators import AsyncUserOperator
+from rayvision_api.aio.single_flight import AsyncSingleFlight
+
+# All public api.
+__all__ = (
+    'AsyncConnect',
+    'AsyncRayvisionAPI',
+    'AsyncQueryOperator',
+    'AsyncRenderEnvOperator',
+    'AsyncSingleFlight',
+    'AsyncTagOperator',
+    'AsyncTaskOperator',
+    'AsyncTransmitOperator',
+    'AsyncUserOperator',
+)
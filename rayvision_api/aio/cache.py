@@ -0,0 +1,60 @@
+"""Cache the responses of the asynchronous operators and connects."""
+
+
+async def cache_awaitable(cache, key, awaitable):
+    """Await the response and cache it.
+
+    Args:
+        cache (rayvision_api.cache.ReferenceCache): The reference cache.
+        key (str): The key of the entry.
+        awaitable (Awaitable): The pending response.
+
+    Returns:
+        dict or list: The response data.
+
+    """
+    result = await awaitable
+    cache.set(key, result)
+    return result
+
+
+async def resolved(value):
+    """Wrap a cached value in a coroutine, like the uncached responses."""
+    return value
+
+
+async def call_cached(cache, connect, api_url, data, func, *args):
+    """Get the response of a request from the cache or the coroutine.
+
+    The asynchronous version of ``ResponseCache.call``.
+
+    Args:
+        cache (rayvision_api.response_cache.ResponseCache): The response
+            cache.
+        connect (rayvision_api.aio.connect.AsyncConnect): The connect sending
+            the request.
+        api_url (str): The api url.
+        data (dict): The request data.
+        func (callable): Send the request, called with ``args``.
+
+    Returns:
+        dict or list: The response data.
+
+    """
+    policy, key, entry = cache.lookup(connect, api_url, data)
+    if policy is None:
+        try:
+            return await func(*args)
+        finally:
+            cache.invalidate_after(api_url)
+    if entry is not None and entry[1]:
+        return entry[0]
+    try:
+        result = await func(*args)
+    except Exception as err:
+        found, value = cache.stale(connect, entry, err)
+        if found:
+            return value
+        raise
+    cache.store(api_url, policy, key, result)
+    return result
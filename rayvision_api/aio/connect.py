@@ -0,0 +1,201 @@
+"""Asynchronous request, request header and request result processing."""
+
+# Import built-in modules
+import asyncio
+
+# Import third-party modules
+import aiohttp
+
+# Import local modules
+from rayvision_api.aio.cache import call_cached
+from rayvision_api.connect import Connect
+from rayvision_api.metrics import RequestSample
+from rayvision_api.retry import RetryPolicy
+from rayvision_api.retry import TRANSIENT_EXCEPTIONS
+
+# The transport errors of aiohttp retried by default.
+ASYNC_TRANSIENT_EXCEPTIONS = TRANSIENT_EXCEPTIONS + (
+    aiohttp.ClientConnectionError, asyncio.TimeoutError)
+
+
+class AsyncConnect(Connect):
+    """Connect operation with the server on an asyncio event loop.
+
+    The signing, validation and error mapping are shared with ``Connect``,
+    only the transport is replaced by ``aiohttp``.
+
+    """
+
+    is_async = True
+
+    def __init__(self, access_id, access_key, protocol, domain, platform,
+                 headers=None, session=None, logger=None, timeout=None,
+                 limit=100, json_backend='json', limit_per_host=0,
+                 keepalive_timeout=15, retry_policy=None,
+                 reference_cache=None, instrumentation=None,
+                 response_cache=None, single_flight=None):
+        """Connect parameter initialization.
+
+        Args:
+            access_id (str): The access id of API.
+            access_key (str): The access key of the API.
+            domain (str, optional): The domain address of the API.
+            platform (str, optional): The platform of renderFarm.
+            protocol (str, optional): The requests protocol.
+            session (aiohttp.ClientSession, optional): The session of the
+                aiohttp instance, created on the first request by default.
+            logger (logging.Logger, optional): The logging logger instance.
+            timeout (float or tuple, optional): How long to wait for the
+                server to send data before giving up, as a float, or a
+                (connect timeout, read timeout) tuple.
+            limit (int, optional): The maximum number of simultaneous
+                connections of the created session.
+            json_backend (str, optional): The library serializing the request
+                body and decoding the response.
+            limit_per_host (int, optional): The maximum number of
+                simultaneous connections to the same host, 0 is unlimited.
+            keepalive_timeout (float, optional): Seconds an idle connection
+                is kept alive for reuse.
+            retry_policy (rayvision_api.retry.RetryPolicy, optional): The
+                retries of the transient failures.
+            reference_cache (rayvision_api.cache.ReferenceCache, optional):
+                Reuse the reference data responses.
+            instrumentation (rayvision_api.metrics.Instrumentation,
+                optional): Receive the measures of each call.
+            response_cache (rayvision_api.response_cache.ResponseCache,
+                optional): Answer the calls of the read-only endpoints from
+                the cache.
+            single_flight (rayvision_api.aio.single_flight.AsyncSingleFlight,
+                optional): Send one request for the identical concurrent
+                calls of the read-only endpoints.
+
+        """
+        self._limit = limit
+        self._limit_per_host = limit_per_host
+        self._keepalive_timeout = keepalive_timeout
+        super(AsyncConnect, self).__init__(access_id, access_key, protocol,
+                                           domain, platform, headers=headers,
+                                           session=session, logger=logger,
+                                           timeout=timeout,
+                                           json_backend=json_backend,
+                                           retry_policy=retry_policy,
+                                           reference_cache=reference_cache,
+                                           instrumentation=instrumentation,
+                                           response_cache=response_cache,
+                                           single_flight=single_flight)
+
+    def _create_retry_policy(self):
+        """rayvision_api.retry.RetryPolicy: Also retry the aiohttp errors."""
+        return RetryPolicy(retryable_exceptions=ASYNC_TRANSIENT_EXCEPTIONS)
+
+    def _create_session(self):
+        """The ``aiohttp`` session must be created inside the event loop."""
+        return None
+
+    def _client_timeout(self):
+        """aiohttp.ClientTimeout: Convert the requests style timeout."""
+        if self.timeout is None:
+            return aiohttp.ClientTimeout(total=None)
+        if isinstance(self.timeout, (tuple, list)):
+            connect_timeout, read_timeout = self.timeout
+            return aiohttp.ClientTimeout(sock_connect=connect_timeout,
+                                         sock_read=read_timeout)
+        return aiohttp.ClientTimeout(total=self.timeout)
+
+    @property
+    def session(self):
+        """aiohttp.ClientSession: The session of the current connect."""
+        if self._session_request is None or self._session_request.closed:
+            self._session_request = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=self._limit, limit_per_host=self._limit_per_host,
+                    keepalive_timeout=self._keepalive_timeout),
+                timeout=self._client_timeout())
+        return self._session_request
+
+    @property
+    def pool_stats(self):
+        """dict: The connection limits, aiohttp does not count the reuses."""
+        return {
+            'limit': self._limit,
+            'limit_per_host': self._limit_per_host,
+            'keepalive_timeout': self._keepalive_timeout,
+        }
+
+    async def post(self, api_url, data=None, validator=True):
+        """Send an post request and return data object if no error occurred.
+
+        Args:
+            api_url (rayvision_api.api.url.URL or str): The URL address of the
+                corresponding action network Request.
+            data (dict, optional): Request data.
+            validator (bool, optional): Validator the data.
+
+        Returns:
+            dict or List: Response data.
+
+        Raises:
+            RayVisionAPIError: The request failed, It returns the error ID,
+                the error message, and the request address.
+
+        """
+        if self.single_flight is not None:
+            return await self.single_flight.call(self, api_url, data,
+                                                 self._cached_send, api_url,
+                                                 data, validator)
+        return await self._cached_send(api_url, data, validator)
+
+    async def _cached_send(self, api_url, data=None, validator=True):
+        """Get the response from the response cache or send the request."""
+        if self.response_cache is not None:
+            return await call_cached(self.response_cache, self, api_url, data,
+                                     self._send, api_url, data, validator)
+        return await self._send(api_url, data, validator)
+
+    async def _send(self, api_url, data=None, validator=True):
+        """Send the post request, retrying the transient failures."""
+        retrying = self.retry_policy.async_retrying()
+        if self.instrumentation is None:
+            return await retrying(self._post, api_url, data, validator)
+        sample = RequestSample(api_url)
+        try:
+            result = await retrying(self._post, api_url, data, validator,
+                                    sample)
+        except Exception as err:
+            self._record_sample(sample, err)
+            raise
+        self._record_sample(sample)
+        return result
+
+    async def _post(self, api_url, data=None, validator=True, sample=None):
+        """Send one attempt of the post request."""
+        if sample is not None:
+            sample.start_attempt()
+        request_address, headers, body = self._prepare_request(
+            api_url, data, validator, sample)
+        headers['signature'] = headers['signature'].decode('utf8')
+        async with self.session.post(request_address, data=body,
+                                     headers=headers) as response:
+            content = await response.read()
+            if sample is not None:
+                sample.mark('network')
+                sample.request_bytes += len(body)
+                sample.response_bytes += len(content)
+            self._check_status(response.status, response.reason,
+                               str(response.url))
+            json_response = self._serializer.loads(content)
+            if sample is not None:
+                sample.mark('decode')
+            return self._handle_response(json_response, str(response.url))
+
+    async def close(self):
+        """Close the session of the current connect."""
+        if self._session_request is not None:
+            await self._session_request.close()
+            self._session_request = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
@@ -0,0 +1,220 @@
+"""Initialize the asynchronous user, task, query, environment, tag interface."""
+
+# Import built-in modules
+import logging
+import os
+
+# Import third-party modules
+import aiohttp
+from rayvision_log import init_logger
+
+# Import local modules
+from rayvision_api.aio.connect import AsyncConnect
+from rayvision_api.aio.operators import AsyncQueryOperator
+from rayvision_api.aio.operators import AsyncRenderEnvOperator
+from rayvision_api.aio.operators import AsyncTagOperator
+from rayvision_api.aio.operators import AsyncTaskOperator
+from rayvision_api.aio.operators import AsyncTransmitOperator
+from rayvision_api.aio.operators import AsyncUserOperator
+from rayvision_api.constants import PACKAGE_NAME
+from rayvision_api.exception import RayvisionError
+from rayvision_api.exception import RayvisonTaskIdError
+
+
+class AsyncRayvisionAPI(object):
+    """Create the asynchronous request object.
+
+    Including user action, task action, query action, environment operation
+    and tag action, every API call returns a coroutine.
+
+    Examples:
+        async with AsyncRayvisionAPI(access_id, access_key) as api:
+            infos = await asyncio.gather(
+                *[api.query.task_info([task_id]) for task_id in task_ids])
+
+    """
+
+    def __init__(self,
+                 access_id=None,
+                 access_key=None,
+                 domain='task.renderbus.com',
+                 platform='4',
+                 protocol='https',
+                 logger=None,
+                 log_folder=None,
+                 log_name=None,
+                 log_level="DEBUG",
+                 timeout=60,
+                 limit=100,
+                 json_backend='json',
+                 retry_policy=None,
+                 reference_cache=None,
+                 instrumentation=None,
+                 response_cache=None,
+                 single_flight=None
+                 ):
+        """Please note that this is API parameter initialization.
+
+        The user information is not requested here, call ``login`` or use
+        the instance as an asynchronous context manager.
+
+        Args:
+            access_id (str, optional): The access id of API.
+            access_key (str, optional): The access key of the API.
+            domain (str, optional): The domain address of the API.
+            platform (str, optional): The platform of renderFarm.
+            protocol (str, optional): The requests protocol.
+            logger (logging.Logger, optional): The logging logger instance.
+            log_folder (str, optional): Custom log save location.
+            log_name (str): Custom log file name.
+            log_level (str, optional): Custom log level, default "DEBUG".
+            timeout (float or tuple, optional): How long to wait for the
+                server to send data before giving up, as a float, or a
+                (connect timeout, read timeout) tuple.
+            limit (int, optional): The maximum number of simultaneous
+                connections.
+            json_backend (str, optional): The library serializing the
+                requests, one of ``json``, ``orjson``, ``ujson`` or ``auto``.
+            retry_policy (rayvision_api.retry.RetryPolicy, optional): The
+                retries of the transient failures.
+            reference_cache (rayvision_api.cache.ReferenceCache, optional):
+                Reuse the reference data responses.
+            instrumentation (rayvision_api.metrics.Instrumentation,
+                optional): Receive the measures of each request.
+            response_cache (rayvision_api.response_cache.ResponseCache,
+                optional): Reuse the responses of the read-only endpoints.
+            single_flight (rayvision_api.aio.single_flight.AsyncSingleFlight,
+                optional): Send one request for the identical calls made at
+                the same time by several coroutines.
+
+        """
+        self.logger = logger
+        self.platform = platform
+        if not self.logger:
+            init_logger(PACKAGE_NAME, log_folder, log_name)
+            self.logger = logging.getLogger(__name__)
+            self.logger.setLevel(level=log_level.upper())
+
+        access_id = access_id or os.getenv("RAYVISION_API_ACCESS_ID")
+        if not access_id:
+            raise TypeError(
+                'Required "access_id" not specified. Pass as argument or set '
+                'in environment variable RAYVISION_API_ACCESS_ID.'
+            )
+        access_key = access_key or os.getenv("RAYVISION_API_KEY")
+        if not access_key:
+            raise TypeError(
+                'Required "access_key" not specified. Pass as argument or set '
+                'in environment variable RAYVISION_API_KEY.'
+            )
+
+        self._connect = AsyncConnect(access_id,
+                                     access_key,
+                                     protocol,
+                                     domain,
+                                     platform,
+                                     logger=self.logger,
+                                     timeout=timeout,
+                                     limit=limit,
+                                     json_backend=json_backend,
+                                     retry_policy=retry_policy,
+                                     reference_cache=reference_cache,
+                                     instrumentation=instrumentation,
+                                     response_cache=response_cache,
+                                     single_flight=single_flight)
+
+        # Initial all api instance.
+        self.user = AsyncUserOperator(self._connect)
+        self.task = AsyncTaskOperator(self._connect)
+        self.query = AsyncQueryOperator(self._connect)
+        self.tag = AsyncTagOperator(self._connect)
+        self.env = AsyncRenderEnvOperator(self._connect)
+        self.transmit = AsyncTransmitOperator(self._connect)
+
+    @property
+    def user_info(self):
+        return self.user.info
+
+    @property
+    def connect(self):
+        """rayvision_api.aio.AsyncConnect: The current connect instance."""
+        return self._connect
+
+    async def login(self):
+        """Supplement user's configuration information.
+
+        The user profile, the user setting and the transfer bid are
+        requested concurrently.
+
+        """
+        try:
+            await self.user._login()
+        except aiohttp.ClientError:
+            raise RayvisionError(20020, 'Login failed.')
+        return self.user.info
+
+    async def close(self):
+        """Close the connection of the current instance."""
+        await self._connect.close()
+
+    async def __aenter__(self):
+        try:
+            await self.login()
+        except BaseException:
+            await self.close()
+            raise
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    async def get_user_id(self):
+        """int: The ID number of the current user."""
+        try:
+            return await self.user.user_id
+        except KeyError:
+            raise RayvisionError(1000000, 'Failed to get user number!')
+
+    async def check_and_add_project_name(self, project_name):
+        """Get the tag id, add the tag if it does not exist.
+
+        Args:
+            project_name (str): The name of the tag to be added.
+
+        Returns:
+            int: Tag id.
+
+        """
+        is_label_exist = False
+        project_id = ''
+        for _ in range(2):
+            label_dict_list = (await self.tag.get_list(flag=2)).get(
+                'projectNameList', [])
+            for label_dict in label_dict_list:
+                if label_dict['projectName'] == project_name:
+                    is_label_exist = True
+                    project_id = str(label_dict['projectId'])
+                    break
+            # Add a label if the no label exists.
+            if not is_label_exist:
+                await self.tag.add_label(project_name, '0')
+            else:
+                if project_id == '':
+                    continue
+                break
+
+        return project_id
+
+    async def submit(self, task_id, producer=None):
+        """Submit a task.
+
+        Args:
+            task_id (int): Task id.
+            producer (str, optional): Producer.
+
+        """
+        if not isinstance(task_id, int):
+            raise RayvisonTaskIdError(10006, "task_id must int !!!!")
+
+        await self.task.submit_task(task_id, producer)
+        return True
@@ -0,0 +1,366 @@
+"""The asynchronous operations of the rayvision_api.
+
+The operators reuse the synchronous ones: the methods that only post one
+request return the coroutine of ``AsyncConnect.post`` as is, the methods
+that combine several requests are rewritten with ``await``.
+
+"""
+
+# Import built-in modules
+import asyncio
+import collections
+
+# Import local modules
+from rayvision_api.aio.task_id_pool import AsyncTaskIdPool
+from rayvision_api.exception import RayvisionError
+from rayvision_api.frame_range import FrameSpec
+from rayvision_api.operators import QueryOperator
+from rayvision_api.operators.query import chunk_unique_ids
+from rayvision_api.operators import RenderEnvOperator
+from rayvision_api.operators import TagOperator
+from rayvision_api.operators import TaskOperator
+from rayvision_api.operators import TransmitOperator
+from rayvision_api.operators import UserOperator
+
+
+class AsyncQueryOperator(QueryOperator):
+    """API query operation."""
+
+    async def get_all_frames(self, task_id, start_page=1, end_page=2000,
+                             page_size=100, concurrency=None):
+        """Gets all frame details for the specified task.
+
+        Args:
+            task_id (int) : small task id
+            start_page (int) : The start page that you want to query.
+            end_page (int) : The end page that you want to query.
+            page_size (int) : Displayed data size per page.
+            concurrency (int, optional) : The number of pages requested at
+                the same time, the pages are requested one by one by default.
+
+        Returns (dict): all frames detail info.
+
+        """
+        frames_detail = dict()
+        if concurrency and int(concurrency) > 1:
+            task_frame = await self.task_frames(task_id=int(task_id),
+                                                page_num=int(start_page),
+                                                page_size=page_size)
+            self._merge_frames(frames_detail, task_frame)
+            pages = self._remaining_pages(task_frame, start_page, end_page,
+                                          page_size)
+            if pages is None:
+                # The page count is unknown, read until the first empty page.
+                async for per in self.iter_task_frames(
+                        task_id, start_page=int(start_page) + 1,
+                        end_page=end_page, page_size=page_size,
+                        prefetch=False):
+                    frames_detail[per["frameIndex"]] = per
+                return frames_detail
+            semaphore = asyncio.Semaphore(int(concurrency))
+
+            async def _task_frames(num):
+                async with semaphore:
+                    return await self.task_frames(task_id=int(task_id),
+                                                  page_num=num,
+                                                  page_size=page_size)
+
+            # ``gather`` returns the results in the order of the pages.
+            for task_frame in await asyncio.gather(
+                    *[_task_frames(num) for num in pages]):
+                self._merge_frames(frames_detail, task_frame)
+            return frames_detail
+
+        async for per in self.iter_task_frames(
+                task_id, start_page=start_page, end_page=end_page,
+                page_size=page_size, prefetch=False):
+            frames_detail[per["frameIndex"]] = per
+        return frames_detail
+
+    async def iter_task_frames(self, task_id, start_page=1, end_page=2000,
+                               page_size=100, prefetch=True):
+        """Iterate over the frame details of the specified task page by page.
+
+        Args:
+            task_id (int) : small task id
+            start_page (int) : The start page that you want to query.
+            end_page (int) : The end page that you want to query.
+            page_size (int) : Displayed data size per page.
+            prefetch (bool) : Request the next page while the current one
+                is consumed.
+
+        Yields:
+            dict: The detail of one frame, see ``task_frames``.
+
+        """
+        task_id, start_page, end_page = (int(task_id), int(start_page),
+                                         int(end_page))
+        if start_page > end_page:
+            return
+
+        def _fetch(num):
+            coroutine = self.task_frames(task_id=task_id, page_num=num,
+                                         page_size=page_size)
+            return asyncio.ensure_future(coroutine) if prefetch else coroutine
+
+        pending = _fetch(start_page)
+        try:
+            for num in range(start_page, end_page + 1):
+                task_frame = await pending
+                pending = None
+                if not task_frame['items']:
+                    break
+                page_count = task_frame.get('pageCount')
+                is_last = num >= end_page or (page_count and
+                                              num >= int(page_count))
+                if not is_last:
+                    pending = _fetch(num + 1)
+                for per in task_frame['items']:
+                    yield per
+                if is_last:
+                    break
+        finally:
+            if prefetch and pending is not None:
+                pending.cancel()
+            elif pending is not None:
+                pending.close()
+
+    async def _select_frame_ids(self, task_id, frame_numbers):
+        """list: Get the ids of the frames matching the frame expressions."""
+        matcher = FrameSpec(frame_numbers).matcher()
+        ids = []
+        if matcher.done:
+            return ids
+        frames = self.iter_task_frames(task_id)
+        try:
+            async for per in frames:
+                if matcher.add(per["frameIndex"]):
+                    ids.append(per["id"])
+                if matcher.done:
+                    break
+        finally:
+            await frames.aclose()
+        return ids
+
+    async def get_custome_frames(self, task_id, restartframes):
+        """Retrieves the frame of the specified task according to the frame.
+
+        Args:
+            task_id (int) : small task id
+            restartframes (list) : The frame number needs to be redrawn.
+                Examples:
+                     ["2-4[1]", "10"]
+
+        """
+        ids = await self._select_frame_ids(task_id, restartframes)
+        return await self.restart_frame(ids_list=ids, select_all=0,
+                                        task_id=task_id)
+
+    async def error_detail_by_code(
+            self, codes, language=0,
+            chunk_size=QueryOperator.ERROR_DETAIL_CHUNK_SIZE):
+        """dict: Get the analysis error details of many codes concurrently."""
+        codes = [str(code) for code in codes]
+        details = collections.OrderedDict((code, []) for code in codes)
+        unique_codes = list(details)
+        responses = await asyncio.gather(*[
+            self.error_detail(codes=unique_codes[start:start + chunk_size],
+                              language=language)
+            for start in range(0, len(unique_codes), chunk_size)])
+        for code_infos in responses:
+            for code_info in code_infos or []:
+                details.setdefault(str(code_info['code']), []).append(
+                    code_info)
+        return details
+
+    async def iter_task_info_bulk(self, task_ids,
+                                  chunk_size=QueryOperator.TASK_INFO_CHUNK_SIZE,
+                                  concurrency=4):
+        """Get the task details of many tasks, chunk by chunk.
+
+        Args:
+            task_ids (iterable of int): Task ID list, can be a generator.
+            chunk_size (int, optional): The number of ids per request.
+            concurrency (int, optional): The number of concurrent requests.
+
+        Yields:
+            dict: The task details of one chunk keyed by task id, in the
+                order the chunks complete.
+
+        """
+        concurrency = max(int(concurrency), 1)
+        pending = set()
+        try:
+            for chunk in chunk_unique_ids(task_ids, int(chunk_size)):
+                pending.add(asyncio.ensure_future(self.task_info(chunk)))
+                if len(pending) < concurrency:
+                    continue
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED)
+                for future in done:
+                    yield self._index_task_info(future.result())
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED)
+                for future in done:
+                    yield self._index_task_info(future.result())
+        finally:
+            for future in pending:
+                future.cancel()
+
+    async def task_info_bulk(self, task_ids,
+                             chunk_size=QueryOperator.TASK_INFO_CHUNK_SIZE,
+                             concurrency=4):
+        """dict: Get the task details of many tasks keyed by task id."""
+        task_ids = [int(task_id) for task_id in task_ids]
+        merged = {}
+        async for task_infos in self.iter_task_info_bulk(
+                task_ids, chunk_size=chunk_size, concurrency=concurrency):
+            merged.update(task_infos)
+        return {task_id: merged[task_id] for task_id in task_ids
+                if task_id in merged}
+
+    async def get_small_task_id(self, task_id):
+        """Get all child tasks under the main task.
+
+        Args:
+            task_id (int or string): main task id.
+
+        """
+        items = (await self.task_info(task_ids_list=[int(task_id)])).get(
+            "items")
+        if items:
+            task_lists = items[0].get("respRenderingTaskList", [])
+            ids = [task['id'] for task in task_lists]
+        else:
+            ids = [int(task_id)]
+        return ids
+
+    async def frame_number_to_stop(self, task_id, stop_frame):
+        """Stop the specified frame according to the frame number.
+
+        Args:
+            task_id (int) : small task id
+            stop_frame (list[string]) : The frame number needs to be stop.
+                Examples:
+                     ["2-4[1]", "10"]
+
+        """
+        ids = await self._select_frame_ids(task_id, stop_frame)
+        return await self.stop_frame(ids_list=ids, select_all=0,
+                                     task_id=task_id)
+
+
+class AsyncTaskOperator(TaskOperator):
+    """API task related operations."""
+
+    async def _generate_task_id(self):
+        """int: Get task id."""
+        if self.task_id_pool is not None:
+            return await self.task_id_pool.get()
+        if not self._has_submit and self._task_id:
+            return self._task_id
+        task_id_info = await self.create_task(count=1, out_user_id=None)
+        task_id_list = task_id_info.get("taskIdList")
+        if not task_id_list:
+            raise RayvisionError(1000000, 'Failed to create task number!')
+        self._task_id = task_id_list[0]
+        self._has_submit = False
+        return self._task_id
+
+    def enable_id_pool(self, batch_size=20, low_water=5, **kwargs):
+        """Hand out the task IDs from a pool refilled on the event loop.
+
+        Args:
+            batch_size (int, optional): The quantity of task ID created by a
+                refill.
+            low_water (int, optional): Refill when less task IDs are left.
+            kwargs (dict): The other arguments of ``create_task``.
+
+        Returns:
+            rayvision_api.aio.task_id_pool.AsyncTaskIdPool: The pool.
+
+        """
+        self.close_id_pool()
+        self.task_id_pool = AsyncTaskIdPool(self, batch_size=batch_size,
+                                            low_water=low_water, **kwargs)
+        return self.task_id_pool
+
+    async def reserve_task_ids(self, count, block_size=100, **kwargs):
+        """list of int: Create many task IDs concurrently."""
+        blocks = [min(block_size, count - start)
+                  for start in range(0, count, block_size)]
+        responses = await asyncio.gather(*[
+            self.create_task(count=block, **kwargs) for block in blocks])
+        task_ids = []
+        for response in responses:
+            task_id_list = response.get("taskIdList") or []
+            if not task_id_list:
+                raise RayvisionError(1000000, 'Failed to create task number!')
+            task_ids.extend(task_id_list)
+        if len(task_ids) < count:
+            raise RayvisionError(1000000, 'Failed to create task number!')
+        return task_ids[:count]
+
+    async def submit_task(self, task_id, producer=None, only_id=False):
+        """Submit a task to rayvision render farm.
+
+        Args:
+            task_id (int): Submit task ID.
+            producer (str, optional): Producer.
+
+        """
+        data = {
+            "taskId": task_id,
+        }
+        if producer:
+            data["producer"] = producer
+
+        task_info = await self._connect.post(self._connect.url.task, data)
+        if only_id:
+            return task_id
+        self._has_submit = True
+        return task_info
+
+
+class AsyncUserOperator(UserOperator):
+    """API user information operator."""
+
+    @property
+    def user_id(self):
+        """Awaitable of the user id."""
+        return self._query_user_id()
+
+    async def _query_user_id(self):
+        return (await self.query_user_profile())["userId"]
+
+    async def get_hardware_catalog(self, task_ids=None):
+        """Get the hardware configurations indexed for the lookups."""
+        return self._update_hardware_catalog(
+            await self.get_hardware_config(task_ids))
+
+    async def _login(self):
+        """Supplement user's configuration information."""
+        user_profile, user_setting, transfer_bid = await asyncio.gather(
+            self.query_user_profile(), self.query_user_setting(),
+            self.get_transfer_bid())
+        user_profile.update(user_setting)
+        user_profile.update(transfer_bid)
+        self._update_user_info(user_profile)
+        return user_profile
+
+
+class AsyncTagOperator(TagOperator):
+    """Task tag settings."""
+
+    async def get_project_list(self):
+        """list: Get custom labels."""
+        return (await self.get_label_list())['projectNameList']
+
+
+class AsyncRenderEnvOperator(RenderEnvOperator):
+    """The rendering environment configuration."""
+
+
+class AsyncTransmitOperator(TransmitOperator):
+    """The interface to perform the transfer."""
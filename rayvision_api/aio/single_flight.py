@@ -0,0 +1,58 @@
+"""Coalesce the identical asynchronous calls in flight."""
+
+# Import built-in modules
+import asyncio
+import copy
+
+# Import local modules
+from rayvision_api.single_flight import SingleFlight
+from rayvision_api.single_flight import _path
+
+
+class AsyncSingleFlight(SingleFlight):
+    """Share the request in flight between the identical coroutines.
+
+    The request runs in its own task, so that cancelling the first caller
+    does not cancel the request of the other callers. An instance is used
+    by the connects of one event loop.
+
+    """
+
+    async def call(self, connect, api_url, data, func, *args):
+        """Get the response of the call in flight or await the coroutine.
+
+        Args:
+            connect (rayvision_api.aio.connect.AsyncConnect): The connect
+                sending the request.
+            api_url (str): The api url.
+            data (dict): The request data.
+            func (callable): Send the request, called with ``args``.
+
+        Returns:
+            dict or list: The response data, each caller gets its own copy.
+
+        """
+        if _path(api_url) not in self.endpoints:
+            return await func(*args)
+        key = self.make_key(connect, api_url, data)
+        task = self._flights.get(key)
+        if task is None:
+            task = asyncio.ensure_future(func(*args))
+            self._flights[key] = task
+            task.add_done_callback(lambda done: self._land(key, done))
+            with self._lock:
+                self._stats['requests'] += 1
+        else:
+            with self._lock:
+                self._stats['coalesced'] += 1
+        # The result of the task is never returned, so no caller can change
+        # it before the others copy it.
+        return copy.deepcopy(await asyncio.shield(task))
+
+    def _land(self, key, task):
+        """Forget the finished task of the key."""
+        if self._flights.get(key) is task:
+            del self._flights[key]
+        if not task.cancelled():
+            # Retrieved, even if all the callers were cancelled.
+            task.exception()
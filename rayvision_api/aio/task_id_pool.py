@@ -0,0 +1,143 @@
+"""Pre-allocate the task IDs of the asynchronous submissions.
+
+Example::
+
+    >>> pool = api.task.enable_id_pool(batch_size=50, low_water=10)
+    >>> task_id = await api.task.task_id_pool.get()
+    >>> unused = api.task.close_id_pool()
+
+"""
+
+# Import built-in modules
+import asyncio
+import collections
+import logging
+
+# Import local modules
+from rayvision_api.exception import RayvisionError
+
+
+class AsyncTaskIdPool(object):
+    """A pool of task IDs created in batches on the event loop.
+
+    The refills run in tasks of the event loop: a refill is started when
+    less than ``low_water`` task IDs are left, and the coroutines emptying
+    the pool wait for it. An instance is used by one event loop.
+
+    """
+
+    def __init__(self, task_operator, batch_size=20, low_water=5, logger=None,
+                 **kwargs):
+        """Initialize instance.
+
+        Args:
+            task_operator (rayvision_api.aio.operators.AsyncTaskOperator):
+                Create the task IDs.
+            batch_size (int, optional): The quantity of task ID created by a
+                refill.
+            low_water (int, optional): Refill when less task IDs are left.
+            logger (logging.Logger, optional): Report the unused task IDs.
+            kwargs (dict): The other arguments of ``create_task``.
+
+        """
+        self._task_operator = task_operator
+        self.batch_size = max(int(batch_size), 1)
+        self.low_water = max(int(low_water), 0)
+        self.logger = logger or logging.getLogger(__name__)
+        self._create_kwargs = kwargs
+        self._ids = collections.deque()
+        self._refill_task = None
+        self._closed = False
+        self._stats = {'issued': 0, 'created': 0, 'refills': 0}
+
+    @property
+    def stats(self):
+        """dict: The issued, created and available task IDs and refills."""
+        stats = dict(self._stats)
+        stats['available'] = len(self._ids)
+        return stats
+
+    def __len__(self):
+        return len(self._ids)
+
+    async def get(self):
+        """int: Take a task ID, see ``get_many``."""
+        return (await self.get_many(1))[0]
+
+    async def get_many(self, count):
+        """Take several task IDs.
+
+        Args:
+            count (int): The quantity of task ID.
+
+        Returns:
+            list of int: The task IDs.
+
+        Raises:
+            RayvisionError: The pool is closed or the refill failed, the
+                task IDs already taken are given back.
+
+        """
+        task_ids = []
+        try:
+            while len(task_ids) < count:
+                if self._closed:
+                    raise RayvisionError(1000000,
+                                         'The task id pool is closed.')
+                while self._ids and len(task_ids) < count:
+                    task_ids.append(self._ids.popleft())
+                if len(task_ids) < count:
+                    await asyncio.shield(
+                        self._start_refill(count - len(task_ids)))
+        except BaseException:
+            self._ids.extendleft(reversed(task_ids))
+            raise
+        self._stats['issued'] += count
+        if len(self._ids) <= self.low_water:
+            self._start_refill().add_done_callback(self._log_failure)
+        return task_ids
+
+    def put(self, task_id):
+        """Give back a task ID that was not submitted, to reuse it."""
+        if task_id not in self._ids:
+            self._ids.appendleft(task_id)
+            self._stats['issued'] -= 1
+
+    def close(self):
+        """Stop the refills and report the unused task IDs.
+
+        Returns:
+            list of int: The task IDs created but never used.
+
+        """
+        self._closed = True
+        if self._refill_task is not None:
+            self._refill_task.cancel()
+            self._refill_task = None
+        unused = list(self._ids)
+        self._ids.clear()
+        if unused:
+            self.logger.warning('%d task ids were created but not used: %s',
+                                len(unused), unused)
+        return unused
+
+    def _start_refill(self, count=0):
+        """asyncio.Future: Get the refill in progress or start one."""
+        if self._refill_task is None or self._refill_task.done():
+            self._refill_task = asyncio.ensure_future(
+                self._refill(max(count, self.batch_size)))
+        return self._refill_task
+
+    async def _refill(self, count):
+        task_ids = await self._task_operator.reserve_task_ids(
+            count, block_size=count, **self._create_kwargs)
+        if not self._closed:
+            self._ids.extend(task_ids)
+        self._stats['created'] += len(task_ids)
+        self._stats['refills'] += 1
+
+    def _log_failure(self, task):
+        """Log the failure of a background refill."""
+        if not task.cancelled() and task.exception() is not None:
+            self.logger.warning('Failed to create the task ids: %s',
+                                task.exception())
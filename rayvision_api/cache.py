@@ -0,0 +1,301 @@
+"""Cache the reference data of the render farm.
+
+The supported software, plugins, hardware configurations, error details,
+platforms and transfer configuration rarely change, the operators methods
+decorated with ``cached`` reuse the responses of the previous calls when the
+connect has a ``ReferenceCache``. The entries are scoped by the domain, the
+platform and the account of the connect, so one cache can be shared by the
+connects of several accounts.
+
+Example::
+
+    >>> api = RayvisionAPI(access_id="xxx", access_key="xxx",
+    ...                    reference_cache=ReferenceCache(ttl=600))
+    >>> api.query.supported_plugin("maya")  # Requested.
+    >>> api.query.supported_plugin("maya")  # Cached.
+    >>> api.connect.reference_cache.invalidate("supported_plugin")
+
+"""
+
+# Import built-in modules
+import atexit
+import collections
+import contextlib
+import copy
+import functools
+import hashlib
+import json
+import os
+import threading
+import time
+import weakref
+
+# Import local modules
+from rayvision_api.file_operator import write_json_atomic
+from rayvision_api.paths import ensure_paths
+from rayvision_api.url import ApiUrl
+
+# The endpoints requested by the methods decorated with ``cached``, the
+# response cache leaves them to the reference cache by default.
+REFERENCE_ENDPOINTS = frozenset(api_url.value for api_url in (
+    ApiUrl.queryPlatforms, ApiUrl.queryAnalyseErrorDetail,
+    ApiUrl.querySoftwareList, ApiUrl.querySoftwareDetail, ApiUrl.getConfig,
+    ApiUrl.hardwareConfig))
+
+# The caches with changes not saved yet, saved at exit.
+_UNSAVED = weakref.WeakSet()
+
+# The caches used instead of the connect's by the current thread.
+_SCOPED = threading.local()
+
+
+@atexit.register
+def _save_all():
+    for cache in list(_UNSAVED):
+        cache.save()
+
+
+class ReferenceCache(object):
+    """A thread-safe cache with expiry and least recently used eviction."""
+
+    def __init__(self, maxsize=256, ttl=3600, path=None, clock=time.time,
+                 save_delay=1.0):
+        """Initialize instance.
+
+        Args:
+            maxsize (int, optional): The maximum number of entries, the
+                least recently used entries are evicted first.
+            ttl (int, optional): Seconds an entry is valid.
+            path (str, optional): The json file persisting the entries
+                between the processes, loaded here and saved after the
+                changes.
+            clock (callable, optional): Get the current timestamp.
+            save_delay (float, optional): Seconds waited after a change
+                before saving the entries to ``path``, so that the changes
+                made meanwhile are saved at once, 0 saves each change.
+
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.path = path
+        self.save_delay = save_delay
+        self._clock = clock
+        self._lock = threading.RLock()
+        self._save_lock = threading.Lock()
+        self._save_timer = None
+        self._dirty = False
+        # key -> (expires, value), ordered from least to most recently used.
+        self._entries = collections.OrderedDict()
+        self._stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+        if path:
+            self.load()
+
+    @staticmethod
+    def make_key(name, *args, **kwargs):
+        """str: Get the key of a call, the arguments must be json data."""
+        return json.dumps([name, args, kwargs], sort_keys=True)
+
+    @staticmethod
+    def scope(connect):
+        """str: Get the digest of the domain, platform and account."""
+        identity = u'{}|{}|{}'.format(connect.domain, connect.platform,
+                                      connect.headers.get('accessId'))
+        return hashlib.sha256(identity.encode('utf-8')).hexdigest()
+
+    @property
+    def stats(self):
+        """dict: The hits, misses, evictions and the number of entries."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['size'] = len(self._entries)
+        return stats
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        """Get a copy of the cached value.
+
+        Args:
+            key (str): The key of the entry.
+
+        Returns:
+            tuple: Whether the key is found and the value.
+
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= self._clock():
+                if entry is not None:
+                    del self._entries[key]
+                self._stats['misses'] += 1
+                return False, None
+            self._move_to_end(key)
+            self._stats['hits'] += 1
+            value = entry[1]
+        return True, copy.deepcopy(value)
+
+    def set(self, key, value):
+        """Cache a copy of the value.
+
+        Args:
+            key (str): The key of the entry.
+            value (object): The json data to cache.
+
+        """
+        value = copy.deepcopy(value)
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = (self._clock() + self.ttl, value)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self._stats['evictions'] += 1
+        self._changed()
+
+    def invalidate(self, name=None):
+        """Remove the cached entries.
+
+        Args:
+            name (str, optional): Only remove the entries of the method,
+                all the entries are removed by default.
+
+        """
+        with self._lock:
+            if name is None:
+                self._entries.clear()
+            else:
+                for key in list(self._entries):
+                    if json.loads(key)[0] == name:
+                        del self._entries[key]
+        self._changed()
+
+    def load(self):
+        """Load the entries saved in ``path``, skipping the expired ones."""
+        try:
+            with open(self.path) as file_obj:
+                saved = json.load(file_obj)
+        except (IOError, OSError, ValueError):
+            return
+        now = self._clock()
+        with self._lock:
+            for key, expires, value in saved.get('entries', []):
+                if expires > now:
+                    self._entries[key] = (expires, value)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def _changed(self):
+        """Save the entries now or after ``save_delay``."""
+        if not self.path:
+            return
+        with self._lock:
+            self._dirty = True
+            if self.save_delay > 0:
+                if self._save_timer is None:
+                    self._save_timer = threading.Timer(self.save_delay,
+                                                       self.save)
+                    self._save_timer.daemon = True
+                    self._save_timer.start()
+                    _UNSAVED.add(self)
+                return
+        self.save()
+
+    def save(self):
+        """Save the changed entries to ``path``, outside the cache lock."""
+        with self._save_lock:
+            with self._lock:
+                timer, self._save_timer = self._save_timer, None
+                if timer is not None:
+                    timer.cancel()
+                _UNSAVED.discard(self)
+                if not (self.path and self._dirty):
+                    return
+                self._dirty = False
+                entries = [[key, expires, value]
+                           for key, (expires, value) in self._entries.items()]
+            ensure_paths(os.path.dirname(os.path.abspath(self.path)))
+            write_json_atomic(self.path, {'entries': entries})
+
+    def _move_to_end(self, key):
+        if hasattr(self._entries, 'move_to_end'):
+            self._entries.move_to_end(key)
+        else:  # Python 2.
+            self._entries[key] = self._entries.pop(key)
+
+
+@contextlib.contextmanager
+def scoped_cache(connect, cache):
+    """Use a cache for the calls made with the connect by the current thread.
+
+    The ``reference_cache`` of the connect, shared by all the threads, is
+    left unchanged.
+
+    Args:
+        connect (rayvision_api.connect.Connect): The connect of the calls.
+        cache (ReferenceCache): The cache used instead of the connect's.
+
+    """
+    caches = _SCOPED.__dict__.setdefault('caches', {})
+    previous = caches.get(id(connect))
+    caches[id(connect)] = cache
+    try:
+        yield cache
+    finally:
+        if previous is None:
+            del caches[id(connect)]
+        else:
+            caches[id(connect)] = previous
+
+
+def _get_cache(connect):
+    """ReferenceCache: The cache of the connect for the current thread."""
+    caches = getattr(_SCOPED, 'caches', None)
+    if caches:
+        cache = caches.get(id(connect))
+        if cache is not None:
+            return cache
+    return getattr(connect, 'reference_cache', None)
+
+
+def cached(name):
+    """Cache the result of an operator method in the reference cache.
+
+    The method is called directly when the connect of the operator has no
+    ``reference_cache``. The awaitable results of the asynchronous operators
+    are cached once awaited. The key of a call is scoped by the connect, see
+    ``ReferenceCache.scope``.
+
+    Args:
+        name (str): The name of the cached entries, used by ``invalidate``.
+
+    """
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            cache = _get_cache(self._connect)
+            if cache is None:
+                return func(self, *args, **kwargs)
+            key = cache.make_key(name, cache.scope(self._connect), *args,
+                                 **kwargs)
+            found, value = cache.get(key)
+            if found:
+                return _resolved(self._connect, value)
+            result = func(self, *args, **kwargs)
+            if hasattr(result, '__await__'):
+                from rayvision_api.aio.cache import cache_awaitable
+                return cache_awaitable(cache, key, result)
+            cache.set(key, result)
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+def _resolved(connect, value):
+    """Return the cached value the way the connect returns the responses."""
+    if getattr(connect, 'is_async', False):
+        from rayvision_api.aio.cache import resolved
+        return resolved(value)
+    return value
@@ -1,28 +1,51 @@
 """Request, request header and request result processing."""
 
 import copy
-import json
 import logging
 from pprint import pformat
+import threading
 import time
+import weakref
 
 import requests
-from tenacity import retry
-from tenacity import stop_after_attempt, wait_random
 
 from rayvision_api.constants import HEADERS
 from rayvision_api.exception import RayvisionAPIError
+from rayvision_api.exception import RayvisionHTTPStatusError
 from rayvision_api import signature
+from rayvision_api.metrics import RequestSample
+from rayvision_api.pool import DEFAULT_POOL_CONNECTIONS
+from rayvision_api.pool import DEFAULT_POOL_MAXSIZE
+from rayvision_api.pool import PoolingHTTPAdapter
+from rayvision_api.pool import add_pool_stats
+from rayvision_api.pool import empty_pool_stats
+from rayvision_api.pool import keepalive_socket_options
+from rayvision_api.pool import pool_stats
+from rayvision_api.retry import RetryPolicy
+from rayvision_api.serializer import get_serializer
 from rayvision_api.validator import validate_data
 from rayvision_api.url import ApiUrl
 from rayvision_api.url import assemble_api_url
 
 
+
 class Connect(object):
-    """Connect operation with the server, request."""
+    """Connect operation with the server, request.
+
+    A connect can be shared by many threads: the headers of each request are
+    built from a copy of the base headers, the shared statistics
+    are locked, and the threads either share the pooled session or get one
+    session each with ``session_per_thread``.
+
+    """
 
     def __init__(self, access_id, access_key, protocol, domain, platform,
-                 headers=None, session=None, logger=None, timeout=None):
+                 headers=None, session=None, logger=None, timeout=None,
+                 json_backend='json', pool_connections=DEFAULT_POOL_CONNECTIONS,
+                 pool_maxsize=DEFAULT_POOL_MAXSIZE, pool_block=False,
+                 tcp_keepalive=None, retry_policy=None, reference_cache=None,
+                 session_per_thread=False, instrumentation=None,
+                 response_cache=None, single_flight=None):
         """Connect parameter initialization.
 
         Args:
@@ -36,6 +59,40 @@ class Connect(object):
             logger (logging.Logger, optional): The logging logger instance.
             timeout (float or tuple, optional): How long to wait for the server to send
                 data before giving up, as a float, or a :ref:`(connect timeout,read timeout) <timeouts>` tuple.
+            json_backend (str, optional): The library serializing the request
+                body and decoding the response, one of ``json``, ``orjson``,
+                ``ujson`` or ``auto`` for the fastest one installed.
+            pool_connections (int, optional): The number of host pools to
+                cache.
+            pool_maxsize (int, optional): The maximum number of connections
+                kept alive per host, size it to the number of threads sharing
+                the connect.
+            pool_block (bool, optional): Wait for a free connection when all
+                the connections of the host are busy, instead of opening a
+                connection that is discarded after the request.
+            tcp_keepalive (int, optional): Enable TCP keep-alive probes after
+                the given idle seconds, so that the idle pooled connections
+                are not silently dropped by the firewalls.
+            retry_policy (rayvision_api.retry.RetryPolicy, optional): The
+                retries of the transient failures, each connect gets its own
+                policy and retry budget by default.
+            reference_cache (rayvision_api.cache.ReferenceCache, optional):
+                Reuse the reference data responses, e.g. the supported
+                software, see ``rayvision_api.cache``.
+            session_per_thread (bool, optional): Give each thread its own
+                session, with its own connection pool, instead of sharing
+                the session between the threads. Ignored if ``session`` is
+                given.
+            instrumentation (rayvision_api.metrics.Instrumentation,
+                optional): Receive the measures of each call, see
+                ``rayvision_api.metrics``, nothing is measured by default.
+            response_cache (rayvision_api.response_cache.ResponseCache,
+                optional): Answer the calls of the read-only endpoints from
+                the cache, see ``rayvision_api.response_cache``.
+            single_flight (rayvision_api.single_flight.SingleFlight,
+                optional): Send one request for the identical concurrent
+                calls of the read-only endpoints, see
+                ``rayvision_api.single_flight``.
         """
         self.logger = logger if logger else logging.getLogger(__name__)
         self.url = ApiUrl
@@ -47,24 +104,131 @@ class Connect(object):
         _headers = copy.deepcopy(HEADERS)
         if headers:
             _headers.update(headers)
+        _headers['accessId'] = access_id
+        _headers['platform'] = platform
+        # The requests copy it, the changes apply to the next requests.
         self._headers = _headers
-        self._headers['accessId'] = access_id
         self.timeout = timeout
-        self._session_request = session or requests.Session()
-        self._headers['platform'] = self.platform
+        self._serializer = get_serializer(json_backend)
+        self._pool_connections = pool_connections
+        self._pool_maxsize = pool_maxsize
+        self._pool_block = pool_block
+        self._tcp_keepalive = tcp_keepalive
+        self.retry_policy = retry_policy or self._create_retry_policy()
+        self.reference_cache = reference_cache
+        self.instrumentation = instrumentation
+        self.response_cache = response_cache
+        self.single_flight = single_flight
+        self._session_per_thread = session_per_thread and session is None
+        self._sessions_lock = threading.Lock()
+        # The sessions of the threads, with a weak reference to each thread.
+        self._thread_sessions = []
+        # The statistics of the sessions of the exited threads.
+        self._exited_stats = empty_pool_stats()
+        self._local = threading.local()
+        if self._session_per_thread:
+            session = None
+        else:
+            session = session or self._create_session()
+        self._session_request = session
+
+    def _create_retry_policy(self):
+        """rayvision_api.retry.RetryPolicy: Create the default policy."""
+        return RetryPolicy()
+
+    def _create_session(self):
+        """requests.Session: Create the session of the requests."""
+        session = requests.Session()
+        socket_options = None
+        if self._tcp_keepalive:
+            socket_options = keepalive_socket_options(idle=self._tcp_keepalive)
+        for prefix in ('https://', 'http://'):
+            session.mount(prefix, PoolingHTTPAdapter(
+                pool_connections=self._pool_connections,
+                pool_maxsize=self._pool_maxsize,
+                pool_block=self._pool_block,
+                socket_options=socket_options))
+        return session
+
+    @property
+    def session(self):
+        """requests.Session: The session of the current thread."""
+        if not self._session_per_thread:
+            return self._session_request
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = self._create_session()
+            self._local.session = session
+            with self._sessions_lock:
+                self._close_exited_sessions()
+                self._thread_sessions.append(
+                    (weakref.ref(threading.current_thread()), session))
+        return session
+
+    def _close_exited_sessions(self):
+        """Close the sessions of the exited threads, keeping their stats.
+
+        Called with the lock of the sessions held.
+
+        """
+        alive = []
+        for thread_ref, session in self._thread_sessions:
+            thread = thread_ref()
+            if thread is not None and thread.is_alive():
+                alive.append((thread_ref, session))
+                continue
+            self._exited_stats = add_pool_stats(self._exited_stats,
+                                                pool_stats(session))
+            session.close()
+        self._thread_sessions = alive
+
+    @property
+    def pool_stats(self):
+        """dict: The connection statistics, see ``rayvision_api.pool``.
+
+        The statistics of the sessions of all the threads are summed when
+        each thread has its own session, the exited threads included.
+
+        """
+        if not self._session_per_thread:
+            return pool_stats(self._session_request)
+        with self._sessions_lock:
+            self._close_exited_sessions()
+            sessions = [session for _, session in self._thread_sessions]
+            total = dict(self._exited_stats)
+        for session in sessions:
+            total = add_pool_stats(total, pool_stats(session))
+        return total
+
+    def close(self):
+        """Close the sessions of the current connect, of all the threads."""
+        with self._sessions_lock:
+            sessions = [session for _, session in self._thread_sessions]
+            self._thread_sessions = []
+        if self._session_request is not None:
+            sessions.append(self._session_request)
+        for session in sessions:
+            session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
 
     @property
     def headers(self):
-        """Get request headers dic."""
+        """dict: The base headers of the requests, changing it changes the
+        headers of the next requests."""
         return self._headers
 
-    @retry(reraise=True, stop=stop_after_attempt(5),
-           wait=wait_random(min=1, max=2))
     def post(self, api_url, data=None, validator=True):
         """Send an post request and return data object if no error occurred.
 
-        Request processing through the decorator, if the request fails more
-        than five times, then the exception is ran out.
+        The transient failures are retried according to the retry policy,
+        the other errors are raised at once. The identical calls in flight
+        share one request with the single flight, and the responses of the
+        endpoints cached by the response cache are reused until they expire.
 
         Args:
             api_url (rayvision_api.api.url.URL or str): The URL address of the
@@ -83,26 +247,132 @@ class Connect(object):
             RayVisionAPIError: The request failed, It returns the error ID,
                 the error message, and the request address.
 
+        """
+        if self.single_flight is not None:
+            return self.single_flight.call(self, api_url, data,
+                                           self._cached_send, api_url, data,
+                                           validator)
+        return self._cached_send(api_url, data, validator)
+
+    def _cached_send(self, api_url, data=None, validator=True):
+        """Get the response from the response cache or send the request."""
+        if self.response_cache is not None:
+            return self.response_cache.call(self, api_url, data, self._send,
+                                            api_url, data, validator)
+        return self._send(api_url, data, validator)
+
+    def _send(self, api_url, data=None, validator=True):
+        """Send the post request, retrying the transient failures."""
+        if self.instrumentation is None:
+            return self.retry_policy.call(self._post, api_url, data, validator)
+        sample = RequestSample(api_url)
+        try:
+            result = self.retry_policy.call(self._post, api_url, data,
+                                            validator, sample)
+        except Exception as err:
+            self._record_sample(sample, err)
+            raise
+        self._record_sample(sample)
+        return result
+
+    def _record_sample(self, sample, error=None):
+        """Give the measures of a finished call to the instrumentation."""
+        sample.finish(error)
+        try:
+            self.instrumentation.record(sample)
+        except Exception as err:  # pylint: disable=broad-except
+            self.logger.warning('Failed to record the request metrics: %s',
+                                err)
+
+    def _post(self, api_url, data=None, validator=True, sample=None):
+        """Send one attempt of the post request."""
+        if sample is not None:
+            sample.start_attempt()
+        request_address, headers, body = self._prepare_request(
+            api_url, data, validator, sample)
+        response = self.session.post(request_address, body, headers=headers, timeout=self.timeout)
+        if sample is not None:
+            sample.mark('network')
+            sample.request_bytes += len(body)
+            sample.response_bytes += len(response.content)
+        self._check_status(response.status_code, response.reason,
+                           response.url)
+        json_response = self._serializer.loads(response.content)
+        if sample is not None:
+            sample.mark('decode')
+        return self._handle_response(json_response, response.url)
+
+    def _check_status(self, status, reason, url):
+        """Raise the HTTP errors retried by the retry policy.
+
+        Their body is not the API's, e.g. the HTML page of a proxy.
+
+        Raises:
+            RayvisionHTTPStatusError: The HTTP status is one of the retryable
+                codes of the retry policy.
+
+        """
+        if status in self.retry_policy.retryable_codes:
+            raise RayvisionHTTPStatusError(status, reason, url)
+
+    def _prepare_request(self, api_url, data=None, validator=True,
+                         sample=None):
+        """Validate, sign and serialize the request.
+
+        Args:
+            api_url (str): The api url.
+            data (dict, optional): Request data.
+            validator (bool, optional): Validator the data.
+            sample (rayvision_api.metrics.RequestSample, optional): Measure
+                the phases of the request.
+
+        The body is serialized once, the signature is computed from the
+        request data directly.
+
+        Returns:
+            tuple: The request address, the signed headers and the
+                serialized body as bytes.
+
         """
         data = data or {}
         schema_name = api_url.split("/")[-2] if api_url.endswith("v2") else api_url.split("/")[-1]
         if validator:
             data = validate_data(data, schema_name)
+        if sample is not None:
+            sample.mark('validation')
         request_address = assemble_api_url(self.domain, api_url,
                                            protocol=self._protocol)
         headers = self._handle_headers(api_url, data)
         headers["languageFlag"] = "1" if "renderbus" in self.domain else "0"
-        data = json.dumps(data)
-        self.logger.debug('POST: %s', request_address)
-        self.logger.debug('HTTP Headers: %s', pformat(headers))
-        self.logger.debug('HTTP Body: %s', data)
-        response = self._session_request.post(request_address, data, headers=headers, timeout=self.timeout)
-        json_response = response.json()
+        if sample is not None:
+            sample.mark('signing')
+        body = self._serializer.dumps(data)
+        if sample is not None:
+            sample.mark('encode')
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug('POST: %s', request_address)
+            self.logger.debug('HTTP Headers: %s', pformat(headers))
+            self.logger.debug('HTTP Body: %s', body.decode('utf-8'))
+        return request_address, headers, body
+
+    def _handle_response(self, json_response, url):
+        """Unpack the response data.
+
+        Args:
+            json_response (dict): The decoded response.
+            url (str): The request url.
+
+        Returns:
+            dict or List: Response data.
+
+        Raises:
+            RayVisionAPIError: The server returned an error code.
+
+        """
         self.logger.debug('HTTP Response: %s', json_response)
         code = json_response["code"]
         if code != 200:
-            raise RayvisionAPIError(code, json_response['message'],
-                                    response.url)
+            raise RayvisionAPIError(code, json_response['message'], url)
         return json_response["data"]
 
     def _handle_headers(self, api_url, data):
@@ -127,7 +397,7 @@ class Connect(object):
                     }
 
         """
-        headers = copy.deepcopy(self._headers)
+        headers = dict(self._headers)
         headers['UTCTimestamp'] = str(int(time.time()))
         headers['nonce'] = signature.generate_nonce()
         msg = signature.generate_headers_body_str(self.domain, api_url,
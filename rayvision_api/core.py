@@ -1,12 +1,18 @@
 """Initialize user, task, query, environment, tag interface."""
 
+import collections
+import functools
 import json
 import logging
 import os
+from concurrent.futures import ThreadPoolExecutor
 
 from future.moves.urllib.error import HTTPError
 
+from rayvision_api.cache import ReferenceCache
+from rayvision_api.cache import scoped_cache
 from rayvision_api.connect import Connect
+from rayvision_api.constants import CG_SETTING
 from rayvision_api.constants import PACKAGE_NAME
 from rayvision_api.exception import RayvisionError, RayvisonTaskIdError, UploadFileNotSupportError
 from rayvision_api.operators import QueryOperator
@@ -18,6 +24,11 @@ from rayvision_api.operators import UserOperator
 from rayvision_api.task.check import RayvisionCheck
 from rayvision_log import init_logger
 
+# The outcome of one task of ``RayvisionAPI.submit_many``, ``error`` is the
+# exception that stopped the task, None if it is submitted.
+SubmitResult = collections.namedtuple('SubmitResult',
+                                      ['task_id', 'task_info', 'error'])
+
 
 class RayvisionAPI(object):
     """Create the request object.
@@ -36,10 +47,25 @@ class RayvisionAPI(object):
                  log_folder=None,
                  log_name=None,
                  log_level="DEBUG",
-                 timeout=60
+                 timeout=60,
+                 json_backend='json',
+                 pool_maxsize=10,
+                 pool_block=False,
+                 tcp_keepalive=None,
+                 retry_policy=None,
+                 user_info_cache=None,
+                 lazy_login=False,
+                 reference_cache=None,
+                 session_per_thread=False,
+                 instrumentation=None,
+                 response_cache=None,
+                 single_flight=None
                  ):
         """Please note that this is API parameter initialization.
 
+        One instance can be shared by the threads of a pool, the login is
+        then done once for all of them.
+
         Args:
             access_id (str, optional): The access id of API.
             access_key (str, optional): The access key of the API.
@@ -52,6 +78,37 @@ class RayvisionAPI(object):
             log_level (str, optional): Custom log level, default "DEBUG".
             timeout (float or tuple, optional): How long to wait for the server to send
                 data before giving up, as a float, or a :ref:`(connect timeout,read timeout) <timeouts>` tuple.
+            json_backend (str, optional): The library serializing the requests,
+                one of ``json``, ``orjson``, ``ujson`` or ``auto``.
+            pool_maxsize (int, optional): The maximum number of connections
+                kept alive, size it to the number of threads sharing the API.
+            pool_block (bool, optional): Wait for a free connection instead of
+                opening a throwaway connection when the pool is exhausted.
+            tcp_keepalive (int, optional): Enable TCP keep-alive probes after
+                the given idle seconds.
+            retry_policy (rayvision_api.retry.RetryPolicy, optional): The
+                retries of the transient failures, see ``rayvision_api.retry``.
+            user_info_cache (rayvision_api.user_cache.UserInfoCache,
+                optional): Reuse the user information saved by a previous
+                login of the same account until it expires.
+            lazy_login (bool, optional): Request the user information on the
+                first access of ``user_info`` instead of here.
+            reference_cache (rayvision_api.cache.ReferenceCache, optional):
+                Reuse the reference data responses, e.g. the supported
+                plugins, see ``rayvision_api.cache``.
+            session_per_thread (bool, optional): Give each thread its own
+                HTTP session instead of sharing the connection pool.
+            instrumentation (rayvision_api.metrics.Instrumentation,
+                optional): Receive the latency, payload sizes, retries and
+                error code of each request, see ``rayvision_api.metrics``.
+            response_cache (rayvision_api.response_cache.ResponseCache,
+                optional): Reuse the responses of the read-only endpoints,
+                also between processes with a SQLite backend, see
+                ``rayvision_api.response_cache``.
+            single_flight (rayvision_api.single_flight.SingleFlight,
+                optional): Send one request for the identical calls made at
+                the same time by several threads, see
+                ``rayvision_api.single_flight``.
         """
         self.logger = logger
         self.platform = platform
@@ -79,7 +136,17 @@ class RayvisionAPI(object):
                                 domain,
                                 platform,
                                 logger=self.logger,
-                                timeout=timeout)
+                                timeout=timeout,
+                                json_backend=json_backend,
+                                pool_maxsize=pool_maxsize,
+                                pool_block=pool_block,
+                                tcp_keepalive=tcp_keepalive,
+                                retry_policy=retry_policy,
+                                reference_cache=reference_cache,
+                                session_per_thread=session_per_thread,
+                                instrumentation=instrumentation,
+                                response_cache=response_cache,
+                                single_flight=single_flight)
 
         # Initial all api instance. 
         self.user = UserOperator(self._connect)
@@ -89,10 +156,12 @@ class RayvisionAPI(object):
         self.env = RenderEnvOperator(self._connect)
         self.transmit = TransmitOperator(self._connect)
 
-        try:
+        self._access_id = access_id
+        self._user_info_cache = user_info_cache
+        if lazy_login:
+            self.user.set_loader(self._login)
+        else:
             self._login()
-        except HTTPError:
-            raise RayvisionError(20020, 'Login failed.')
 
     @property
     def user_info(self):
@@ -107,15 +176,25 @@ class RayvisionAPI(object):
         """Supplement user's configuration information.
 
         Call the API interface (query_user_profile, query_user_setting,
-        get_transfer_bid) to supplement the user's configuration information
+        get_transfer_bid) to supplement the user's configuration information,
+        the cached information is used instead when it is still valid.
 
         """
-        user_profile = self.user.query_user_profile()
-        user_setting = self.user.query_user_setting()
-        transfer_bid = self.user.get_transfer_bid()
-        user_profile.update(user_setting)
-        user_profile.update(transfer_bid)
-        self.user._update_user_info(user_profile)
+        cache = self._user_info_cache
+        cache_key = (self._access_id, self._connect.domain, self.platform)
+        user_profile = cache.get(*cache_key) if cache else None
+        if user_profile:
+            self.user._update_user_info(user_profile)
+            return
+        try:
+            user_profile = self.user._login()
+        except HTTPError:
+            raise RayvisionError(20020, 'Login failed.')
+        if cache:
+            try:
+                cache.set(*cache_key, info=user_profile)
+            except (IOError, OSError) as err:
+                self.logger.warning('Failed to cache the user info: %s', err)
 
     def get_user_id(self):
         """Get user id.
@@ -199,19 +278,194 @@ class RayvisionAPI(object):
         return True
 
 
-    def submit_by_data(self, task_info, file_name="task.json", producer=None):
+    def submit_by_data(self, task_info, hardware_config, file_name="task.json", producer=None):
         """Submit tasks based on json files.
 
+        The task information is checked in memory, no json file is written.
+
         Args:
-            task_info (string): task.json content.
+            task_info (dict): task.json content.
+            hardware_config (dict): The model, ram and gpuNum of the wanted
+                hardware, see ``RayvisionCheck.execute``.
             file_name (string, optional): The name of the json file to be uploaded, only support ""
             producer (string, optional): Producer.
 
         Returns:
 
         """
-        task_info, task_id = RayvisionCheck(self).execute(task_info, only_id=False)
+        task_info, task_id = RayvisionCheck(self).execute(hardware_config, task_info, only_id=False,
+                                                          in_memory=True)
         task_info = json.dumps(task_info)
         self.transmit.upload_json_content(task_id, file_name=file_name, content=task_info)
         self.task.submit_task(task_id, producer)
         return True
+
+    def submit_many(self, task_infos, hardware_config, concurrency=4,
+                    file_name="task.json", producer=None, id_block_size=100):
+        """Check, upload and submit many tasks concurrently.
+
+        The missing task IDs are created in blocks, or taken from the task
+        id pool when it is enabled, the user id and the
+        project ids are requested once for the batch, and the reference data
+        (supported plugins, hardware configurations) is shared by the checks
+        through the reference cache, a cache is used by the threads of the
+        batch if the API has none. Each task is then checked in memory, uploaded and
+        submitted by a pool of workers, the failure of a task, a malformed
+        task info included, does not stop the other ones. The ids taken for
+        the tasks failing before their check are given back to the task id
+        pool when it is enabled, the result of the other failed tasks
+        reports their id.
+
+        Args:
+            task_infos (list of dict): The task.json contents.
+            hardware_config (dict): The model, ram and gpuNum of the hardware
+                of all the tasks.
+            concurrency (int, optional): The number of tasks processed at
+                the same time.
+            file_name (string, optional): The name of the uploaded json file.
+            producer (string, optional): Producer.
+            id_block_size (int, optional): The quantity of task ID created by
+                one request.
+
+        Returns:
+            list of SubmitResult: The result of each task, in order.
+
+        """
+        task_infos = list(task_infos)
+        errors = [None] * len(task_infos)
+        self._prepare_batch(task_infos, errors, id_block_size)
+        cache = self._connect.reference_cache
+        if cache is None:
+            cache = ReferenceCache()
+        self._warm_reference_data(
+            [task_info for task_info, error in zip(task_infos, errors)
+             if error is None], cache)
+        with ThreadPoolExecutor(max_workers=max(int(concurrency), 1)) as executor:
+            futures = [
+                executor.submit(self._submit_one, task_info, hardware_config,
+                                file_name, producer, cache)
+                if error is None else None
+                for task_info, error in zip(task_infos, errors)]
+        results = []
+        for task_info, error, future in zip(task_infos, errors, futures):
+            task_id = None
+            if future is not None:
+                error = future.exception()
+            if error is None:
+                task_info = future.result()
+            try:
+                task_id = int(task_info["task_info"]["task_id"])
+            except (KeyError, TypeError, ValueError):
+                pass
+            results.append(SubmitResult(task_id, task_info, error))
+        return results
+
+    def _prepare_batch(self, task_infos, errors, id_block_size):
+        """Fill the ids of the tasks with a few requests.
+
+        The errors are recorded in ``errors`` at the index of the task, the
+        malformed tasks are not prepared. The ids taken for the tasks that
+        failed here are given back to the task id pool when it is enabled,
+        otherwise they are kept in the task info and reported by the result.
+
+        """
+        valid = []
+        for index, task_info in enumerate(task_infos):
+            if (isinstance(task_info, dict)
+                    and isinstance(task_info.get("task_info"), dict)):
+                valid.append(index)
+            else:
+                errors[index] = RayvisionError(
+                    2000, "task info must be a dict with a task_info dict.")
+
+        missing = [index for index in valid
+                   if not task_infos[index]["task_info"].get("task_id")]
+        taken = {}
+        try:
+            task_ids = self.task.take_task_ids(len(missing),
+                                               block_size=id_block_size)
+        except Exception as err:  # pylint: disable=broad-except
+            for index in missing:
+                errors[index] = err
+        else:
+            for index, task_id in zip(missing, task_ids):
+                taken[index] = task_id
+                task_infos[index]["task_info"]["task_id"] = str(task_id)
+
+        if any(not task_infos[index]["task_info"].get("user_id")
+               for index in valid):
+            try:
+                user_id = str(self.get_user_id())
+            except Exception as err:  # pylint: disable=broad-except
+                user_id = None
+                for index in valid:
+                    if not task_infos[index]["task_info"].get("user_id"):
+                        errors[index] = errors[index] or err
+            for index in valid:
+                task_info = task_infos[index]["task_info"]
+                if user_id and not task_info.get("user_id"):
+                    task_info["user_id"] = user_id
+
+        project_ids = {}
+        for index in valid:
+            task_info = task_infos[index]["task_info"]
+            project_name = task_info.get("project_name")
+            if task_info.get("project_id") or not project_name:
+                continue
+            try:
+                if project_name not in project_ids:
+                    project_ids[project_name] = str(
+                        self.check_and_add_project_name(project_name))
+            except Exception as err:  # pylint: disable=broad-except
+                errors[index] = errors[index] or err
+                continue
+            task_info["project_id"] = project_ids[project_name]
+
+        pool = self.task.task_id_pool
+        if pool is not None:
+            for index, task_id in taken.items():
+                if errors[index] is not None:
+                    pool.put(task_id)
+                    task_infos[index]["task_info"]["task_id"] = ""
+
+    def _warm_reference_data(self, task_infos, cache):
+        """Request the reference data of the batch once, before the checks.
+
+        The failures are ignored here, they are raised by the checks of the
+        tasks concerned.
+
+        Args:
+            task_infos (list of dict): The task.json contents.
+            cache (rayvision_api.cache.ReferenceCache): The cache of the
+                batch.
+
+        """
+        requests = [self.user.get_hardware_catalog]
+        for cg_id in set(str(task_info["task_info"].get("cg_id"))
+                         for task_info in task_infos):
+            if cg_id in CG_SETTING:
+                requests.append(functools.partial(
+                    self.query.supported_plugin, CG_SETTING[cg_id].lower()))
+        for request in requests:
+            try:
+                with scoped_cache(self._connect, cache):
+                    request()
+            except Exception:  # pylint: disable=broad-except
+                self.logger.debug('Failed to get the reference data.',
+                                  exc_info=True)
+
+    def _submit_one(self, task_info, hardware_config, file_name, producer,
+                    cache):
+        """Check, upload and submit one task of ``submit_many``.
+
+        The reference data is read from the cache of the batch, the cache
+        of the connect shared by the other threads is left unchanged.
+
+        """
+        with scoped_cache(self._connect, cache):
+            task_info, task_id = RayvisionCheck(self).execute(
+                hardware_config, task_info, only_id=False, in_memory=True)
+        self.transmit.upload_json_content(task_id, file_name=file_name,
+                                          content=json.dumps(task_info))
+        self.task.submit_task(task_id, producer, only_id=True)
+        return task_info
@@ -67,6 +67,35 @@ class RayvisionAPIError(RayvisionError):
             self.request)
 
 
+class RayvisionHTTPStatusError(RayvisionAPIError):
+    """Raise RayvisionHTTPStatusError if the HTTP status is an error.
+
+    The ``error_code`` is the HTTP status of the response, e.g. 503, not an
+    error code of the API: the response has no API body.
+
+    """
+
+    def __init__(self, status, reason, request):
+        """Initialize HTTP error message, inherited RayvisionAPIError.
+
+        Args:
+            status (int): The HTTP status.
+            reason (str): The HTTP reason.
+            request (str): Request url.
+
+        """
+        super(RayvisionHTTPStatusError, self).__init__(status, reason,
+                                                       request)
+        self.status = status
+
+    def __str__(self):
+        """Let its object print out an error message."""
+        return 'HTTP status: {}, Reason: {}, URL: {}'.format(
+            self.status,
+            self.error,
+            self.request)
+
+
 # pylint: disable=no-init
 class RayvisionHTTPErrorProcessor(HTTPErrorProcessor):
     """Process HTTP error responses.
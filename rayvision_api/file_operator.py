@@ -3,6 +3,8 @@
 # Import built-in modules
 import codecs
 import json
+import os
+import tempfile
 
 # Import third-party modules
 import yaml
@@ -57,6 +59,34 @@ def write_json(json_path, data, encoding='utf-8', ensure_ascii=True):
         json.dump(data, f_json, ensure_ascii=ensure_ascii, indent=2)
 
 
+def write_json_atomic(json_path, data, mode=0o600):
+    """Save the data to the json file atomically.
+
+    The data is written to a temporary file then renamed, so that a
+    concurrent process never reads a partial file.
+
+    Args:
+        json_path (str): Json file path, its folder must exist.
+        data (dict): The data to save.
+        mode (int): The permissions of the file, only readable by the
+            current user by default.
+
+    """
+    handle, temp_path = tempfile.mkstemp(dir=os.path.dirname(json_path),
+                                         suffix='.tmp')
+    try:
+        with os.fdopen(handle, 'w') as f_json:
+            json.dump(data, f_json)
+        os.chmod(temp_path, mode)
+        if os.name == 'nt' and os.path.exists(json_path):
+            os.remove(json_path)
+        os.rename(temp_path, json_path)
+    except (IOError, OSError):
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
 def read_load(json_path, encoding='utf-8'):
     """Load the data from the json file.
 
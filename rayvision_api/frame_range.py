@@ -0,0 +1,296 @@
+"""Parse the frame range expressions of the render farm.
+
+A frame range expression is a comma separated list of frames, frame ranges
+and stepped frame ranges, several expressions can be given as a list.
+
+Example::
+
+    >>> spec = FrameSpec(["2-8[3]", "10,12-13"])
+    >>> list(spec)
+    [2, 5, 8, 10, 12, 13]
+    >>> "5" in spec, 6 in spec
+    (True, False)
+
+"""
+
+# Import built-in modules
+import bisect
+import heapq
+import re
+
+# https://regex101.com/r/7ZbSOE/1
+FRAME_PATTERN = re.compile(r'^(-?\d+)(?:-(-?\d+))?(?:\[(\d+)\])?$')
+
+
+def frame_number(frame_index):
+    """Get the numeric frame of the frame index.
+
+    Args:
+        frame_index (str or int): The frame index of the frame record.
+
+    Returns:
+        int: The frame number, None if the frame index is not a number.
+
+    """
+    try:
+        return int(str(frame_index).strip())
+    except ValueError:
+        return None
+
+
+def index_frames(frames):
+    """Index the frame records by the numeric frame.
+
+    Args:
+        frames (iterable of dict): The frame records, see
+            ``QueryOperator.task_frames``.
+
+    Returns:
+        dict: The frame records keyed by the numeric frame, the frames
+            without a numeric frame index are left out.
+
+    """
+    indexed = {}
+    for per in frames:
+        number = frame_number(per["frameIndex"])
+        if number is not None:
+            indexed[number] = per
+    return indexed
+
+
+class FrameSpec(object):
+    """The set of frames described by frame range expressions.
+
+    The continuous ranges are merged into sorted intervals and looked up with
+    a binary search, the stepped ranges are kept as ``(start, end, step)``
+    and matched arithmetically, so that a long stepped range is never
+    expanded.
+
+    The raw tokens are also kept, so that a frame record whose frame index is
+    literally one of the tokens (e.g. ``"2-4[1]"``) is still matched.
+
+    """
+
+    def __init__(self, specs):
+        """Initialize instance.
+
+        Args:
+            specs (str or list of str): The frame range expressions.
+                e.g.:
+                    ["2-4[1]", "10"]
+                    "1-100[2],150"
+
+        Raises:
+            ValueError: A range is reversed or its step is not positive.
+
+        """
+        if isinstance(specs, (str, int)):
+            specs = [specs]
+        self.tokens = set()
+        ranges = []
+        for spec in specs:
+            for token in str(spec).split(","):
+                token = token.strip()
+                if not token:
+                    continue
+                self.tokens.add(token)
+                frame_range = self._parse_token(token)
+                if frame_range:
+                    ranges.append(frame_range)
+        self._starts, self._ends = self._merge_intervals(
+            [(start, end) for start, end, step in ranges if step == 1])
+        self._stepped = sorted(frame_range for frame_range in ranges
+                               if frame_range[2] != 1)
+        self._length = self._count()
+
+    @staticmethod
+    def _parse_token(token):
+        """tuple: Parse one token into ``(start, end, step)``."""
+        match = FRAME_PATTERN.match(token)
+        if not match:
+            return None
+        start, end, step = match.groups()
+        start = int(start)
+        end = int(end) if end is not None else start
+        step = int(step) if step is not None else 1
+        if end < start:
+            raise ValueError("Invalid frame range {}: the end frame is lower "
+                             "than the start frame.".format(token))
+        if step < 1:
+            raise ValueError("Invalid frame range {}: the step must be "
+                             "positive.".format(token))
+        return start, end, step
+
+    @staticmethod
+    def _merge_intervals(intervals):
+        """Merge the overlapping and adjacent intervals.
+
+        Returns:
+            tuple: The sorted starts and ends of the merged intervals.
+
+        """
+        starts, ends = [], []
+        for start, end in sorted(intervals):
+            if ends and start <= ends[-1] + 1:
+                ends[-1] = max(ends[-1], end)
+            else:
+                starts.append(start)
+                ends.append(end)
+        return starts, ends
+
+    @staticmethod
+    def _count_steps(start, step, low, high):
+        """int: The number of frames ``start + k * step`` in [low, high]."""
+        first = max(0, -((start - low) // step))
+        last = (high - start) // step
+        return max(0, last - first + 1)
+
+    def _count(self):
+        """Count the numeric frames without expanding the ranges.
+
+        Returns:
+            int: The number of frames, None if stepped ranges overlap each
+                other and the frames must be iterated to be counted.
+
+        """
+        length = sum(end - start + 1
+                     for start, end in zip(self._starts, self._ends))
+        previous_end = None
+        for start, end, step in self._stepped:
+            if previous_end is not None and start <= previous_end:
+                return None
+            previous_end = end
+            length += self._count_steps(start, step, start, end)
+            # Remove the frames already counted by the intervals.
+            position = max(bisect.bisect_right(self._starts, start) - 1, 0)
+            while (position < len(self._starts) and
+                   self._starts[position] <= end):
+                length -= self._count_steps(
+                    start, step, max(start, self._starts[position]),
+                    min(end, self._ends[position]))
+                position += 1
+        return length
+
+    def _in_intervals(self, number):
+        position = bisect.bisect_right(self._starts, number) - 1
+        return position >= 0 and number <= self._ends[position]
+
+    def _in_stepped(self, number):
+        for start, end, step in self._stepped:
+            if start > number:
+                return False
+            if number <= end and (number - start) % step == 0:
+                return True
+        return False
+
+    def __contains__(self, frame):
+        number = frame_number(frame)
+        if number is None:
+            return False
+        return self._in_intervals(number) or self._in_stepped(number)
+
+    def __len__(self):
+        """int: The number of numeric frames."""
+        if self._length is None:
+            self._length = sum(1 for _ in self)
+        return self._length
+
+    def __bool__(self):
+        return bool(self._starts or self._stepped or self.tokens)
+
+    __nonzero__ = __bool__
+
+    def __iter__(self):
+        """Iterate over the numeric frames in ascending order."""
+        ranges = [range(start, end + 1)
+                  for start, end in zip(self._starts, self._ends)]
+        ranges.extend(range(start, end + 1, step)
+                      for start, end, step in self._stepped)
+        previous = None
+        for number in heapq.merge(*ranges):
+            if number != previous:
+                previous = number
+                yield number
+
+    def __repr__(self):
+        return "FrameSpec({!r})".format(sorted(self.tokens))
+
+    def matcher(self):
+        """FrameMatcher: Get a matcher to select the frames of a stream."""
+        return FrameMatcher(self)
+
+    def select(self, frames):
+        """Select the frame records matching the frame range expressions.
+
+        The iteration over ``frames`` stops as soon as all the frames have
+        been found.
+
+        Args:
+            frames (iterable of dict): The frame records.
+
+        Yields:
+            dict: The matched frame records.
+
+        """
+        matcher = self.matcher()
+        if matcher.done:
+            return
+        for per in frames:
+            if matcher.add(per["frameIndex"]):
+                yield per
+            if matcher.done:
+                break
+
+
+class FrameMatcher(object):
+    """Match a stream of frame indexes against a ``FrameSpec``.
+
+    Each numeric frame and each literal token is only matched once, the
+    matcher is done when all the numeric frames have been found, or all the
+    literal tokens if the spec has no numeric frame: the block frames
+    reported by the farm, e.g. ``"1-3"``, match the tokens before the frames
+    they contain.
+
+    """
+
+    def __init__(self, spec):
+        """Initialize instance.
+
+        Args:
+            spec (FrameSpec): The frames to match.
+
+        """
+        self._spec = spec
+        self._numbers = set()
+        self._tokens = set()
+
+    def add(self, frame_index):
+        """Match one frame index.
+
+        Args:
+            frame_index (str or int): The frame index of the frame record.
+
+        Returns:
+            bool: True if the frame is matched for the first time.
+
+        """
+        index = str(frame_index)
+        matched = False
+        if index in self._spec.tokens and index not in self._tokens:
+            self._tokens.add(index)
+            matched = True
+        number = frame_number(index)
+        if (number is not None and number not in self._numbers and
+                number in self._spec):
+            self._numbers.add(number)
+            matched = True
+        return matched
+
+    @property
+    def done(self):
+        """bool: All the requested frames have been found."""
+        if not self._spec:
+            return True
+        if len(self._spec):
+            return len(self._numbers) == len(self._spec)
+        return len(self._tokens) == len(self._spec.tokens)
@@ -6,7 +6,7 @@ import os
 import sys
 
 from rayvision_api.exception import RayvisionError
-from rayvision_api.paths import convert_path
+from rayvision_api.utils import add_upload_assets
 
 VERSION = sys.version_info[0]
 
@@ -126,43 +126,19 @@ def check_upload_file(file_path, upload_info):
 def append_to_upload(files_paths, upload_path):
     """Add the asset information you need to upload to upload_info.
 
+    The assets are merged by ``rayvision_api.utils.add_upload_assets``, and
+    the upload json is written once.
+
     Args:
-        files_paths (str or list): You need to add the uploaded asset path.
+        files_paths (str or iterable of str): You need to add the uploaded
+            asset path, a generator of paths is consumed lazily.
         upload_path (str): Upload json path.
 
+    Raises:
+        RayvisionError: The paths are neither a string nor an iterable of
+            paths, or a file does not exist.
+
     """
     upload_info = check_and_read(upload_path)
-    if isinstance(files_paths, str):
-        files_paths = files_paths.replace("\\", "/")
-        if not os.path.exists(files_paths):
-            raise RayvisionError(1000004, "{} is not found".format(files_paths))
-
-        status = check_upload_file(files_paths, upload_info)
-        if status:
-            return
-
-        upload_info["asset"].append(
-            {
-                "local": files_paths.replace("\\", "/"),
-                "server": convert_path(files_paths),
-            },
-        )
-    elif isinstance(files_paths, list):
-        for files_path in files_paths:
-            files_path = files_path.replace("\\", "/")
-            if not os.path.exists(files_path):
-                raise RayvisionError(1000004,
-                                     "{} is not found".format(files_path))
-
-            status = check_upload_file(files_path, upload_info)
-            if status:
-                continue
-
-            upload_info["asset"].append({
-                "local": files_path.replace("\\", "/"),
-                "server": convert_path(files_path),
-            })
-    else:
-        raise RayvisionError(1000003, "files_paths must be a str or list.".format(files_paths))
-
+    add_upload_assets(upload_info, files_paths)
     json_save(upload_path, upload_info)
@@ -0,0 +1,395 @@
+"""Measure the latency and the throughput of the API endpoints.
+
+A connect created with an ``instrumentation`` records a ``RequestSample``
+per call: the time spent validating, signing, encoding, on the network and
+decoding, the payload sizes, the attempts and the error code. Nothing is
+measured when the connect has no instrumentation.
+
+Example::
+
+    >>> metrics = MetricsAggregator()
+    >>> api = RayvisionAPI(access_id="xxx", access_key="xxx",
+    ...                    instrumentation=metrics)
+    >>> api.query.platforms()
+    >>> metrics.snapshot()["/api/render/common/queryPlatforms"]["calls"]
+    1
+    >>> print(PrometheusExporter(metrics).render())
+
+"""
+
+# Import built-in modules
+import bisect
+import collections
+import threading
+from timeit import default_timer
+
+# The phases of a request, in order.
+PHASES = ('validation', 'signing', 'encode', 'network', 'decode')
+
+# The upper bounds in seconds of the latency histograms.
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0,
+                   10.0)
+
+# The error code of the successful calls.
+SUCCESS_CODE = 200
+
+
+class RequestSample(object):
+    """The measures of one call of an endpoint, retries included."""
+
+    __slots__ = ('endpoint', 'phases', 'request_bytes', 'response_bytes',
+                 'attempts', 'error_code', 'duration', '_clock', '_started',
+                 '_last')
+
+    def __init__(self, endpoint, clock=default_timer):
+        """Initialize instance.
+
+        Args:
+            endpoint (str): The api url of the call, ``ApiUrl`` members
+                are stored as their path.
+            clock (callable, optional): Get the current time in seconds.
+
+        """
+        self.endpoint = getattr(endpoint, 'value', endpoint)
+        self.phases = {}
+        self.request_bytes = 0
+        self.response_bytes = 0
+        self.attempts = 0
+        self.error_code = SUCCESS_CODE
+        self.duration = 0.0
+        self._clock = clock
+        self._started = self._last = clock()
+
+    @property
+    def retries(self):
+        """int: The attempts after the first one."""
+        return max(self.attempts - 1, 0)
+
+    def start_attempt(self):
+        """Start timing a new attempt."""
+        self.attempts += 1
+        self._last = self._clock()
+
+    def mark(self, phase):
+        """Add the time elapsed since the previous mark to the phase."""
+        now = self._clock()
+        self.phases[phase] = self.phases.get(phase, 0.0) + now - self._last
+        self._last = now
+
+    def finish(self, error=None):
+        """Stop timing the call.
+
+        Args:
+            error (Exception, optional): The error raised by the call, its
+                ``error_code`` or its class name is recorded.
+
+        """
+        self.duration = self._clock() - self._started
+        if error is not None:
+            self.error_code = getattr(error, 'error_code', None) or \
+                type(error).__name__
+
+
+class Instrumentation(object):
+    """The hook receiving the samples of a connect."""
+
+    def record(self, sample):
+        """Receive the sample of a finished call.
+
+        Args:
+            sample (RequestSample): The measures of the call.
+
+        """
+        raise NotImplementedError
+
+
+class InstrumentationGroup(Instrumentation):
+    """Send the samples to several instrumentations."""
+
+    def __init__(self, instrumentations):
+        """Initialize instance.
+
+        Args:
+            instrumentations (list of Instrumentation): The receivers.
+
+        """
+        self.instrumentations = list(instrumentations)
+
+    def record(self, sample):
+        for instrumentation in self.instrumentations:
+            instrumentation.record(sample)
+
+
+class Histogram(object):
+    """The count of the values per bucket, with their sum."""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        """Initialize instance.
+
+        Args:
+            buckets (tuple of float): The sorted upper bounds of the buckets.
+
+        """
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        """Add a value."""
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self):
+        """list of tuple: The upper bound and the count of values below it.
+
+        The last bound is ``float('inf')``.
+
+        """
+        total = 0
+        result = []
+        for bound, count in zip(self.buckets + (float('inf'),), self.counts):
+            total += count
+            result.append((bound, total))
+        return result
+
+    def to_dict(self):
+        """dict: The buckets, the sum and the count."""
+        return {'buckets': self.cumulative(), 'sum': self.sum,
+                'count': self.count}
+
+
+class EndpointMetrics(object):
+    """The aggregated measures of one endpoint."""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.calls = 0
+        self.attempts = 0
+        self.retries = 0
+        self.request_bytes = 0
+        self.response_bytes = 0
+        self.codes = collections.Counter()
+        self.latency = Histogram(buckets)
+        self.phases = dict((phase, Histogram(buckets)) for phase in PHASES)
+
+    def add(self, sample):
+        """Aggregate a sample of the endpoint."""
+        self.calls += 1
+        self.attempts += sample.attempts
+        self.retries += sample.retries
+        self.request_bytes += sample.request_bytes
+        self.response_bytes += sample.response_bytes
+        self.codes[sample.error_code] += 1
+        self.latency.observe(sample.duration)
+        for phase, seconds in sample.phases.items():
+            histogram = self.phases.get(phase)
+            if histogram is None:
+                histogram = self.phases[phase] = Histogram(
+                    self.latency.buckets)
+            histogram.observe(seconds)
+
+    def to_dict(self):
+        """dict: The measures as plain data."""
+        return {
+            'calls': self.calls,
+            'attempts': self.attempts,
+            'retries': self.retries,
+            'errors': sum(count for code, count in self.codes.items()
+                          if code != SUCCESS_CODE),
+            'codes': dict(self.codes),
+            'request_bytes': self.request_bytes,
+            'response_bytes': self.response_bytes,
+            'latency': self.latency.to_dict(),
+            'phases': dict((phase, histogram.to_dict())
+                           for phase, histogram in self.phases.items()),
+        }
+
+
+class MetricsAggregator(Instrumentation):
+    """Aggregate the samples per endpoint in the process, thread-safe."""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        """Initialize instance.
+
+        Args:
+            buckets (tuple of float, optional): The upper bounds in seconds
+                of the latency histograms.
+
+        """
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self._endpoints = {}
+
+    def record(self, sample):
+        with self._lock:
+            metrics = self._endpoints.get(sample.endpoint)
+            if metrics is None:
+                metrics = self._endpoints[sample.endpoint] = EndpointMetrics(
+                    self.buckets)
+            metrics.add(sample)
+
+    def snapshot(self):
+        """Get the measures of each endpoint.
+
+        Returns:
+            dict: The measures keyed by endpoint.
+                e.g.:
+                    {
+                        "/api/render/common/queryPlatforms": {
+                            "calls": 3,
+                            "attempts": 4,
+                            "retries": 1,
+                            "errors": 0,
+                            "codes": {200: 3},
+                            "request_bytes": 6,
+                            "response_bytes": 1200,
+                            "latency": {"buckets": [...], "sum": 0.12,
+                                        "count": 3},
+                            "phases": {"network": {...}, ...}
+                        }
+                    }
+
+        """
+        with self._lock:
+            return dict((endpoint, metrics.to_dict())
+                        for endpoint, metrics in self._endpoints.items())
+
+    def reset(self):
+        """Forget the aggregated measures."""
+        with self._lock:
+            self._endpoints.clear()
+
+
+def _escape_label(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace(
+        '"', '\\"')
+
+
+def _format_labels(labels):
+    return '{' + ','.join('{}="{}"'.format(key, _escape_label(value))
+                          for key, value in labels) + '}'
+
+
+def _format_bound(bound):
+    return '+Inf' if bound == float('inf') else repr(float(bound))
+
+
+class PrometheusExporter(object):
+    """Render the measures of an aggregator in the Prometheus text format."""
+
+    def __init__(self, aggregator, prefix='rayvision_api'):
+        """Initialize instance.
+
+        Args:
+            aggregator (MetricsAggregator): The aggregated measures.
+            prefix (str, optional): The prefix of the metric names.
+
+        """
+        self.aggregator = aggregator
+        self.prefix = prefix
+
+    def render(self):
+        """str: The metrics in the Prometheus text exposition format."""
+        snapshot = sorted(self.aggregator.snapshot().items())
+        lines = []
+        name = '{}_requests_total'.format(self.prefix)
+        lines.extend(['# HELP {} The calls per endpoint and code.'.format(name),
+                      '# TYPE {} counter'.format(name)])
+        for endpoint, metrics in snapshot:
+            for code, count in sorted(metrics['codes'].items(),
+                                      key=lambda item: str(item[0])):
+                lines.append('{}{} {}'.format(name, _format_labels(
+                    [('endpoint', endpoint), ('code', code)]), count))
+        for suffix, key, help_text in (
+                ('retries_total', 'retries', 'The retried attempts.'),
+                ('request_bytes_total', 'request_bytes',
+                 'The bytes of the request bodies.'),
+                ('response_bytes_total', 'response_bytes',
+                 'The bytes of the response bodies.')):
+            name = '{}_{}'.format(self.prefix, suffix)
+            lines.extend(['# HELP {} {}'.format(name, help_text),
+                          '# TYPE {} counter'.format(name)])
+            for endpoint, metrics in snapshot:
+                lines.append('{}{} {}'.format(name, _format_labels(
+                    [('endpoint', endpoint)]), metrics[key]))
+        name = '{}_request_duration_seconds'.format(self.prefix)
+        lines.extend(['# HELP {} The duration of the calls.'.format(name),
+                      '# TYPE {} histogram'.format(name)])
+        for endpoint, metrics in snapshot:
+            lines.extend(self._histogram(name, [('endpoint', endpoint)],
+                                         metrics['latency']))
+        name = '{}_phase_duration_seconds'.format(self.prefix)
+        lines.extend(['# HELP {} The duration of the request phases.'.format(
+            name), '# TYPE {} histogram'.format(name)])
+        for endpoint, metrics in snapshot:
+            for phase, histogram in sorted(metrics['phases'].items()):
+                if histogram['count']:
+                    lines.extend(self._histogram(
+                        name, [('endpoint', endpoint), ('phase', phase)],
+                        histogram))
+        return '\n'.join(lines) + '\n'
+
+    @staticmethod
+    def _histogram(name, labels, histogram):
+        lines = []
+        for bound, count in histogram['buckets']:
+            lines.append('{}_bucket{} {}'.format(name, _format_labels(
+                labels + [('le', _format_bound(bound))]), count))
+        lines.append('{}_sum{} {}'.format(name, _format_labels(labels),
+                                          repr(float(histogram['sum']))))
+        lines.append('{}_count{} {}'.format(name, _format_labels(labels),
+                                            histogram['count']))
+        return lines
+
+
+class OpenTelemetryInstrumentation(Instrumentation):
+    """Record the samples with the OpenTelemetry metrics API.
+
+    ``opentelemetry-api`` is only required when no meter is given.
+
+    """
+
+    def __init__(self, meter=None, prefix='rayvision_api'):
+        """Initialize instance.
+
+        Args:
+            meter (opentelemetry.metrics.Meter, optional): The meter creating
+                the instruments, the meter of the global meter provider by
+                default.
+            prefix (str, optional): The prefix of the instrument names.
+
+        """
+        if meter is None:
+            from opentelemetry import metrics  # pylint: disable=import-error
+            meter = metrics.get_meter('rayvision_api')
+        self._requests = meter.create_counter(
+            '{}.requests'.format(prefix), unit='1',
+            description='The calls per endpoint and code.')
+        self._retries = meter.create_counter(
+            '{}.retries'.format(prefix), unit='1',
+            description='The retried attempts.')
+        self._duration = meter.create_histogram(
+            '{}.request.duration'.format(prefix), unit='s',
+            description='The duration of the calls.')
+        self._phase_duration = meter.create_histogram(
+            '{}.phase.duration'.format(prefix), unit='s',
+            description='The duration of the request phases.')
+        self._request_size = meter.create_histogram(
+            '{}.request.size'.format(prefix), unit='By',
+            description='The bytes of the request bodies.')
+        self._response_size = meter.create_histogram(
+            '{}.response.size'.format(prefix), unit='By',
+            description='The bytes of the response bodies.')
+
+    def record(self, sample):
+        attributes = {'endpoint': sample.endpoint}
+        self._requests.add(1, dict(attributes, code=str(sample.error_code)))
+        if sample.retries:
+            self._retries.add(sample.retries, attributes)
+        self._duration.record(sample.duration, attributes)
+        for phase, seconds in sample.phases.items():
+            self._phase_duration.record(seconds, dict(attributes,
+                                                      phase=phase))
+        self._request_size.record(sample.request_bytes, attributes)
+        self._response_size.record(sample.response_bytes, attributes)
@@ -1,13 +1,50 @@
 # -*- coding: utf-8 -*-
 """API query operation."""
+import collections
 import sys
+from concurrent.futures import FIRST_COMPLETED
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import wait
 
 from rayvision_api import constants
+from rayvision_api.cache import cached
+from rayvision_api.frame_range import FrameSpec
+
+
+def chunk_unique_ids(task_ids, chunk_size):
+    """Split the task ids into chunks, dropping the duplicates.
+
+    Args:
+        task_ids (iterable of int): The task ids, can be a generator.
+        chunk_size (int): The maximum number of ids of a chunk.
+
+    Yields:
+        list of int: The chunks, in the order of the first occurrences.
+
+    """
+    seen = set()
+    chunk = []
+    for task_id in task_ids:
+        task_id = int(task_id)
+        if task_id in seen:
+            continue
+        seen.add(task_id)
+        chunk.append(task_id)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
 
 
 class QueryOperator(object):
     """API query operation."""
 
+    # The number of task ids requested at once by ``task_info_bulk``.
+    TASK_INFO_CHUNK_SIZE = 100
+    # The number of codes requested at once by ``error_detail_by_code``.
+    ERROR_DETAIL_CHUNK_SIZE = 50
+
     def __init__(self, connect):
         """Initialize instance.
 
@@ -17,6 +54,7 @@ class QueryOperator(object):
         """
         self._connect = connect
 
+    @cached('platforms')
     def platforms(self):
         """Get platforms.
 
@@ -35,6 +73,7 @@ class QueryOperator(object):
         return self._connect.post(self._connect.url.queryPlatforms,
                                   {'zone': zone})
 
+    @cached('error_detail')
     def error_detail(self, code=None, codes=None, language=0):
         r"""Get analysis error code.
 
@@ -83,6 +122,43 @@ class QueryOperator(object):
 
         return self._connect.post(self._connect.url.queryAnalyseErrorDetail, data)
 
+    def error_detail_by_code(self, codes, language=0,
+                             chunk_size=ERROR_DETAIL_CHUNK_SIZE):
+        """Get the analysis error details of many codes in batches.
+
+        Args:
+            codes (iterable of str): The error codes, the duplicates are
+                requested once.
+            language (int, optional): Not required, language,
+                0: Chinese (default) 1: English.
+            chunk_size (int, optional): The number of codes per request.
+
+        Returns:
+            dict: The error details keyed by code, in the order of the given
+                codes, the unknown codes get an empty list.
+                e.g.:
+                    {
+                        "15000": [
+                            {
+                                "id": 5,
+                                "code": "15000",
+                                "type": 1,
+                            }
+                        ]
+                    }
+
+        """
+        codes = [str(code) for code in codes]
+        details = collections.OrderedDict((code, []) for code in codes)
+        unique_codes = list(details)
+        for start in range(0, len(unique_codes), chunk_size):
+            chunk = unique_codes[start:start + chunk_size]
+            for code_info in self.error_detail(codes=chunk,
+                                               language=language) or []:
+                details.setdefault(str(code_info['code']), []).append(
+                    code_info)
+        return details
+
     def get_task_list(self, page_num=1, page_size=100, status_list=None,
                       search_keyword=None,
                       start_time=None, end_time=None, recycle_flag=None):
@@ -319,6 +395,81 @@ class QueryOperator(object):
         }
         return self._connect.post(self._connect.url.queryTaskInfo, data)
 
+    def iter_task_info_bulk(self, task_ids, chunk_size=TASK_INFO_CHUNK_SIZE,
+                            concurrency=4):
+        """Get the task details of many tasks, chunk by chunk.
+
+        The ids are deduplicated and split into chunks requested by a pool of
+        workers, at most ``concurrency`` chunks are in flight so the memory
+        stays bounded for very large sets.
+
+        Args:
+            task_ids (iterable of int): Task ID list, can be a generator.
+            chunk_size (int, optional): The number of ids per request.
+            concurrency (int, optional): The number of concurrent requests.
+
+        Yields:
+            dict: The task details of one chunk keyed by task id, in the
+                order the chunks complete.
+
+        """
+        chunks = chunk_unique_ids(task_ids, int(chunk_size))
+        concurrency = max(int(concurrency), 1)
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            pending = set()
+            try:
+                for chunk in chunks:
+                    pending.add(executor.submit(self.task_info, chunk))
+                    if len(pending) < concurrency:
+                        continue
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield self._index_task_info(future.result())
+                while pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield self._index_task_info(future.result())
+            finally:
+                for future in pending:
+                    future.cancel()
+
+    def task_info_bulk(self, task_ids, chunk_size=TASK_INFO_CHUNK_SIZE, concurrency=4):
+        """Get the task details of many tasks.
+
+        Args:
+            task_ids (iterable of int): Task ID list, the duplicates are
+                requested once.
+            chunk_size (int, optional): The number of ids per request.
+            concurrency (int, optional): The number of concurrent requests.
+
+        Returns:
+            dict: The task details keyed by task id, in the order of the
+                given ids, the unknown ids are left out.
+                e.g.:
+                    {
+                        19084: {
+                            "id": 19084,
+                            "taskAlias": "P19084",
+                            "taskStatus": 0,
+                        }
+                    }
+
+        """
+        task_ids = list(task_ids)
+        merged = {}
+        for task_infos in self.iter_task_info_bulk(task_ids, chunk_size=chunk_size,
+                                                   concurrency=concurrency):
+            merged.update(task_infos)
+        return dict((task_id, merged[task_id])
+                    for task_id in (int(task_id) for task_id in task_ids)
+                    if task_id in merged)
+
+    @staticmethod
+    def _index_task_info(task_info):
+        """dict: Key the items of a ``task_info`` response by task id."""
+        return dict((item['id'], item) for item in task_info.get('items') or [])
+
+    @cached('supported_software')
     def supported_software(self):
         """Get supported rendering software.
 
@@ -345,6 +496,7 @@ class QueryOperator(object):
         return self._connect.post(self._connect.url.querySoftwareList,
                                   validator=False)
 
+    @cached('supported_plugin')
     def supported_plugin(self, name, os_name="default"):
         """Get supported rendering software plugins.
 
@@ -506,40 +658,155 @@ class QueryOperator(object):
         return self._connect.post(self._connect.url.loadingFrameThumbnail,
                                   data)
 
-    def get_all_frames(self, task_id, start_page=1, end_page=2000, page_size=100):
+    def get_all_frames(self, task_id, start_page=1, end_page=2000, page_size=100,
+                       concurrency=None):
         """Gets all frame details for the specified task.
 
         Args:
             task_id (int) : small task id
             start_page (int) : The start page that you want to query.
             end_page (int) : The end page that you want to query.
+            page_size (int) : Displayed data size per page.
+            concurrency (int, optional) : The number of pages fetched at the
+                same time. The pages are fetched one by one by default,
+                otherwise the first page is fetched to read the page count
+                and the remaining pages are fetched by a pool of workers.
 
         Returns (dict): all frames detail info.
 
         """
         frames_detail = dict()
-        for num in range(int(start_page), int(end_page)+1):
-            task_frame = self.task_frames(task_id=int(task_id), page_num=num, page_size=page_size)
-            if task_frame['items']:
-                for per in task_frame['items']:
-                    frame_index = per["frameIndex"]
-                    frames_detail[frame_index] = per
-            else:
-                break
+        if concurrency and int(concurrency) > 1:
+            task_frame = self.task_frames(task_id=int(task_id), page_num=int(start_page), page_size=page_size)
+            self._merge_frames(frames_detail, task_frame)
+            pages = self._remaining_pages(task_frame, start_page, end_page, page_size)
+            if pages is None:
+                # The page count is unknown, read until the first empty page.
+                for per in self.iter_task_frames(task_id, start_page=int(start_page) + 1,
+                                                 end_page=end_page, page_size=page_size,
+                                                 prefetch=False):
+                    frames_detail[per["frameIndex"]] = per
+                return frames_detail
+            if not pages:
+                return frames_detail
+            with ThreadPoolExecutor(max_workers=min(int(concurrency), len(pages))) as executor:
+                # ``map`` yields in the order of the pages.
+                for task_frame in executor.map(
+                        lambda num: self.task_frames(task_id=int(task_id), page_num=num, page_size=page_size),
+                        pages):
+                    self._merge_frames(frames_detail, task_frame)
+            return frames_detail
+
+        for per in self.iter_task_frames(task_id, start_page=start_page, end_page=end_page,
+                                         page_size=page_size, prefetch=False):
+            frames_detail[per["frameIndex"]] = per
         return frames_detail
 
+    def iter_task_frames(self, task_id, start_page=1, end_page=2000, page_size=100,
+                         prefetch=True):
+        """Iterate over the frame details of the specified task page by page.
+
+        Only one page is held in memory, the iteration stops on the last
+        page reported by ``pageCount`` or on the first empty page.
+
+        Args:
+            task_id (int) : small task id
+            start_page (int) : The start page that you want to query.
+            end_page (int) : The end page that you want to query.
+            page_size (int) : Displayed data size per page.
+            prefetch (bool) : Request the next page in the background while
+                the current one is consumed.
+
+        Yields:
+            dict: The detail of one frame, see ``task_frames``.
+
+        """
+        task_id, start_page, end_page = int(task_id), int(start_page), int(end_page)
+        if start_page > end_page:
+            return
+        executor = ThreadPoolExecutor(max_workers=1) if prefetch else None
+
+        def _fetch(num):
+            if executor:
+                return executor.submit(self.task_frames, task_id=task_id, page_num=num,
+                                       page_size=page_size)
+            return self.task_frames(task_id=task_id, page_num=num, page_size=page_size)
+
+        pending = None
+        try:
+            pending = _fetch(start_page)
+            for num in range(start_page, end_page + 1):
+                task_frame = pending.result() if executor else pending
+                if not task_frame['items']:
+                    break
+                page_count = task_frame.get('pageCount')
+                is_last = num >= end_page or (page_count and num >= int(page_count))
+                if not is_last:
+                    pending = _fetch(num + 1)
+                for per in task_frame['items']:
+                    yield per
+                if is_last:
+                    break
+        finally:
+            if executor:
+                # Do not wait for a prefetched page nobody will read.
+                if pending is not None:
+                    pending.cancel()
+                executor.shutdown(wait=False)
+
+    def _select_frame_ids(self, task_id, frame_numbers):
+        """Get the ids of the frames matching the frame range expressions.
+
+        The frames are streamed and the iteration stops as soon as all the
+        requested frames have been found.
+
+        Args:
+            task_id (int) : small task id
+            frame_numbers (list) : The frame range expressions.
+                Examples:
+                     ["2-4[1]", "10"]
+
+        Returns:
+            list: Frame ID list.
+
+        """
+        spec = FrameSpec(frame_numbers)
+        if not spec:
+            return []
+        return [per["id"] for per in spec.select(self.iter_task_frames(task_id))]
+
+    @staticmethod
+    def _merge_frames(frames_detail, task_frame):
+        """Merge the frames of one page into the ``frameIndex -> frame`` dict."""
+        for per in task_frame['items'] or []:
+            frames_detail[per["frameIndex"]] = per
+
+    @staticmethod
+    def _remaining_pages(task_frame, start_page, end_page, page_size):
+        """list: The page numbers left after the first page, None if the
+        response reports neither the page count nor the total."""
+        if not task_frame['items']:
+            return []
+        page_count = task_frame.get('pageCount')
+        if not page_count:
+            total = task_frame.get('total')
+            if not total:
+                return None
+            page_count = (int(total) + page_size - 1) // page_size
+        return list(range(int(start_page) + 1, min(int(end_page), int(page_count)) + 1))
+
     def get_custome_frames(self, task_id, restartframes):
         """Retrieves the frame of the specified task according to the frame。
 
         Args:
             task_id (int) : small task id
-            restartframes (list) : The frame number needs to be redrawn.
+            restartframes (list) : The frame number needs to be redrawn,
+                frames, ranges and stepped ranges are supported.
                 Examples:
                      ["2-4[1]", "10"]
 
         """
-        all_frames = self.get_all_frames(task_id)
-        ids = [per["id"] for index, per in all_frames.items() if str(index) in restartframes]
+        ids = self._select_frame_ids(task_id, restartframes)
         restart_frame = self.restart_frame(ids_list=ids, select_all=0, task_id=task_id)
         return restart_frame
 
@@ -606,8 +873,7 @@ class QueryOperator(object):
                              ["2-4[1]", "10"]
 
                 """
-        all_frames = self.get_all_frames(task_id)
-        ids = [per["id"] for index, per in all_frames.items() if str(index) in stop_frame]
+        ids = self._select_frame_ids(task_id, stop_frame)
         stop = self.stop_frame(ids_list=ids, select_all=0, task_id=task_id)
         return stop
     
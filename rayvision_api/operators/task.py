@@ -1,6 +1,9 @@
 """Interface to operate on the task."""
 
+import threading
+
 from rayvision_api.exception import RayvisionError
+from rayvision_api.task_id_pool import TaskIdPool
 
 
 class TaskOperator(object):
@@ -16,8 +19,26 @@ class TaskOperator(object):
 
         """
         self._connect = connect
-        self._has_submit = False
-        self._task_id = None
+        # The task ID reused until submitted is kept per thread, so that
+        # the threads sharing the operator never submit the same task.
+        self._local = threading.local()
+        self.task_id_pool = None
+
+    @property
+    def _task_id(self):
+        return getattr(self._local, 'task_id', None)
+
+    @_task_id.setter
+    def _task_id(self, task_id):
+        self._local.task_id = task_id
+
+    @property
+    def _has_submit(self):
+        return getattr(self._local, 'has_submit', False)
+
+    @_has_submit.setter
+    def _has_submit(self, has_submit):
+        self._local.has_submit = has_submit
 
     def create_task(self,
                     count=1,
@@ -77,6 +98,8 @@ class TaskOperator(object):
             int: The ID number of the task.
 
         """
+        if self.task_id_pool is not None:
+            return self.task_id_pool.get()
         if not self._has_submit and self._task_id:
             return self._task_id
         task_id_info = self.create_task(count=1, out_user_id=None)
@@ -87,6 +110,84 @@ class TaskOperator(object):
         self._has_submit = False
         return self._task_id
 
+    def enable_id_pool(self, batch_size=20, low_water=5, background=True,
+                       **kwargs):
+        """Hand out the task IDs from a pool created in batches.
+
+        Each call of ``_generate_task_id`` then takes a new task ID from the
+        pool, without a request while the pool is refilled in time.
+
+        Args:
+            batch_size (int, optional): The quantity of task ID created by a
+                refill.
+            low_water (int, optional): Refill when less task IDs are left.
+            background (bool, optional): Refill in a background thread.
+            kwargs (dict): The other arguments of ``create_task``.
+
+        Returns:
+            rayvision_api.task_id_pool.TaskIdPool: The pool.
+
+        """
+        self.close_id_pool()
+        self.task_id_pool = TaskIdPool(self, batch_size=batch_size,
+                                       low_water=low_water,
+                                       background=background, **kwargs)
+        return self.task_id_pool
+
+    def close_id_pool(self):
+        """Stop the task id pool.
+
+        Returns:
+            list of int: The task IDs created but never used.
+
+        """
+        pool, self.task_id_pool = self.task_id_pool, None
+        return pool.close() if pool is not None else []
+
+    def take_task_ids(self, count, block_size=100):
+        """Get several new task IDs, from the pool if it is enabled.
+
+        Args:
+            count (int): The quantity of task ID.
+            block_size (int, optional): The quantity of task ID created by
+                one request without pool.
+
+        Returns:
+            list of int: The task IDs.
+
+        """
+        if not count:
+            return []
+        if self.task_id_pool is not None:
+            return self.task_id_pool.get_many(count)
+        return self.reserve_task_ids(count, block_size=block_size)
+
+    def reserve_task_ids(self, count, block_size=100, **kwargs):
+        """Create many task IDs with a few requests.
+
+        Args:
+            count (int): The quantity of task ID.
+            block_size (int, optional): The quantity of task ID created by
+                one request.
+            kwargs (dict): The other arguments of ``create_task``.
+
+        Returns:
+            list of int: The task IDs.
+
+        Raises:
+            RayvisionError: The server created less task IDs than requested.
+
+        """
+        task_ids = []
+        while len(task_ids) < count:
+            block = min(block_size, count - len(task_ids))
+            task_id_list = self.create_task(count=block, **kwargs).get(
+                "taskIdList") or []
+            if not task_id_list:
+                raise RayvisionError(1000000, 'Failed to create task number!')
+            task_ids.extend(task_id_list)
+        return task_ids[:count]
+
     @property
     def task_id(self):
         """int: The ID number of the render task.
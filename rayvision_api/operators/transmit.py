@@ -1,5 +1,7 @@
 #!/usr/bin/env python
 # -*- encoding: utf-8 -*-
+from rayvision_api.cache import cached
+
 
 class TransmitOperator(object):
     """The interface to perform the transfer."""
@@ -25,6 +27,7 @@ class TransmitOperator(object):
 
         return self._connect.post(self._connect.url.taskJsonFile, data=data)
 
+    @cached('get_transfer_config')
     def get_transfer_config(self):
         """upload task json file.upload_json_format
 
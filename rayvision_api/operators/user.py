@@ -1,6 +1,10 @@
 """Interface to operate the user."""
 
 import platform
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from rayvision_api.cache import cached
 from rayvision_api.signature import hump2underline
 
 
@@ -18,12 +22,37 @@ class UserOperator(object):
         self._info = {'local_os': platform.system().lower(),
                       'domain': connect.domain,
                       'platform': connect.platform}
+        self._loader = None
+        self._loader_lock = threading.Lock()
+        self._info_lock = threading.Lock()
+        self._hardware_catalog = None
 
 
     @property
     def info(self):
+        """dict: The user information, loaded on the first access if lazy."""
+        if self._loader is not None:
+            self._load()
         return self._info
 
+    def set_loader(self, loader):
+        """Defer the loading of the user information.
+
+        Args:
+            loader (callable): Called without arguments on the first access
+                of ``info``, it fills the user information.
+
+        """
+        self._loader = loader
+
+    def _load(self):
+        with self._loader_lock:
+            loader = self._loader
+            if loader is None:
+                return
+            loader()
+            self._loader = None
+
     @property
     def user_id(self):
         return self.query_user_profile()["userId"]
@@ -115,15 +144,23 @@ class UserOperator(object):
         """Supplement user's configuration information.
 
         Call the API interface (query_user_profile, query_user_setting,
-        get_transfer_bid) to supplement the user's configuration information
+        get_transfer_bid) concurrently to supplement the user's configuration
+        information.
+
+        Returns:
+            dict: The merged user profile, user setting and transfer bid.
 
         """
-        user_profile = self.query_user_profile()
-        user_setting = self.query_user_setting()
-        transfer_bid = self.get_transfer_bid()
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            futures = [executor.submit(self.query_user_profile),
+                       executor.submit(self.query_user_setting),
+                       executor.submit(self.get_transfer_bid)]
+            user_profile, user_setting, transfer_bid = [
+                future.result() for future in futures]
         user_profile.update(user_setting)
         user_profile.update(transfer_bid)
         self._update_user_info(user_profile)
+        return user_profile
 
     def _update_user_info(self, user_profile):
         """Update user's configuration information.
@@ -166,12 +203,18 @@ class UserOperator(object):
                     }
 
         """
-        for key, value in user_profile.items():
-            key_underline = hump2underline(key)
-            if key_underline != "platform":
-                self._info[key_underline] = value
-
-
+        with self._info_lock:
+            # Replaced at once, so the threads reading it never see a
+            # partial update.
+            info = dict(self._info)
+            for key, value in user_profile.items():
+                key_underline = hump2underline(key)
+                if key_underline != "platform":
+                    info[key_underline] = value
+            self._info = info
+
+
+    @cached('get_hardware_config')
     def get_hardware_config(self, task_ids=None):
         """Get platform hardware configuration information.
 
@@ -185,3 +228,26 @@ class UserOperator(object):
         if task_ids:
             data.update({"taskIds": task_ids})
         return self._connect.post(self._connect.url.hardwareConfig, data=data, validator=False)
+
+    def get_hardware_catalog(self, task_ids=None):
+        """Get the hardware configurations indexed for the lookups.
+
+        The catalog is only rebuilt when the fetched configurations change,
+        so it is shared by the submissions.
+
+        Args:
+            task_ids (list[str]): Specify hardware configuration information for a task.
+
+        Returns:
+            rayvision_api.task.hardware.HardwareCatalog: The catalog.
+
+        """
+        return self._update_hardware_catalog(self.get_hardware_config(task_ids))
+
+    def _update_hardware_catalog(self, hardware_config_list):
+        from rayvision_api.task.hardware import HardwareCatalog
+        catalog = self._hardware_catalog
+        if catalog is None or catalog.hardware_config_list != hardware_config_list:
+            catalog = HardwareCatalog(hardware_config_list)
+            self._hardware_catalog = catalog
+        return catalog
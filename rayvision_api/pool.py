@@ -0,0 +1,151 @@
+"""Connection pool sizing and keep-alive of the requests session."""
+
+# Import built-in modules
+import socket
+
+# Import third-party modules
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+
+# The default values of ``requests.adapters.HTTPAdapter``.
+DEFAULT_POOL_CONNECTIONS = 10
+DEFAULT_POOL_MAXSIZE = 10
+
+
+def keepalive_socket_options(idle=60, interval=10, count=6):
+    """Get the socket options enabling TCP keep-alive.
+
+    The idle, interval and count options are only set on the platforms
+    supporting them.
+
+    Args:
+        idle (int): Seconds of inactivity before the first probe.
+        interval (int): Seconds between two probes.
+        count (int): Number of failed probes before the connection is dropped.
+
+    Returns:
+        list: The ``(level, option, value)`` socket options.
+
+    """
+    options = list(HTTPConnection.default_socket_options)
+    options.append((socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1))
+    for name, value in (('TCP_KEEPIDLE', idle),
+                        ('TCP_KEEPINTVL', interval),
+                        ('TCP_KEEPCNT', count)):
+        if hasattr(socket, name):
+            options.append((socket.IPPROTO_TCP, getattr(socket, name), value))
+    return options
+
+
+class PoolingHTTPAdapter(HTTPAdapter):
+    """The ``HTTPAdapter`` with configurable socket options.
+
+    The connections are kept alive in the pool of each host and reused by
+    the later requests, so the TCP and TLS handshakes are only paid once per
+    pooled connection.
+
+    """
+
+    __attrs__ = HTTPAdapter.__attrs__ + ['_socket_options']
+
+    def __init__(self, pool_connections=DEFAULT_POOL_CONNECTIONS,
+                 pool_maxsize=DEFAULT_POOL_MAXSIZE, pool_block=False,
+                 socket_options=None):
+        """Initialize instance.
+
+        Args:
+            pool_connections (int): The number of host pools to cache.
+            pool_maxsize (int): The maximum number of connections kept in
+                the pool of each host.
+            pool_block (bool): Wait for a free connection when the pool of
+                the host is exhausted, instead of opening a connection that
+                is discarded after the request.
+            socket_options (list, optional): The socket options of the new
+                connections, see ``keepalive_socket_options``.
+
+        """
+        self._socket_options = socket_options
+        super(PoolingHTTPAdapter, self).__init__(
+            pool_connections=pool_connections, pool_maxsize=pool_maxsize,
+            pool_block=pool_block)
+
+    def init_poolmanager(self, *args, **kwargs):
+        if self._socket_options is not None:
+            kwargs['socket_options'] = self._socket_options
+        super(PoolingHTTPAdapter, self).init_poolmanager(*args, **kwargs)
+
+
+def empty_pool_stats():
+    """dict: The statistics of a session without any pool."""
+    return {
+        'pools': 0,
+        'requests': 0,
+        'new_connections': 0,
+        'reused_connections': 0,
+        'idle_connections': 0,
+        'maxsize': 0,
+    }
+
+
+def add_pool_stats(total, stats):
+    """Sum the statistics of two sessions.
+
+    Args:
+        total (dict): The statistics summed so far.
+        stats (dict): The statistics of a session, see ``pool_stats``.
+
+    Returns:
+        dict: The sum, with the largest ``maxsize``.
+
+    """
+    total = dict(total)
+    for key, value in stats.items():
+        if key == 'maxsize':
+            total[key] = max(total[key], value)
+        else:
+            total[key] += value
+    return total
+
+
+def pool_stats(session):
+    """Get the connection statistics of all the pools of the session.
+
+    Args:
+        session (requests.Session): The session of the requests.
+
+    Returns:
+        dict: The statistics.
+            e.g.:
+                {
+                    "pools": 1,
+                    "requests": 120,
+                    "new_connections": 8,
+                    "reused_connections": 112,
+                    "idle_connections": 8,
+                    "maxsize": 10
+                }
+
+    """
+    stats = empty_pool_stats()
+    seen = set()
+    for adapter in session.adapters.values():
+        poolmanager = getattr(adapter, 'poolmanager', None)
+        if poolmanager is None or id(poolmanager) in seen:
+            continue
+        seen.add(id(poolmanager))
+        for key in list(poolmanager.pools.keys()):
+            pool = poolmanager.pools.get(key)
+            if pool is None:
+                continue
+            stats['pools'] += 1
+            stats['requests'] += pool.num_requests
+            stats['new_connections'] += pool.num_connections
+            if pool.pool is None:
+                continue
+            # The free slots of the queue are filled with ``None``.
+            stats['idle_connections'] += len([conn for conn in list(pool.pool.queue)
+                                              if conn])
+            stats['maxsize'] = max(stats['maxsize'], pool.pool.maxsize)
+    stats['reused_connections'] = max(
+        stats['requests'] - stats['new_connections'], 0)
+    return stats
@@ -0,0 +1,475 @@
+"""Cache the responses of the read-only endpoints in the connect.
+
+A connect created with a ``response_cache`` answers the calls of the
+endpoints having a ``CachePolicy`` from the cache until the entry expires.
+The key of an entry is the canonical request string the signature is
+computed from, without the timestamp and the nonce, so each account, domain
+and request body gets its own entry. A successful or failed call of a
+mutating endpoint removes the entries of the reads it makes stale, e.g.
+``editUserPluginConfig`` removes the ``getUserPluginConfig`` entries.
+
+The entries are kept in the memory of the process by default, a
+``SQLiteBackend`` shares them between the processes of the host. The
+reference data, e.g. the supported software, is cached by the
+``rayvision_api.cache.ReferenceCache`` and has no default policy here.
+
+The API has no conditional requests, an expired entry is requested again,
+but it can still be returned for ``stale_if_error`` seconds when the new
+request fails with a transient error.
+
+Example::
+
+    >>> cache = ResponseCache(backend=SQLiteBackend())
+    >>> api = RayvisionAPI(access_id="xxx", access_key="xxx",
+    ...                    response_cache=cache)
+    >>> api.query.get_transfer_server_msg()  # Requested.
+    >>> api.query.get_transfer_server_msg()  # Cached, also for the other
+    ...                                      # processes.
+    >>> cache.invalidate(ApiUrl.getServerInfo)
+
+"""
+
+# Import built-in modules
+import abc
+import collections
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+# Import third-party modules
+from future.utils import with_metaclass
+
+# Import local modules
+from rayvision_api.paths import ensure_paths
+from rayvision_api.signature import generate_headers_body_str
+from rayvision_api.url import ApiUrl
+
+# The default database of the SQLite backend.
+DEFAULT_CACHE_PATH = os.path.join(os.path.expanduser('~'), '.rayvision',
+                                  'responses.sqlite3')
+
+
+class CachePolicy(object):
+    """How the responses of an endpoint are cached."""
+
+    def __init__(self, ttl=300, maxsize=256, stale_if_error=0):
+        """Initialize instance.
+
+        Args:
+            ttl (float, optional): Seconds a response is fresh.
+            maxsize (int, optional): The maximum number of entries of the
+                endpoint.
+            stale_if_error (float, optional): Seconds an expired response is
+                still returned when the request fails with a transient
+                error.
+
+        """
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.stale_if_error = stale_if_error
+
+    def __repr__(self):
+        return 'CachePolicy(ttl={!r}, maxsize={!r}, stale_if_error={!r})'.format(
+            self.ttl, self.maxsize, self.stale_if_error)
+
+
+# The policies of the reads polled by many clients, the reference data,
+# e.g. the platforms, is cached by ``rayvision_api.cache.ReferenceCache``
+# only, so that an invalidation is never missed by the other layer.
+DEFAULT_POLICIES = {
+    ApiUrl.getServerInfo.value: CachePolicy(ttl=600, maxsize=16),
+    ApiUrl.getUserPluginConfig.value: CachePolicy(ttl=300, maxsize=64),
+}
+
+_PLUGIN_CONFIG_READS = (ApiUrl.getUserPluginConfig.value,)
+_PROJECT_READS = (ApiUrl.getList.value, ApiUrl.list.value)
+_TASK_READS = (ApiUrl.getTaskList.value, ApiUrl.queryTaskInfo.value,
+               ApiUrl.queryTaskFrames.value, ApiUrl.queryAllFrameStats.value)
+
+# The reads made stale by each mutating endpoint.
+DEFAULT_INVALIDATIONS = {
+    ApiUrl.addUserPluginConfig.value: _PLUGIN_CONFIG_READS,
+    ApiUrl.editUserPluginConfig.value: _PLUGIN_CONFIG_READS,
+    ApiUrl.deleteUserPluginConfig.value: _PLUGIN_CONFIG_READS,
+    ApiUrl.setDefaultUserPluginConfig.value: _PLUGIN_CONFIG_READS,
+    ApiUrl.updateUserSetting.value: (ApiUrl.queryUserSetting.value,
+                                     ApiUrl.queryUserProfile.value),
+    ApiUrl.add.value: _PROJECT_READS,
+    ApiUrl.delete.value: _PROJECT_READS,
+    ApiUrl.createTask.value: _TASK_READS,
+    ApiUrl.task.value: _TASK_READS,
+    ApiUrl.stopTask.value: _TASK_READS,
+    ApiUrl.startTask.value: _TASK_READS,
+    ApiUrl.abandonTask.value: _TASK_READS,
+    ApiUrl.deleteTask.value: _TASK_READS,
+    ApiUrl.recommitTasks.value: _TASK_READS,
+    ApiUrl.recommitTaskFrames.value: _TASK_READS,
+    ApiUrl.stopTaskFrames.value: _TASK_READS,
+    ApiUrl.updateTaskUserLevel.value: _TASK_READS,
+    ApiUrl.setTaskOverTimeStop.value: _TASK_READS,
+    ApiUrl.fullSpeedRendering.value: _TASK_READS,
+    ApiUrl.addTaskLabel.value: _TASK_READS,
+    ApiUrl.deleteTaskLabel.value: _TASK_READS,
+}
+
+
+def _path(api_url):
+    """str: The path of an api url, ``ApiUrl`` members included."""
+    return getattr(api_url, 'value', api_url)
+
+
+class CacheBackend(with_metaclass(abc.ABCMeta, object)):
+    """The storage of the cached responses."""
+
+    @abc.abstractmethod
+    def get(self, endpoint, key, now):
+        """Get an entry.
+
+        Args:
+            endpoint (str): The path of the endpoint.
+            key (str): The key of the entry.
+            now (float): The current timestamp.
+
+        Returns:
+            tuple: The expiry timestamp and the serialized response, None if
+                the entry is missing or can not be returned anymore.
+
+        """
+
+    @abc.abstractmethod
+    def set(self, endpoint, key, value, expires, stale_until, maxsize):
+        """Add or replace an entry, evicting the entries above ``maxsize``.
+
+        Args:
+            endpoint (str): The path of the endpoint.
+            key (str): The key of the entry.
+            value (str): The serialized response.
+            expires (float): The timestamp the entry expires at.
+            stale_until (float): The timestamp the entry is removed at.
+            maxsize (int): The maximum number of entries of the endpoint.
+
+        """
+
+    @abc.abstractmethod
+    def delete(self, endpoints=None):
+        """Remove the entries of the endpoints, all the entries by default."""
+
+    @abc.abstractmethod
+    def __len__(self):
+        """int: The number of entries."""
+
+
+class MemoryBackend(CacheBackend):
+    """The entries of the process, the least recently used evicted first."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # endpoint -> key -> (expires, stale_until, value), ordered from the
+        # least to the most recently used.
+        self._endpoints = {}
+
+    def get(self, endpoint, key, now):
+        with self._lock:
+            entries = self._endpoints.get(endpoint)
+            entry = entries.get(key) if entries else None
+            if entry is None:
+                return None
+            if entry[1] <= now:
+                del entries[key]
+                return None
+            entries[key] = entries.pop(key)
+            return entry[0], entry[2]
+
+    def set(self, endpoint, key, value, expires, stale_until, maxsize):
+        with self._lock:
+            entries = self._endpoints.setdefault(endpoint,
+                                                 collections.OrderedDict())
+            entries.pop(key, None)
+            entries[key] = (expires, stale_until, value)
+            while len(entries) > maxsize:
+                entries.popitem(last=False)
+
+    def delete(self, endpoints=None):
+        with self._lock:
+            if endpoints is None:
+                self._endpoints.clear()
+            for endpoint in endpoints or ():
+                self._endpoints.pop(endpoint, None)
+
+    def __len__(self):
+        with self._lock:
+            return sum(len(entries) for entries in self._endpoints.values())
+
+
+class SQLiteBackend(CacheBackend):
+    """The entries shared by the processes of the host in a SQLite database.
+
+    Each thread uses its own connection, the database is only readable by
+    the current user. The entries expiring first are evicted first, so that
+    the reads do not write to the database.
+
+    """
+
+    def __init__(self, path=None, timeout=30):
+        """Initialize instance.
+
+        Args:
+            path (str, optional): The database file, created if missing.
+            timeout (float, optional): Seconds waited for the lock of
+                another process.
+
+        """
+        self.path = os.path.abspath(os.path.expanduser(
+            path or DEFAULT_CACHE_PATH))
+        self.timeout = timeout
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections = []
+        ensure_paths(os.path.dirname(self.path))
+        if not os.path.exists(self.path):
+            os.close(os.open(self.path, os.O_CREAT | os.O_WRONLY, 0o600))
+        self._connection().execute(
+            'CREATE TABLE IF NOT EXISTS responses ('
+            'key TEXT PRIMARY KEY, endpoint TEXT NOT NULL, '
+            'expires REAL NOT NULL, stale_until REAL NOT NULL, '
+            'value TEXT NOT NULL)')
+        self._connection().execute(
+            'CREATE INDEX IF NOT EXISTS responses_endpoint '
+            'ON responses (endpoint, expires)')
+
+    def _connection(self):
+        """sqlite3.Connection: The connection of the current thread."""
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=self.timeout,
+                                         isolation_level=None,
+                                         check_same_thread=False)
+            connection.execute('PRAGMA journal_mode=WAL')
+            self._local.connection = connection
+            with self._lock:
+                self._connections.append(connection)
+        return connection
+
+    def get(self, endpoint, key, now):
+        connection = self._connection()
+        row = connection.execute(
+            'SELECT expires, stale_until, value FROM responses '
+            'WHERE key = ?', (key,)).fetchone()
+        if row is None:
+            return None
+        if row[1] <= now:
+            connection.execute('DELETE FROM responses WHERE key = ? AND '
+                               'stale_until <= ?', (key, now))
+            return None
+        return row[0], row[2]
+
+    def set(self, endpoint, key, value, expires, stale_until, maxsize):
+        connection = self._connection()
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            connection.execute(
+                'INSERT OR REPLACE INTO responses '
+                '(key, endpoint, expires, stale_until, value) '
+                'VALUES (?, ?, ?, ?, ?)',
+                (key, endpoint, expires, stale_until, value))
+            connection.execute(
+                'DELETE FROM responses WHERE endpoint = ? AND key NOT IN '
+                '(SELECT key FROM responses WHERE endpoint = ? '
+                'ORDER BY expires DESC LIMIT ?)',
+                (endpoint, endpoint, maxsize))
+        except Exception:
+            connection.execute('ROLLBACK')
+            raise
+        connection.execute('COMMIT')
+
+    def delete(self, endpoints=None):
+        connection = self._connection()
+        if endpoints is None:
+            connection.execute('DELETE FROM responses')
+            return
+        endpoints = list(endpoints)
+        if endpoints:
+            connection.execute(
+                'DELETE FROM responses WHERE endpoint IN ({})'.format(
+                    ','.join('?' * len(endpoints))), endpoints)
+
+    def __len__(self):
+        return self._connection().execute(
+            'SELECT COUNT(*) FROM responses').fetchone()[0]
+
+    def close(self):
+        """Close the connections of all the threads."""
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for connection in connections:
+            connection.close()
+        self._local = threading.local()
+
+
+class ResponseCache(object):
+    """Answer the calls of the cached endpoints, thread-safe."""
+
+    def __init__(self, policies=None, backend=None, invalidations=None,
+                 clock=time.time):
+        """Initialize instance.
+
+        Args:
+            policies (dict, optional): The ``CachePolicy`` of each cached
+                endpoint keyed by api url, ``DEFAULT_POLICIES`` by default.
+            backend (CacheBackend, optional): The storage of the entries, a
+                ``MemoryBackend`` by default.
+            invalidations (dict, optional): The api urls of the reads made
+                stale by each mutating api url, ``DEFAULT_INVALIDATIONS`` by
+                default.
+            clock (callable, optional): Get the current timestamp, shared by
+                the processes using the same backend.
+
+        """
+        if policies is None:
+            policies = DEFAULT_POLICIES
+        if invalidations is None:
+            invalidations = DEFAULT_INVALIDATIONS
+        self.policies = dict((_path(api_url), policy)
+                             for api_url, policy in policies.items())
+        self.invalidations = dict(
+            (_path(api_url), tuple(_path(read) for read in reads))
+            for api_url, reads in invalidations.items())
+        self.backend = backend if backend is not None else MemoryBackend()
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'stale': 0,
+                       'invalidations': 0}
+
+    @property
+    def stats(self):
+        """dict: The hits, misses, stale responses returned on errors,
+        invalidations and the number of entries."""
+        with self._lock:
+            stats = dict(self._stats)
+        stats['size'] = len(self.backend)
+        return stats
+
+    def _count(self, name):
+        with self._lock:
+            self._stats[name] += 1
+
+    @staticmethod
+    def make_key(domain, headers, api_url, data):
+        """Get the key of a request.
+
+        Args:
+            domain (str): The domain of the API.
+            headers (dict): The base headers of the connect, the account
+                and platform included.
+            api_url (str): The api url.
+            data (dict): The request data.
+
+        Returns:
+            str: The digest of the canonical request string.
+
+        """
+        message = generate_headers_body_str(domain, _path(api_url), headers,
+                                            data or {})
+        return hashlib.sha256(message.encode('utf-8')).hexdigest()
+
+    def invalidate(self, api_url=None):
+        """Remove the cached responses.
+
+        Args:
+            api_url (str, optional): Only remove the responses of the api
+                url, all the responses are removed by default.
+
+        """
+        self.backend.delete(None if api_url is None else [_path(api_url)])
+
+    def invalidate_after(self, api_url):
+        """Remove the responses made stale by a call of the api url."""
+        reads = self.invalidations.get(_path(api_url))
+        if reads:
+            self.backend.delete(reads)
+            self._count('invalidations')
+
+    def lookup(self, connect, api_url, data):
+        """Find the response of a request.
+
+        Args:
+            connect (rayvision_api.connect.Connect): The connect sending the
+                request.
+            api_url (str): The api url.
+            data (dict): The request data.
+
+        Returns:
+            tuple: The policy of the endpoint, None if it is not cached, the
+                key of the request, and the cached response with whether it
+                is fresh, None if it is missing.
+
+        """
+        endpoint = _path(api_url)
+        policy = self.policies.get(endpoint)
+        if policy is None:
+            return None, None, None
+        key = self.make_key(connect.domain, connect.headers, endpoint, data)
+        entry = self.backend.get(endpoint, key, self._clock())
+        if entry is None:
+            self._count('misses')
+            return policy, key, None
+        expires, value = entry
+        fresh = expires > self._clock()
+        self._count('hits' if fresh else 'misses')
+        return policy, key, (json.loads(value), fresh)
+
+    def store(self, api_url, policy, key, value):
+        """Cache the response of a request."""
+        now = self._clock()
+        expires = now + policy.ttl
+        self.backend.set(_path(api_url), key, json.dumps(value), expires,
+                         expires + policy.stale_if_error, policy.maxsize)
+
+    def stale(self, connect, entry, error):
+        """Get the expired response to return instead of the error.
+
+        Returns:
+            tuple: Whether the expired response is returned and the
+                response.
+
+        """
+        if entry is None or not connect.retry_policy.is_retryable(error):
+            return False, None
+        self._count('stale')
+        connect.logger.warning('Returning an expired response: %s', error)
+        return True, entry[0]
+
+    def call(self, connect, api_url, data, func, *args):
+        """Get the response of a request from the cache or the function.
+
+        Args:
+            connect (rayvision_api.connect.Connect): The connect sending the
+                request.
+            api_url (str): The api url.
+            data (dict): The request data.
+            func (callable): Send the request, called with ``args``.
+
+        Returns:
+            dict or list: The response data.
+
+        """
+        policy, key, entry = self.lookup(connect, api_url, data)
+        if policy is None:
+            try:
+                return func(*args)
+            finally:
+                self.invalidate_after(api_url)
+        if entry is not None and entry[1]:
+            return entry[0]
+        try:
+            result = func(*args)
+        except Exception as err:
+            found, value = self.stale(connect, entry, err)
+            if found:
+                return value
+            raise
+        self.store(api_url, policy, key, result)
+        return result
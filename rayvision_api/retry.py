@@ -0,0 +1,195 @@
+"""Retry the transient failures of the requests.
+
+Only the transport errors and the explicitly listed error codes are
+retried, the other errors (e.g. a business error code or an invalid request
+data) are raised at once. The retries wait an exponential backoff with
+jitter and are limited by a retry budget shared by all the requests of a
+client, so that an outage of the farm does not multiply our load.
+
+Example::
+
+    >>> policy = RetryPolicy(max_attempts=3, retryable_codes=[503])
+    >>> api = RayvisionAPI(access_id="xxx", access_key="xxx",
+    ...                    retry_policy=policy)
+    >>> api.connect.retry_policy.stats
+    {'requests': 0, 'retries': 0, 'gave_up': 0, 'budget_exhausted': 0}
+
+"""
+
+# Import built-in modules
+import threading
+
+# Import third-party modules
+import requests
+from tenacity import Retrying
+from tenacity import stop_after_attempt
+from tenacity import wait_exponential
+from tenacity import wait_random_exponential
+
+# Import local modules
+from rayvision_api.exception import RayvisionAPIError
+
+# The HTTP statuses and the error codes retried by default. The HTTP
+# statuses are raised as ``RayvisionHTTPStatusError`` and the error codes of
+# the API body as ``RayvisionAPIError``, both are matched by ``error_code``.
+RETRYABLE_CODES = (429, 500, 502, 503, 504)
+
+# The transport errors retried by default.
+TRANSIENT_EXCEPTIONS = (requests.ConnectionError, requests.Timeout)
+
+
+class RetryBudget(object):
+    """Limit the retries to a ratio of the requests.
+
+    Each request deposits ``ratio`` token and each retry withdraws one token,
+    the retries are refused when the budget is empty.
+
+    """
+
+    def __init__(self, ratio=0.2, initial=10, maximum=100):
+        """Initialize instance.
+
+        Args:
+            ratio (float): The tokens deposited by each request, 0.2 allows
+                one retry every five requests on average.
+            initial (float): The tokens available at startup.
+            maximum (float): The maximum tokens kept.
+
+        """
+        self.ratio = ratio
+        self.maximum = maximum
+        self._tokens = float(initial)
+        self._lock = threading.Lock()
+
+    @property
+    def tokens(self):
+        """float: The tokens available."""
+        return self._tokens
+
+    def deposit(self):
+        """Record a request."""
+        with self._lock:
+            self._tokens = min(self._tokens + self.ratio, self.maximum)
+
+    def withdraw(self):
+        """Take the token of a retry.
+
+        Returns:
+            bool: True if the retry is allowed.
+
+        """
+        with self._lock:
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+
+class RetryPolicy(object):
+    """Decide which failures are retried and how long to wait."""
+
+    def __init__(self, max_attempts=5, retryable_codes=RETRYABLE_CODES,
+                 retryable_exceptions=TRANSIENT_EXCEPTIONS, backoff=0.5,
+                 max_backoff=8, jitter=True, budget=None):
+        """Initialize instance.
+
+        Args:
+            max_attempts (int): The maximum attempts of a request, 1
+                disables the retries.
+            retryable_codes (iterable of int): The HTTP statuses and the
+                error codes of the response retried.
+            retryable_exceptions (tuple): The exception classes retried.
+            backoff (float): Seconds waited before the first retry, doubled
+                for each following retry.
+            max_backoff (float): The maximum seconds waited between two
+                attempts.
+            jitter (bool): Wait a random time between 0 and the backoff,
+                so that the clients do not retry all at the same time.
+            budget (RetryBudget, optional): The retry budget of the client,
+                a new budget is created by default.
+
+        """
+        self.max_attempts = max(int(max_attempts), 1)
+        self.retryable_codes = frozenset(retryable_codes or ())
+        self.retryable_exceptions = tuple(retryable_exceptions or ())
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.budget = budget if budget is not None else RetryBudget()
+        self._lock = threading.Lock()
+        self._stats = {
+            'requests': 0,
+            'retries': 0,
+            'gave_up': 0,
+            'budget_exhausted': 0,
+        }
+
+    @property
+    def stats(self):
+        """dict: The retry counters.
+
+        e.g.:
+            {
+                "requests": 120,
+                "retries": 6,
+                "gave_up": 1,
+                "budget_exhausted": 0
+            }
+
+        """
+        with self._lock:
+            return dict(self._stats)
+
+    def _count(self, name):
+        with self._lock:
+            self._stats[name] += 1
+
+    def is_retryable(self, error):
+        """bool: The error is transient."""
+        if isinstance(error, RayvisionAPIError):
+            return error.error_code in self.retryable_codes
+        return isinstance(error, self.retryable_exceptions)
+
+    def _wait(self):
+        if self.jitter:
+            return wait_random_exponential(multiplier=self.backoff,
+                                           max=self.max_backoff)
+        return wait_exponential(multiplier=self.backoff, max=self.max_backoff)
+
+    def _should_retry(self, retry_state):
+        """Decide if the attempt is retried, called by ``tenacity``."""
+        if not retry_state.outcome.failed:
+            return False
+        if not self.is_retryable(retry_state.outcome.exception()):
+            return False
+        if retry_state.attempt_number >= self.max_attempts:
+            self._count('gave_up')
+            return False
+        if not self.budget.withdraw():
+            self._count('budget_exhausted')
+            return False
+        self._count('retries')
+        return True
+
+    def _retrying_kwargs(self):
+        self._count('requests')
+        self.budget.deposit()
+        return {
+            'reraise': True,
+            'stop': stop_after_attempt(self.max_attempts),
+            'wait': self._wait(),
+            'retry': self._should_retry,
+        }
+
+    def retrying(self):
+        """tenacity.Retrying: Get the retrying of one request."""
+        return Retrying(**self._retrying_kwargs())
+
+    def async_retrying(self):
+        """tenacity.AsyncRetrying: Get the retrying of one coroutine."""
+        from tenacity import AsyncRetrying  # pylint: disable=import-error
+        return AsyncRetrying(**self._retrying_kwargs())
+
+    def call(self, func, *args, **kwargs):
+        """Call the function, retrying the transient failures."""
+        return self.retrying()(func, *args, **kwargs)
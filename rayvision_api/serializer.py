@@ -0,0 +1,104 @@
+"""Serialize the request body and decode the response body.
+
+The standard library ``json`` is used by default, ``orjson`` and ``ujson``
+can be selected when they are installed.
+
+"""
+
+# Import built-in modules
+import json
+
+# The backends tried in order by ``auto``.
+AUTO_BACKENDS = ('orjson', 'ujson', 'json')
+
+
+class JsonSerializer(object):
+    """Serializer based on the standard library ``json``."""
+
+    name = 'json'
+
+    @staticmethod
+    def dumps(data):
+        """bytes: Serialize the data to the body of the request."""
+        return json.dumps(data).encode('utf-8')
+
+    @staticmethod
+    def loads(content):
+        """Decode the body of the response.
+
+        Args:
+            content (bytes): The raw body.
+
+        Returns:
+            dict: The decoded data.
+
+        """
+        if isinstance(content, bytes):
+            content = content.decode('utf-8')
+        return json.loads(content)
+
+
+class OrjsonSerializer(JsonSerializer):
+    """Serializer based on ``orjson``."""
+
+    name = 'orjson'
+
+    def __init__(self):
+        import orjson  # pylint: disable=import-error
+        self._orjson = orjson
+
+    def dumps(self, data):
+        return self._orjson.dumps(data)
+
+    def loads(self, content):
+        return self._orjson.loads(content)
+
+
+class UjsonSerializer(JsonSerializer):
+    """Serializer based on ``ujson``."""
+
+    name = 'ujson'
+
+    def __init__(self):
+        import ujson  # pylint: disable=import-error
+        self._ujson = ujson
+
+    def dumps(self, data):
+        return self._ujson.dumps(data).encode('utf-8')
+
+    def loads(self, content):
+        return self._ujson.loads(content)
+
+
+SERIALIZERS = {
+    'json': JsonSerializer,
+    'orjson': OrjsonSerializer,
+    'ujson': UjsonSerializer,
+}
+
+
+def get_serializer(backend='json'):
+    """Get the serializer of the given backend.
+
+    Args:
+        backend (str, optional): One of ``json``, ``orjson``, ``ujson`` or
+            ``auto``, ``auto`` picks the fastest one installed.
+
+    Returns:
+        JsonSerializer: The serializer instance.
+
+    Raises:
+        ValueError: The backend is unknown.
+        ImportError: The backend is not installed.
+
+    """
+    if backend == 'auto':
+        for name in AUTO_BACKENDS:
+            try:
+                return SERIALIZERS[name]()
+            except ImportError:
+                continue
+    if backend not in SERIALIZERS:
+        raise ValueError('Unknown json backend {!r}, expected one of: '
+                         '{}.'.format(backend, ', '.join(sorted(SERIALIZERS))))
+    return SERIALIZERS[backend]()
@@ -81,27 +81,74 @@ def generate_headers_body_str(domain_name, api_url, header, body):
         str: Stitched string.
 
     """
-    header = copy.deepcopy(header)
-    body = copy.deepcopy(body)
-    try:
-        header.pop('signature')
-        header.pop('Content-Type')
-    except KeyError:
-        pass
-
-    header_body_dict = headers_body_sort(header, body)
-    header_body_list = [
-        '{0}={1}'.format(key, value)
-        for key, value in header_body_dict.items()
-    ]
     result_str = '[POST]{domain_name}:{api_url}&{header_body_str}'.format(
         domain_name=domain_name,
         api_url=api_url,
-        header_body_str='&'.join(header_body_list)
+        header_body_str=canonical_headers_body(header, body)
     )
     return result_str
 
 
+def _flatten_into(value, key, flat):
+    """Flatten the value into ``flat`` the same way as ``formatted_headers``.
+
+    Args:
+        value (object): The value to flatten.
+        key (str): The flattened key of the value, None for the root.
+        flat (dict): The flattened key value pairs.
+
+    """
+    if isinstance(value, dict):
+        for key_new_part, sub_value in value.items():
+            if not key:
+                new_key = key_new_part
+            else:
+                new_key = '{0}.{1}'.format(key, key_new_part)
+            _flatten_into(sub_value, new_key, flat)
+    elif isinstance(value, list):
+        for index, sub_value in enumerate(value):
+            _flatten_into(sub_value, '{0}{1}'.format(key, index), flat)
+    else:
+        flat[key] = value
+
+
+def canonical_headers_body(header, body):
+    """Generate the canonical request string of the header and the body.
+
+    Produces the same string as joining the sorted ``headers_body_sort``
+    items, but the header and the body are only read: they are neither
+    copied nor merged, and they are flattened in a single traversal.
+
+    Args:
+        header (dict): Request header, ``signature`` and ``Content-Type`` do
+            not participate in signatures.
+        body (dict): Request body.
+
+    Returns:
+        str: The ``key=value`` pairs sorted by key and joined by ``&``.
+
+    """
+    excluded = ()
+    if 'signature' in header:
+        # Keep the legacy behavior: ``Content-Type`` is only dropped along
+        # with ``signature``.
+        excluded = ('signature', 'Content-Type')
+    flat = {}
+    # Same order as ``header.update(body)``: the header keys first with the
+    # body values winning, then the keys only present in the body.
+    for key, value in header.items():
+        if key in excluded:
+            continue
+        if key in body:
+            value = body[key]
+        _flatten_into(value, key, flat)
+    for key, value in body.items():
+        if key in header and key not in excluded:
+            continue
+        _flatten_into(value, key, flat)
+    return '&'.join(['{0}={1}'.format(key, flat[key]) for key in sorted(flat)])
+
+
 def formatted_headers(headers):
     """Please formatted dictionary.
 
@@ -0,0 +1,145 @@
+"""Coalesce the identical calls of the read-only endpoints in flight.
+
+A connect created with a ``single_flight`` sends one request for the
+concurrent calls having the same endpoint and request body: while the
+request of a call is in flight, the next identical calls wait for it and
+get their own copy of its response, or its error. The calls of the mutating
+endpoints, e.g. ``createTask``, are never coalesced.
+
+Example::
+
+    >>> api = RayvisionAPI(access_id="xxx", access_key="xxx",
+    ...                    single_flight=SingleFlight())
+    >>> with ThreadPoolExecutor(50) as executor:
+    ...     results = list(executor.map(
+    ...         lambda _: api.query.supported_plugin("maya"), range(50)))
+    >>> api.connect.single_flight.stats
+    {'requests': 1, 'coalesced': 49, 'in_flight': 0}
+
+"""
+
+# Import built-in modules
+import copy
+import threading
+
+# Import local modules
+from rayvision_api.signature import generate_headers_body_str
+from rayvision_api.url import ApiUrl
+
+# The endpoints only reading the data of the render farm.
+DEFAULT_ENDPOINTS = frozenset(api_url.value for api_url in (
+    ApiUrl.queryPlatforms, ApiUrl.queryUserProfile, ApiUrl.queryUserSetting,
+    ApiUrl.getBid, ApiUrl.queryAnalyseErrorDetail, ApiUrl.getTaskList,
+    ApiUrl.queryTaskFrames, ApiUrl.queryAllFrameStats, ApiUrl.queryTaskInfo,
+    ApiUrl.getList, ApiUrl.list, ApiUrl.querySoftwareList,
+    ApiUrl.querySoftwareDetail, ApiUrl.getUserPluginConfig,
+    ApiUrl.getRaySyncUserKey, ApiUrl.getServerInfo, ApiUrl.getConfig,
+    ApiUrl.loadTaskProcessImg, ApiUrl.loadingFrameThumbnail,
+    ApiUrl.getOutputUserDirFile, ApiUrl.hardwareConfig, ApiUrl.showLog))
+
+
+def _path(api_url):
+    """str: The path of an api url, ``ApiUrl`` members included."""
+    return getattr(api_url, 'value', api_url)
+
+
+class _Flight(object):
+    """The request in flight of a key."""
+
+    __slots__ = ('done', 'result', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight(object):
+    """Share the request in flight between the identical calls, thread-safe."""
+
+    def __init__(self, endpoints=None):
+        """Initialize instance.
+
+        Args:
+            endpoints (iterable of str, optional): The api urls whose calls
+                are coalesced, ``DEFAULT_ENDPOINTS`` by default.
+
+        """
+        if endpoints is None:
+            endpoints = DEFAULT_ENDPOINTS
+        self.endpoints = frozenset(_path(api_url) for api_url in endpoints)
+        self._lock = threading.Lock()
+        self._flights = {}
+        self._stats = {'requests': 0, 'coalesced': 0}
+
+    @property
+    def stats(self):
+        """dict: The requests sent, the calls coalesced into them and the
+        requests in flight."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['in_flight'] = len(self._flights)
+        return stats
+
+    @staticmethod
+    def make_key(connect, api_url, data):
+        """Get the key of a call.
+
+        Args:
+            connect (rayvision_api.connect.Connect): The connect sending the
+                request.
+            api_url (str): The api url.
+            data (dict): The request data.
+
+        Returns:
+            str: The canonical request string of the signature, without the
+                timestamp and the nonce.
+
+        """
+        return generate_headers_body_str(connect.domain, _path(api_url),
+                                         connect.headers, data or {})
+
+    def call(self, connect, api_url, data, func, *args):
+        """Get the response of the call in flight or call the function.
+
+        Args:
+            connect (rayvision_api.connect.Connect): The connect sending the
+                request.
+            api_url (str): The api url.
+            data (dict): The request data.
+            func (callable): Send the request, called with ``args``.
+
+        Returns:
+            dict or list: The response data, the coalesced calls get a copy
+                of the snapshot taken before they are woken up.
+
+        """
+        if _path(api_url) not in self.endpoints:
+            return func(*args)
+        key = self.make_key(connect, api_url, data)
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+                self._stats['requests'] += 1
+            else:
+                self._stats['coalesced'] += 1
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return copy.deepcopy(flight.result)
+        try:
+            result = func(*args)
+            # Snapshot before waking the other calls up, the caller may
+            # change its result as soon as it is returned.
+            flight.result = copy.deepcopy(result)
+        except BaseException as err:
+            flight.error = err
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+        return result
@@ -0,0 +1,195 @@
+"""Keep a local snapshot of the task list in sync with the render farm.
+
+The first call of ``TaskListSynchronizer.sync`` downloads the whole task
+list, the following calls only request the tasks submitted since the last
+poll and refresh the tasks that are not finished yet, so the cost of a poll
+grows with the number of changed tasks instead of the number of tasks.
+
+Example::
+
+    >>> synchronizer = TaskListSynchronizer(api.query,
+    ...                                     final_statuses=[10, 23])
+    >>> diff = synchronizer.sync()
+    >>> for task in diff.added:
+    ...     print(task["id"], task["taskStatus"])
+
+"""
+
+# Import built-in modules
+import collections
+import time
+
+# The changes found by one poll, each field is a list of task dicts.
+TaskListDiff = collections.namedtuple('TaskListDiff',
+                                      ['added', 'updated', 'removed'])
+
+# The time format of the ``startTime`` and ``endTime`` filters.
+TIME_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+
+class TaskListSynchronizer(object):
+    """Local snapshot of the task list keyed by task id."""
+
+    def __init__(self, query, status_list=None, final_statuses=None,
+                 page_size=100, overlap=60, full_sync_interval=3600,
+                 time_format=TIME_FORMAT, clock=time.time):
+        """Initialize instance.
+
+        Args:
+            query (rayvision_api.operators.QueryOperator): The query operator.
+            status_list (list of int, optional): Only track the tasks with
+                these statuses.
+            final_statuses (list of int, optional): The statuses of the
+                finished tasks, which are not refreshed anymore until the
+                next full sync. All the tracked tasks are refreshed when
+                it is not given.
+            page_size (int, optional): The page size of the task list.
+            overlap (int, optional): Seconds subtracted from the start of the
+                poll window, to tolerate the clock skew with the server.
+            full_sync_interval (int, optional): Seconds between two full
+                downloads of the task list, which detect the removed tasks.
+                0 or None disables the periodic full sync.
+            time_format (str, optional): The ``strftime`` format of the
+                window bounds.
+            clock (callable, optional): Get the current timestamp.
+
+        """
+        self._query = query
+        self._status_list = list(status_list) if status_list else None
+        self._final_statuses = frozenset(final_statuses or ())
+        self._page_size = page_size
+        self._overlap = overlap
+        self._full_sync_interval = full_sync_interval
+        self._time_format = time_format
+        self._clock = clock
+        self._tasks = {}
+        self._last_poll = None
+        self._last_full_sync = None
+
+    @property
+    def tasks(self):
+        """dict: The tracked tasks keyed by task id."""
+        return dict(self._tasks)
+
+    def __len__(self):
+        return len(self._tasks)
+
+    def __contains__(self, task_id):
+        return task_id in self._tasks
+
+    def get(self, task_id, default=None):
+        """dict: Get a tracked task."""
+        return self._tasks.get(task_id, default)
+
+    def reset(self):
+        """Forget the snapshot, the next sync is a full sync."""
+        self._tasks = {}
+        self._last_poll = None
+        self._last_full_sync = None
+
+    def iter_tasks(self, start_time=None, end_time=None):
+        """Iterate over the task list, page by page.
+
+        Args:
+            start_time (str, optional): Search limit for start time.
+            end_time (str, optional): Search limit for end time.
+
+        Yields:
+            dict: The task records.
+
+        """
+        page_num = 1
+        while True:
+            task_list = self._query.get_task_list(
+                page_num=page_num, page_size=self._page_size,
+                status_list=self._status_list, start_time=start_time,
+                end_time=end_time)
+            items = task_list.get('items') or []
+            for item in items:
+                yield item
+            if not items or page_num >= (task_list.get('pageCount') or 0):
+                return
+            page_num += 1
+
+    def sync(self, full=False):
+        """Update the snapshot and get the changes since the previous call.
+
+        Args:
+            full (bool, optional): Download the whole task list even if the
+                full sync interval is not elapsed.
+
+        Returns:
+            TaskListDiff: The added, updated and removed tasks.
+
+        """
+        now = self._clock()
+        if full or self._need_full_sync(now):
+            diff = self._full_sync()
+            self._last_full_sync = now
+        else:
+            diff = self._incremental_sync(now)
+        self._last_poll = now
+        return diff
+
+    def _need_full_sync(self, now):
+        if self._last_full_sync is None:
+            return True
+        if not self._full_sync_interval:
+            return False
+        return now - self._last_full_sync >= self._full_sync_interval
+
+    def _full_sync(self):
+        fetched = {}
+        for item in self.iter_tasks():
+            fetched[item['id']] = item
+        added, updated = self._apply(fetched.values())
+        removed = [self._tasks.pop(task_id) for task_id in list(self._tasks)
+                   if task_id not in fetched]
+        return TaskListDiff(added, updated, removed)
+
+    def _incremental_sync(self, now):
+        start_time = self._format_time(self._last_poll - self._overlap)
+        end_time = self._format_time(now + self._overlap)
+        fetched = {}
+        for item in self.iter_tasks(start_time=start_time,
+                                    end_time=end_time):
+            fetched[item['id']] = item
+        active_ids = [task_id for task_id, task in self._tasks.items()
+                      if task_id not in fetched and
+                      task.get('taskStatus') not in self._final_statuses]
+        refreshed = self._query.task_info_bulk(active_ids) if active_ids else {}
+        for task_id, item in refreshed.items():
+            if self._tracked(item):
+                fetched[task_id] = item
+        added, updated = self._apply(fetched.values())
+        # The active tasks that are gone or left the tracked statuses.
+        removed = [self._tasks.pop(task_id) for task_id in active_ids
+                   if task_id not in fetched]
+        return TaskListDiff(added, updated, removed)
+
+    def _tracked(self, task):
+        return (not self._status_list or
+                task.get('taskStatus') in self._status_list)
+
+    def _apply(self, items):
+        """Merge the fetched tasks into the snapshot.
+
+        Returns:
+            tuple: The added and the updated tasks.
+
+        """
+        added = []
+        updated = []
+        for item in items:
+            previous = self._tasks.get(item['id'])
+            if previous is None:
+                added.append(item)
+            elif previous != item:
+                updated.append(item)
+            else:
+                continue
+            self._tasks[item['id']] = item
+        return added, updated
+
+    def _format_time(self, timestamp):
+        return time.strftime(self._time_format, time.localtime(timestamp))
@@ -10,14 +10,13 @@ import logging
 import os
 import sys
 import time
-import re
 
 from past.builtins import long
 
 from rayvision_api.constants import MODIFIABLE_PARAM, CG_SETTING
-from rayvision_api.exception import RayvisionError, HardwareConfigIdError, NotSupportPluginError, NotSupportCGSoftwareError, NotSupportHardwareCodeError
+from rayvision_api.exception import RayvisionError, HardwareConfigIdError
 # Import local modules
-from rayvision_api.utils import json_load, exists_or_create, update_task_info, json_save
+from rayvision_api.utils import json_load, exists_or_create, update_task_info, json_save, apply_task_info_update
 
 
 # pylint: disable=useless-object-inheritance
@@ -129,7 +128,8 @@ class RayvisionCheck(object):
         elif os.path.isfile(data):
             return json_load(data)
 
-    def execute(self, hardware_config, task_json, upload_json="", asset_json="", is_cover=True, only_id=True):
+    def execute(self, hardware_config, task_json, upload_json="", asset_json="", is_cover=True, only_id=True,
+                in_memory=False):
         """Check asset configuration information.
 
         Check the scene for problems and filter unwanted configuration
@@ -137,8 +137,14 @@ class RayvisionCheck(object):
         Args:
             is_cover (bool): Whether the updated json file overwrites the file under the original path,
                              by default 'True'.
+            in_memory (bool): Check the task, upload and asset information in memory, each json file
+                              is read at most once and none is written, call ``write_json_files`` to
+                              save them, by default 'False'.
 
         """
+        if in_memory:
+            return self._execute_in_memory(hardware_config, task_json, upload_json, asset_json,
+                                           only_id=only_id)
         workspace = self.workspace if isinstance(task_json, dict) else os.path.dirname(task_json)
         tmp_dir_name = self.check_analyze(analyze=self.analyze,
                                           workspace=workspace,
@@ -163,18 +169,65 @@ class RayvisionCheck(object):
         data = self.write(only_id=only_id)
         return data
 
-    def write(self, only_id=True):
-        """Check and write to a json file."""
-        scene_info_render = self.task_info.get("scene_info_render") or \
-                            self.task_info["scene_info"]
-        self._edit_param_and_write(scene_info_render,
-                                   self.task_info["task_info"],
-                                   self.upload_info)
+    def _execute_in_memory(self, hardware_config, task_json, upload_json="", asset_json="", only_id=True):
+        """Check the information without the json files round trips."""
+        if self.analyze:
+            self.check_analyze(analyze=self.analyze, workspace=self.workspace)
+        task_info = self.get_json_info(task_json)
+        self.check_plugin(task_info)
+        self.set_custom_hardware(hardware_config, task_info, None)
+
+        upload_info = self.get_json_info(upload_json)
+        asset_info = self.get_json_info(asset_json)
+        self.logger.info('[Rayvision_utils check start .....]')
+        self.task_info = self.check_task_info(task_info)
+        self.upload_info = upload_info or {}
+        self.asset_info = asset_info
+
+        language = "0" if self.api._connect.domain.startswith("task") else "1"
+        self.check_error_warn_info(language=language)
+        self.is_scene_have_error()  # Check error.
+        self._edit_param(self._scene_info_render(), self.task_info["task_info"])
+        return self._result(only_id)
+
+    def write_json_files(self, folder=None):
+        """Write the checked information to the json files, once.
+
+        Args:
+            folder (str, optional): The folder of the json files, by default
+                the files of the analysis or the workspace.
+
+        Returns:
+            str: The folder of the task.json.
+
+        """
+        if folder or not self.task_json:
+            folder = folder or self.workspace
+            exists_or_create(folder)
+            self.task_json = os.path.join(folder, "task.json")
+            self.tips_json = os.path.join(folder, "tips.json")
+            self.asset_json = os.path.join(folder, "asset.json")
+            self.upload_json = os.path.join(folder, "upload.json")
+        self._write_to_json_file(create=True)
+        return os.path.dirname(self.task_json)
+
+    def _scene_info_render(self):
+        return self.task_info.get("scene_info_render") or \
+               self.task_info["scene_info"]
+
+    def _result(self, only_id):
         if only_id:
             return int(self.task_info["task_info"]["task_id"])
         self.logger.info('[Rayvision_utils check end .....]')
         return self.task_info, int(self.task_info["task_info"]["task_id"])
 
+    def write(self, only_id=True):
+        """Check and write to a json file."""
+        self._edit_param_and_write(self._scene_info_render(),
+                                   self.task_info["task_info"],
+                                   self.upload_info)
+        return self._result(only_id)
+
     def check_error_warn_info(self, language='0'):
         """Check the error in the analysis scenario.
 
@@ -193,10 +246,10 @@ class RayvisionCheck(object):
         """
         self.logger.info('[Rayvision_utils check_error_warn_info start .....]')
         if self.tips_info:
+            details = self.api.query.error_detail_by_code(self.tips_info,
+                                                          language=language)
             for code, value in self.tips_info.items():
-                code_info_list = self.api.query.error_detail(
-                    code, language=language)
-                for code_info in code_info_list:
+                for code_info in details.get(str(code), []):
                     code_info['details'] = value
                     if str(code_info['type']) == '1':  # 0:warning  1:error.
                         self.errors_number += 1
@@ -232,6 +285,13 @@ class RayvisionCheck(object):
         scene information into the json file.
 
         """
+        self._edit_param(scene_info_render, task_info)
+        self._write_to_json_file()
+
+        return True
+
+    def _edit_param(self, scene_info_render=None, task_info=None):
+        """Apply the checked scene information and the modifiable parameters."""
         self.logger.info('INPUT:')
         self.logger.info('=' * 20)
         self.logger.info('scene_info_render: %s', scene_info_render)
@@ -248,25 +308,24 @@ class RayvisionCheck(object):
                         value = str(value)
                     self.task_info['task_info'][key] = value
 
-        self._write_to_json_file()
-
-        return True
-
-    def _write_json(self, data, path):
+    def _write_json(self, data, path, create=False):
         """write to json."""
 
-        if data and path is not None and os.path.isfile(path):
+        if data and path is not None and (create or os.path.isfile(path)):
             with codecs.open(path, "w", "utf-8") as f_json:
                 json.dump(data, f_json, indent=4, ensure_ascii=False)
 
-    def _write_to_json_file(self):
+    def _write_to_json_file(self, create=False):
         """Update json file.
 
+        Args:
+            create (bool): Also create the missing files.
+
         """
-        self._write_json(self.task_info, self.task_json)
-        self._write_json(self.upload_info, self.upload_json)
-        self._write_json(self.asset_info, self.asset_json)
-        self._write_json(self.tips_info, self.tips_json)
+        self._write_json(self.task_info, self.task_json, create)
+        self._write_json(self.upload_info, self.upload_json, create)
+        self._write_json(self.asset_info, self.asset_json, create)
+        self._write_json(self.tips_info, self.tips_json, create)
 
     def check_plugin(self, task_data):
         version = task_data["software_config"]["cg_version"]
@@ -287,63 +346,34 @@ class RayvisionCheck(object):
                 cg_name, version, ",".join(sorted(all_version))))
 
     def set_custom_hardware(self, custom_hardware, task_info, task_path):
-        """Check whether the hardware configuration information exists and whether it meets the requirements."""
-        hardware_config_list = self.api.user.get_hardware_config()
+        """Check whether the hardware configuration information exists and whether it meets the requirements.
+
+        Args:
+            custom_hardware (dict): The model, ram and gpuNum of the wanted hardware.
+            task_info (dict): The task information.
+            task_path (str): The task.json to update, None to update ``task_info`` in memory.
+
+        """
+        catalog = self.api.user.get_hardware_catalog()
         platform = task_info['task_info'].get('platform', self.api.platform)
         cg_id = task_info['task_info']['cg_id']
         plugins = task_info['software_config']['plugins']
-        check_keys = ['model', 'ram', 'gpuNum']
         gpu_num = custom_hardware.get('gpuNum')
-        hardware_id = ''
-        exist_not_support_code = False
-        allow_hardware_config = []
         if task_info['software_config']['cg_name'] == "CINEMA 4D" and task_info['software_config']['cg_version'] == "2024":
             if custom_hardware.get('model').lower() in ["1080ti", "default"] and self.api.platform in ["21", "59", "61"]:
                 raise HardwareConfigIdError(1000001, "CINEMA 4D 2024 GPU area hardware configuration model does"
                                                      " not allow Defalut and 1080Ti")
 
-        for one_hardware_config in hardware_config_list:
-            if not one_hardware_config['status']:
-                continue
-            not_support_cgid = one_hardware_config['notSupportCgId']
-            if not_support_cgid and cg_id in not_support_cgid:
-                if all(map(lambda key: custom_hardware[key] == one_hardware_config[key], check_keys)):
-                    raise NotSupportCGSoftwareError
-            not_support_code = one_hardware_config['notSupportCode']
-            not_support_code_list = [item for item in self.tips_info.keys() if item in not_support_code]
-            if (len(not_support_code_list) > 0) and (custom_hardware["model"] == one_hardware_config["model"]):
-                exist_not_support_code = True
-                continue
-            if one_hardware_config['platform'] != int(platform):
-                continue
-            if len(not_support_code_list) == 0:
-                allow_hardware_config.append(str({'model': one_hardware_config["model"], 'ram': one_hardware_config["ram"],
-                                    'gpuNum': one_hardware_config["gpuNum"]}))
-            if not all(map(lambda key: custom_hardware[key] == one_hardware_config[key], check_keys)):
-                continue
-            not_support_plugin_list = one_hardware_config['notSupportPluginList']
-            if not_support_plugin_list:
-                for plugin_str in not_support_plugin_list:
-                    new_plugin_str = plugin_str.replace("(", "").replace(")", "")
-                    for plugin_name, plugin_ver in plugins.items():
-                        plugin_data = "%s %s" % (plugin_name, plugin_ver)
-                        re_result = re.findall(new_plugin_str, plugin_data, re.I)
-                        if re_result and re_result[0]:
-                            raise NotSupportPluginError(1000000, "%s is not support %s%s" % (custom_hardware, plugin_name, plugin_ver))
-
-            hardware_id = str(one_hardware_config.get('id', ""))
-
-        if exist_not_support_code:
-            raise NotSupportHardwareCodeError(1000000, "It was detected that the rendering file does not match the hardware settings, please choose from the following options:%s" % ",".join(
-                allow_hardware_config))
-        if not hardware_id:
-            raise HardwareConfigIdError(1000000, "Allowed Hardware Configuration Information:%s" % ",".join(
-                allow_hardware_config))
+        hardware_id = catalog.match(custom_hardware, platform, cg_id, plugins,
+                                    codes=list(self.tips_info))
 
         update_hardware_config = {
             "hardwareConfigId": hardware_id,
             "ram": custom_hardware["ram"].replace("GB", ""),
             "graphics_cards_num": gpu_num[0] if gpu_num else "2"
         }
-        update_task_info(update_hardware_config, task_path)
+        if task_path is None:
+            apply_task_info_update(update_hardware_config, task_info)
+        else:
+            update_task_info(update_hardware_config, task_path)
 
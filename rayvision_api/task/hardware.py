@@ -0,0 +1,185 @@
+"""Match the custom hardware against the hardware configurations.
+
+The hardware configurations are indexed once by ``HardwareCatalog``, so a
+catalog can be shared by many submissions: a lookup only visits the
+configurations with the same model, ram and number of GPUs, and the
+unsupported plugins patterns are compiled once.
+
+"""
+
+# Import built-in modules
+import collections
+import re
+
+# Import local modules
+from rayvision_api.exception import HardwareConfigIdError
+from rayvision_api.exception import NotSupportCGSoftwareError
+from rayvision_api.exception import NotSupportHardwareCodeError
+from rayvision_api.exception import NotSupportPluginError
+
+# The keys of the hardware configuration compared with the custom hardware.
+CHECK_KEYS = ('model', 'ram', 'gpuNum')
+
+
+def _as_container(value):
+    """Convert a list of the configuration into a set for the lookups.
+
+    The strings are kept, so that ``in`` still matches their substrings.
+
+    """
+    if not value:
+        return frozenset()
+    if isinstance(value, (list, tuple, set, frozenset)):
+        try:
+            return frozenset(value)
+        except TypeError:
+            return value
+    return value
+
+
+class HardwareConfig(object):
+    """One active hardware configuration."""
+
+    def __init__(self, config):
+        """Initialize instance.
+
+        Args:
+            config (dict): The hardware configuration, see
+                ``UserOperator.get_hardware_config``.
+
+        """
+        self.config = config
+        self.id = str(config.get('id', ""))
+        self.platform = config['platform']
+        self.model = config['model']
+        self.key = tuple(config[key] for key in CHECK_KEYS)
+        self.not_support_cg_ids = _as_container(config['notSupportCgId'])
+        self.not_support_codes = _as_container(config['notSupportCode'])
+        self.not_support_plugins = [
+            self._compile(plugin_str)
+            for plugin_str in config['notSupportPluginList'] or []]
+
+    @staticmethod
+    def _compile(plugin_str):
+        pattern = plugin_str.replace("(", "").replace(")", "")
+        try:
+            return re.compile(pattern, re.I)
+        except re.error:
+            # Raised by the lookups using it, like before the catalog.
+            return pattern
+
+    def has_not_support_code(self, codes):
+        """bool: One of the codes is not supported by the configuration."""
+        return any(code in self.not_support_codes for code in codes)
+
+    def not_support_plugin(self, plugins):
+        """Get the first plugin not supported by the configuration.
+
+        Args:
+            plugins (dict): The plugin versions keyed by plugin name.
+
+        Returns:
+            tuple: The plugin name and version, None if all are supported.
+
+        """
+        for pattern in self.not_support_plugins:
+            for plugin_name, plugin_ver in plugins.items():
+                plugin_data = "%s %s" % (plugin_name, plugin_ver)
+                if hasattr(pattern, 'findall'):
+                    re_result = pattern.findall(plugin_data)
+                else:
+                    re_result = re.findall(pattern, plugin_data, re.I)
+                if re_result and re_result[0]:
+                    return plugin_name, plugin_ver
+        return None
+
+    def __str__(self):
+        return str({'model': self.model, 'ram': self.config['ram'],
+                    'gpuNum': self.config['gpuNum']})
+
+
+class HardwareCatalog(object):
+    """The active hardware configurations indexed for the lookups."""
+
+    def __init__(self, hardware_config_list):
+        """Initialize instance.
+
+        Args:
+            hardware_config_list (list of dict): The hardware configurations,
+                the inactive ones are ignored.
+
+        """
+        self.hardware_config_list = hardware_config_list
+        self.configs = [HardwareConfig(config)
+                        for config in hardware_config_list
+                        if config['status']]
+        self._by_key = collections.defaultdict(list)
+        self._by_model = collections.defaultdict(list)
+        for config in self.configs:
+            self._by_key[config.key].append(config)
+            self._by_model[config.model].append(config)
+
+    def allowed(self, platform, codes):
+        """Get the configurations of the platform supporting the codes.
+
+        Args:
+            platform (str or int): The platform of renderFarm.
+            codes (iterable of str): The tips codes of the analysis.
+
+        Returns:
+            list of str: The descriptions of the configurations.
+
+        """
+        codes = list(codes)
+        return [str(config) for config in self.configs
+                if config.platform == int(platform) and
+                not config.has_not_support_code(codes)]
+
+    def match(self, custom_hardware, platform, cg_id, plugins, codes=()):
+        """Get the id of the configuration matching the custom hardware.
+
+        Args:
+            custom_hardware (dict): The model, ram and gpuNum of the wanted
+                hardware.
+            platform (str or int): The platform of renderFarm.
+            cg_id (int): The ID of the DCC software.
+            plugins (dict): The plugin versions keyed by plugin name.
+            codes (iterable of str): The tips codes of the analysis.
+
+        Returns:
+            str: The id of the hardware configuration.
+
+        Raises:
+            NotSupportCGSoftwareError: The software is not supported by the
+                hardware.
+            NotSupportPluginError: A plugin is not supported by the hardware.
+            NotSupportHardwareCodeError: The analysis found problems the
+                hardware does not support.
+            HardwareConfigIdError: No configuration matches.
+
+        """
+        codes = list(codes)
+        platform = int(platform)
+        key = tuple(custom_hardware[name] for name in CHECK_KEYS)
+        hardware_id = ''
+        for config in self._by_key.get(key, ()):
+            if config.not_support_cg_ids and cg_id in config.not_support_cg_ids:
+                raise NotSupportCGSoftwareError
+            if config.has_not_support_code(codes):
+                continue
+            if config.platform != platform:
+                continue
+            plugin = config.not_support_plugin(plugins)
+            if plugin:
+                raise NotSupportPluginError(1000000, "%s is not support %s%s" % (
+                    custom_hardware, plugin[0], plugin[1]))
+            hardware_id = config.id
+
+        if any(config.has_not_support_code(codes)
+               for config in self._by_model.get(custom_hardware["model"], ())):
+            raise NotSupportHardwareCodeError(1000000, "It was detected that the rendering file does not match the hardware settings, please choose from the following options:%s" % ",".join(
+                self.allowed(platform, codes)))
+        if not hardware_id:
+            raise HardwareConfigIdError(1000000, "Allowed Hardware Configuration Information:%s" % ",".join(
+                self.allowed(platform, codes)))
+        return hardware_id
@@ -0,0 +1,223 @@
+"""Pre-allocate the task IDs of the submissions.
+
+The pool creates the task IDs in batches and refills in the background when
+it runs low, so that the submitters get a task ID without a round trip.
+
+Example::
+
+    >>> pool = api.task.enable_id_pool(batch_size=50, low_water=10)
+    >>> task_id = api.task.task_id_pool.get()
+    >>> unused = api.task.close_id_pool()
+
+"""
+
+# Import built-in modules
+import atexit
+import collections
+import logging
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+
+# Import local modules
+from rayvision_api.exception import RayvisionError
+
+# The pools not closed yet, closed at exit to report their unused task IDs.
+_OPEN_POOLS = weakref.WeakSet()
+
+
+@atexit.register
+def _close_all():
+    for pool in list(_OPEN_POOLS):
+        pool.close()
+
+
+class TaskIdPool(object):
+    """A thread-safe pool of task IDs created in batches."""
+
+    def __init__(self, task_operator, batch_size=20, low_water=5,
+                 background=True, logger=None, **kwargs):
+        """Initialize instance.
+
+        Args:
+            task_operator (rayvision_api.operators.TaskOperator): Create the
+                task IDs.
+            batch_size (int, optional): The quantity of task ID created by a
+                refill.
+            low_water (int, optional): Refill when less task IDs are left.
+            background (bool, optional): Refill in a background thread,
+                otherwise the submitter emptying the pool waits the refill.
+            logger (logging.Logger, optional): Report the unused task IDs.
+            kwargs (dict): The other arguments of ``create_task``.
+
+        """
+        self._task_operator = task_operator
+        self.batch_size = max(int(batch_size), 1)
+        self.low_water = max(int(low_water), 0)
+        self.logger = logger or logging.getLogger(__name__)
+        self._create_kwargs = kwargs
+        self._ids = collections.deque()
+        self._returned = set()
+        self._condition = threading.Condition()
+        self._refilling = False
+        self._error = None
+        self._closed = False
+        self._executor = ThreadPoolExecutor(max_workers=1) if background else None
+        self._stats = {'issued': 0, 'created': 0, 'refills': 0}
+        _OPEN_POOLS.add(self)
+
+    @property
+    def stats(self):
+        """dict: The issued, created and available task IDs and refills."""
+        with self._condition:
+            stats = dict(self._stats)
+            stats['available'] = len(self._ids)
+        return stats
+
+    def __len__(self):
+        return len(self._ids)
+
+    def get(self, timeout=None):
+        """Take a task ID.
+
+        Args:
+            timeout (float, optional): Seconds to wait for a refill.
+
+        Returns:
+            int: The task ID.
+
+        Raises:
+            RayvisionError: The pool is closed, the refill failed or timed
+                out.
+
+        """
+        return self.get_many(1, timeout=timeout)[0]
+
+    def get_many(self, count, timeout=None):
+        """Take several task IDs.
+
+        Args:
+            count (int): The quantity of task ID.
+            timeout (float, optional): Seconds to wait for the refills, in
+                total.
+
+        Returns:
+            list of int: The task IDs.
+
+        Raises:
+            RayvisionError: The pool is closed, the refill failed or timed
+                out, the task IDs already taken are given back, or reported
+                as unused if the pool is closed.
+
+        """
+        deadline = None if timeout is None else time.time() + timeout
+        task_ids = []
+        with self._condition:
+            try:
+                while len(task_ids) < count:
+                    if self._closed:
+                        raise RayvisionError(1000000,
+                                             'The task id pool is closed.')
+                    while self._ids and len(task_ids) < count:
+                        task_id = self._ids.popleft()
+                        self._returned.discard(task_id)
+                        task_ids.append(task_id)
+                    if len(task_ids) < count:
+                        self._wait_refill(count - len(task_ids), deadline)
+            except BaseException:
+                if self._closed:
+                    if task_ids:
+                        self.logger.warning(
+                            '%d task ids were created but not used: %s',
+                            len(task_ids), task_ids)
+                else:
+                    self._ids.extendleft(reversed(task_ids))
+                raise
+            self._stats['issued'] += count
+            if len(self._ids) <= self.low_water:
+                self._start_refill(background=True)
+        return task_ids
+
+    def put(self, task_id):
+        """Give back a task ID that was not submitted, to reuse it."""
+        with self._condition:
+            if task_id not in self._returned:
+                self._returned.add(task_id)
+                self._ids.appendleft(task_id)
+                self._stats['issued'] -= 1
+                self._condition.notify_all()
+
+    def close(self):
+        """Stop the refills and report the unused task IDs.
+
+        Returns:
+            list of int: The task IDs created but never used.
+
+        """
+        _OPEN_POOLS.discard(self)
+        with self._condition:
+            self._closed = True
+            unused = list(self._ids)
+            self._ids.clear()
+            self._condition.notify_all()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+        if unused:
+            self.logger.warning('%d task ids were created but not used: %s',
+                                len(unused), unused)
+        return unused
+
+    def _wait_refill(self, needed, deadline):
+        """Wait for the task IDs until the deadline, the condition lock must
+        be held."""
+        self._error = None
+        self._start_refill(background=False, count=needed)
+        while not self._ids and not self._closed:
+            if self._error is not None:
+                error, self._error = self._error, None
+                raise error
+            if not self._refilling:
+                self._start_refill(background=False, count=needed)
+                continue
+            remaining = None
+            if deadline is not None:
+                remaining = deadline - time.time()
+            if ((remaining is not None and remaining <= 0)
+                    or not self._condition.wait(remaining)) and not self._ids:
+                raise RayvisionError(1000000, 'Timed out waiting for a task id.')
+
+    def _start_refill(self, background, count=0):
+        """Start a refill, the condition lock must be held."""
+        if self._refilling or self._closed:
+            return
+        self._refilling = True
+        count = max(count, self.batch_size)
+        if self._executor is not None:
+            self._executor.submit(self._refill, count)
+        elif not background:
+            self._condition.release()
+            try:
+                self._refill(count)
+            finally:
+                self._condition.acquire()
+        else:
+            self._refilling = False
+
+    def _refill(self, count):
+        try:
+            task_ids = self._task_operator.reserve_task_ids(
+                count, block_size=count, **self._create_kwargs)
+        except Exception as err:  # pylint: disable=broad-except
+            self.logger.warning('Failed to create the task ids: %s', err)
+            with self._condition:
+                self._error = err
+                self._refilling = False
+                self._condition.notify_all()
+            return
+        with self._condition:
+            self._ids.extend(task_ids)
+            self._stats['created'] += len(task_ids)
+            self._stats['refills'] += 1
+            self._refilling = False
+            self._condition.notify_all()
@@ -0,0 +1,18 @@
+"""The testing helpers of the rayvision_api.
+
+``MockFarm`` simulates the render farm API on a local server, to test and
+benchmark the client without network.
+
+"""
+
+# Import local modules
+from rayvision_api.testing.farm import FarmError
+from rayvision_api.testing.farm import FarmState
+from rayvision_api.testing.farm import MockFarm
+
+# All public api.
+__all__ = (
+    'FarmError',
+    'FarmState',
+    'MockFarm',
+)
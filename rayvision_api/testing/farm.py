@@ -0,0 +1,807 @@
+"""Simulate the render farm API on a local HTTP server.
+
+The farm answers every route of ``ApiUrl`` with the signed POST protocol of
+the real API: the signature of each request is verified with the
+``signature`` module, and the tasks, frames, labels and render environments
+are kept in memory. The latency, the rate of transient errors and the
+maximum page size are configurable, so that the throughput, the retries and
+the pagination of the client can be measured without network.
+
+Example::
+
+    >>> with MockFarm(latency=0.01, error_rate=0.05) as farm:
+    ...     api = RayvisionAPI(access_id=farm.access_id,
+    ...                        access_key=farm.access_key,
+    ...                        domain=farm.domain, platform="2",
+    ...                        protocol="http")
+    ...     task_id = api.task.create_task()["taskIdList"][0]
+    ...     api.task.submit_task(task_id)
+    ...     farm.advance(frames=5)
+    ...     api.query.get_all_frames(task_id)
+
+"""
+
+# Import built-in modules
+import json
+import random
+import threading
+import time
+
+try:
+    from http.server import BaseHTTPRequestHandler
+    from http.server import HTTPServer
+    from socketserver import ThreadingMixIn
+except ImportError:  # Python 2.
+    from BaseHTTPServer import BaseHTTPRequestHandler
+    from BaseHTTPServer import HTTPServer
+    from SocketServer import ThreadingMixIn
+
+# Import local modules
+from rayvision_api import signature
+from rayvision_api.constants import DCC_ID_MAPPINGS
+from rayvision_api.constants import HEADERS
+from rayvision_api.url import ApiUrl
+
+# The task statuses of the farm.
+TASK_WAITING = 0
+TASK_RENDERING = 5
+TASK_STOPPED = 10
+TASK_DONE = 25
+TASK_FAILED = 30
+TASK_ABANDONED = 35
+
+# The frame statuses of the farm.
+FRAME_WAITING = 1
+FRAME_RENDERING = 2
+FRAME_STOPPED = 3
+FRAME_DONE = 4
+FRAME_FAILED = 5
+
+# The headers signed by the client, the signature is not signed.
+SIGNED_HEADERS = tuple(key for key in HEADERS
+                       if key not in ('signature', 'Content-Type'))
+
+# The time format of the ``startTime`` and ``endTime`` filters.
+TIME_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+
+class FarmError(Exception):
+    """A business error answered with its code, like the real API."""
+
+    def __init__(self, code, message):
+        super(FarmError, self).__init__(code, message)
+        self.code = code
+        self.message = message
+
+
+def _page(items, body, max_page_size):
+    """Paginate the items like the list routes of the API.
+
+    Args:
+        items (list): All the items.
+        body (dict): The request data with ``pageNum`` and ``pageSize``.
+        max_page_size (int): The maximum page size served, None for no
+            limit.
+
+    Returns:
+        dict: The page.
+
+    """
+    page_num = max(int(body.get('pageNum') or 1), 1)
+    page_size = max(int(body.get('pageSize') or 100), 1)
+    if max_page_size:
+        page_size = min(page_size, max_page_size)
+    total = len(items)
+    start = (page_num - 1) * page_size
+    return {
+        'pageCount': (total + page_size - 1) // page_size,
+        'pageNum': page_num,
+        'total': total,
+        'size': page_size,
+        'items': items[start:start + page_size],
+    }
+
+
+def _timestamp(time_str):
+    """int: Convert a filter time to a timestamp in milliseconds."""
+    return int(time.mktime(time.strptime(time_str, TIME_FORMAT)) * 1000)
+
+
+class FarmState(object):
+    """The in-memory state of the farm, every route is a method."""
+
+    def __init__(self, user_id=100093088, frames_per_task=10,
+                 max_page_size=None, first_task_id=1000000):
+        """Initialize instance.
+
+        Args:
+            user_id (int, optional): The id of the user.
+            frames_per_task (int, optional): The frames of a submitted task.
+            max_page_size (int, optional): The largest page served by the
+                list routes, the requested page size by default.
+            first_task_id (int, optional): The first task id created.
+
+        """
+        self.user_id = user_id
+        self.frames_per_task = frames_per_task
+        self.max_page_size = max_page_size
+        self.lock = threading.RLock()
+        self._next_task_id = first_task_id
+        self._next_frame_id = 1
+        self._next_label_id = 1
+        self.created = set()
+        self.tasks = {}
+        self.frames = {}
+        self.task_json = {}
+        self.labels = {}
+        self.task_labels = {}
+        self.render_envs = {}
+        self.settings = {'taskOverTime': 12}
+
+    def _task(self, task_id):
+        task = self.tasks.get(int(task_id))
+        if task is None:
+            raise FarmError(604, 'Task {} does not exist.'.format(task_id))
+        return task
+
+    def _task_ids(self, body):
+        return [int(task_id) for task_id in body.get('taskIds') or []]
+
+    def _set_status(self, body, status, frame_statuses=None,
+                    frame_status=None):
+        for task_id in self._task_ids(body):
+            task = self._task(task_id)
+            task['preTaskStatus'] = task['taskStatus']
+            task['taskStatus'] = status
+            if frame_status is not None:
+                for frame in self.frames[task_id]:
+                    if frame['frameStatus'] in frame_statuses:
+                        frame['frameStatus'] = frame_status
+            self._update_counts(task)
+
+    def _update_counts(self, task):
+        frames = self.frames[task['id']]
+        counts = dict((status, 0) for status in (
+            FRAME_WAITING, FRAME_RENDERING, FRAME_STOPPED, FRAME_DONE,
+            FRAME_FAILED))
+        for frame in frames:
+            counts[frame['frameStatus']] += 1
+        task.update({
+            'totalFrames': len(frames),
+            'executingFrames': counts[FRAME_RENDERING],
+            'doneFrames': counts[FRAME_DONE],
+            'failedFrames': counts[FRAME_FAILED],
+            'abortFrames': counts[FRAME_STOPPED],
+        })
+
+    def advance(self, frames=1, fail_every=0):
+        """Render the next waiting frames of the rendering tasks.
+
+        Args:
+            frames (int, optional): The frames finished per task.
+            fail_every (int, optional): Fail one frame out of this number,
+                no frame fails by default.
+
+        """
+        with self.lock:
+            for task in self.tasks.values():
+                if task['taskStatus'] not in (TASK_WAITING, TASK_RENDERING):
+                    continue
+                task['taskStatus'] = TASK_RENDERING
+                task['startTime'] = task['startTime'] or int(time.time() * 1000)
+                waiting = [frame for frame in self.frames[task['id']]
+                           if frame['frameStatus'] == FRAME_WAITING]
+                for frame in waiting[:frames]:
+                    failed = fail_every and frame['id'] % fail_every == 0
+                    frame['frameStatus'] = FRAME_FAILED if failed else FRAME_DONE
+                    frame['endTime'] = int(time.time() * 1000)
+                self._update_counts(task)
+                if len(waiting) <= frames:
+                    task['taskStatus'] = TASK_FAILED if task['failedFrames'] \
+                        else TASK_DONE
+                    task['completedDate'] = int(time.time() * 1000)
+
+    # The user.
+
+    def query_platforms(self, body):
+        return [{'platform': 2, 'name': 'w2'}, {'platform': 6, 'name': 'w6'}]
+
+    def query_user_profile(self, body):
+        return {'userId': self.user_id, 'userName': 'rayvision',
+                'rmbbalance': '100.0', 'platform': 2}
+
+    def query_user_setting(self, body):
+        return dict(self.settings)
+
+    def update_user_setting(self, body):
+        self.settings.update(body)
+        return None
+
+    def get_bid(self, body):
+        return {'config_bid': '30201', 'input_bid': '10206',
+                'output_bid': '20206'}
+
+    # The tasks.
+
+    def create_task(self, body):
+        count = int(body.get('count') or 1)
+        task_ids = list(range(self._next_task_id, self._next_task_id + count))
+        self._next_task_id += count
+        self.created.update(task_ids)
+        return {'taskIdList': task_ids,
+                'aliasTaskIdList': ['2W{}'.format(task_id)
+                                    for task_id in task_ids],
+                'userId': self.user_id}
+
+    def submit_task(self, body):
+        task_id = int(body['taskId'])
+        if task_id not in self.created:
+            raise FarmError(604, 'Task {} does not exist.'.format(task_id))
+        if task_id in self.tasks:
+            raise FarmError(605, 'Task {} is submitted.'.format(task_id))
+        task_info = self.task_json.get(task_id, {}).get('task.json', {})
+        frames = []
+        for index in range(self.frames_per_task):
+            frames.append({'id': self._next_frame_id, 'taskId': task_id,
+                           'userId': self.user_id, 'frameIndex': str(index),
+                           'frameStatus': FRAME_WAITING, 'feeAmount': 0.0,
+                           'startTime': None, 'endTime': None})
+            self._next_frame_id += 1
+        self.frames[task_id] = frames
+        self.tasks[task_id] = {
+            'id': task_id,
+            'taskAlias': '2W{}'.format(task_id),
+            'sceneName': task_info.get('task_info', {}).get(
+                'input_cg_file', 'scene_{}.mb'.format(task_id)),
+            'taskStatus': TASK_WAITING,
+            'preTaskStatus': None,
+            'producer': body.get('producer'),
+            'userId': self.user_id,
+            'submitDate': int(time.time() * 1000),
+            'startTime': None,
+            'completedDate': None,
+            'taskUserLevel': 50,
+            'taskOverTime': None,
+            'projectName': '',
+            'labels': [],
+            'respRenderingTaskList': [],
+        }
+        self._update_counts(self.tasks[task_id])
+        return {}
+
+    def task_json_file(self, body):
+        task_id = int(body['taskId'])
+        if task_id not in self.created:
+            raise FarmError(604, 'Task {} does not exist.'.format(task_id))
+        content = body.get('content')
+        if isinstance(content, str):
+            try:
+                content = json.loads(content)
+            except ValueError:
+                pass
+        self.task_json.setdefault(task_id, {})[body.get('fileName')] = content
+        return None
+
+    def stop_task(self, body):
+        self._set_status(body, TASK_STOPPED, (FRAME_WAITING, FRAME_RENDERING),
+                         FRAME_STOPPED)
+
+    def start_task(self, body):
+        self._set_status(body, TASK_WAITING, (FRAME_STOPPED,), FRAME_WAITING)
+
+    def abandon_task(self, body):
+        self._set_status(body, TASK_ABANDONED,
+                         (FRAME_WAITING, FRAME_RENDERING), FRAME_STOPPED)
+
+    def delete_task(self, body):
+        for task_id in self._task_ids(body):
+            self._task(task_id)['isDelete'] = 1
+
+    def update_task_user_level(self, body):
+        self._task(body['taskId'])['taskUserLevel'] = int(
+            body['taskUserLevel'])
+
+    def set_task_over_time_stop(self, body):
+        for task_id in self._task_ids(body):
+            self._task(task_id)['taskOverTime'] = body.get('overTime')
+
+    def full_speed_rendering(self, body):
+        for task_id in self._task_ids(body):
+            self._task(task_id)['fullSpeed'] = 1
+
+    def _list_tasks(self, body):
+        recycle = bool(body.get('recycleFlag'))
+        statuses = set(body.get('statusList') or [])
+        keyword = body.get('searchKeyword')
+        start = _timestamp(body['startTime']) if body.get('startTime') else None
+        end = _timestamp(body['endTime']) if body.get('endTime') else None
+        tasks = []
+        # The newest tasks first, like the API.
+        for task_id in sorted(self.tasks, reverse=True):
+            task = self.tasks[task_id]
+            if bool(task.get('isDelete')) != recycle:
+                continue
+            if statuses and task['taskStatus'] not in statuses:
+                continue
+            if keyword and keyword not in task['sceneName'] and \
+                    keyword not in str(task_id):
+                continue
+            if start is not None and task['submitDate'] < start:
+                continue
+            if end is not None and task['submitDate'] > end:
+                continue
+            tasks.append(dict(task))
+        return tasks
+
+    def get_task_list(self, body):
+        return _page(self._list_tasks(body), body, self.max_page_size)
+
+    def query_task_info(self, body):
+        items = [dict(self.tasks[task_id]) for task_id in self._task_ids(body)
+                 if task_id in self.tasks]
+        page = _page(items, {'pageSize': max(len(items), 1)}, None)
+        page['userAccountConsume'] = None
+        return page
+
+    # The frames.
+
+    def query_task_frames(self, body):
+        self._task(body['taskId'])
+        frames = [dict(frame) for frame in self.frames[int(body['taskId'])]]
+        keyword = body.get('searchKeyword')
+        if keyword:
+            frames = [frame for frame in frames
+                      if keyword in frame['frameIndex']]
+        return _page(frames, body, self.max_page_size)
+
+    def query_all_frame_stats(self, body):
+        stats = {'executingFramesTotal': 0, 'doneFramesTotal': 0,
+                 'failedFramesTotal': 0, 'waitingFramesTotal': 0,
+                 'totalFrames': 0}
+        keys = {FRAME_RENDERING: 'executingFramesTotal',
+                FRAME_DONE: 'doneFramesTotal',
+                FRAME_FAILED: 'failedFramesTotal',
+                FRAME_WAITING: 'waitingFramesTotal'}
+        for frames in self.frames.values():
+            for frame in frames:
+                stats['totalFrames'] += 1
+                if frame['frameStatus'] in keys:
+                    stats[keys[frame['frameStatus']]] += 1
+        return stats
+
+    def _selected_frames(self, body):
+        frames = self.frames.get(int(body.get('taskId') or 0))
+        if frames is None:
+            raise FarmError(604, 'Task {} does not exist.'.format(
+                body.get('taskId')))
+        statuses = set(body.get('status') or [])
+        if not body.get('selectAll'):
+            ids = set(body.get('ids') or body.get('Ids') or [])
+            frames = [frame for frame in frames if frame['id'] in ids]
+        return [frame for frame in frames
+                if not statuses or frame['frameStatus'] in statuses]
+
+    def _restart(self, task_id, frames):
+        for frame in frames:
+            frame['frameStatus'] = FRAME_WAITING
+        task = self._task(task_id)
+        if frames:
+            task['taskStatus'] = TASK_WAITING
+        self._update_counts(task)
+
+    def recommit_tasks(self, body):
+        for task_id in self._task_ids(body):
+            self._task(task_id)
+            self._restart(task_id, [frame for frame in self.frames[task_id]
+                                    if frame['frameStatus'] == FRAME_FAILED])
+
+    def recommit_task_frames(self, body):
+        self._restart(body['taskId'], self._selected_frames(body))
+
+    def stop_task_frames(self, body):
+        for frame in self._selected_frames(body):
+            if frame['frameStatus'] in (FRAME_WAITING, FRAME_RENDERING):
+                frame['frameStatus'] = FRAME_STOPPED
+        self._update_counts(self._task(body['taskId']))
+
+    def load_task_process_img(self, body):
+        self._task(body['taskId'])
+        return {'block': 1, 'currentTaskType': 'Render', 'grabInfo': [],
+                'height': 1080, 'width': 1920, 'isRenderPhoton': False,
+                'sceneName': self.tasks[int(body['taskId'])]['sceneName']}
+
+    def loading_frame_thumbnail(self, body):
+        return ['/thumbnail/{}.jpg'.format(body.get('id'))]
+
+    def show_log(self, body):
+        return {'content': [], 'pageCount': 0}
+
+    # The labels.
+
+    def add_label(self, body):
+        name = body['newName']
+        if name in self.labels:
+            raise FarmError(606, 'Label {} already exists.'.format(name))
+        self.labels[name] = {'projectId': self._next_label_id,
+                             'projectName': name,
+                             'status': body.get('status', 1)}
+        self._next_label_id += 1
+
+    def delete_label(self, body):
+        if self.labels.pop(body['delName'], None) is None:
+            raise FarmError(607, 'Label {} does not exist.'.format(
+                body['delName']))
+
+    def label_list(self, body):
+        return {'projectNameList': [
+            {'projectId': label['projectId'],
+             'projectName': label['projectName']}
+            for label in self.labels.values()]}
+
+    def add_task_label(self, body):
+        label_id = self._next_label_id
+        self._next_label_id += 1
+        self.task_labels[label_id] = body['label']
+        for task_id in self._task_ids(body):
+            self._task(task_id)['labels'].append(
+                {'labelId': label_id, 'label': body['label']})
+        return {'labelId': label_id}
+
+    def delete_task_label(self, body):
+        label_ids = set(body.get('labelIds') or [])
+        for label_id in label_ids:
+            self.task_labels.pop(label_id, None)
+        for task in self.tasks.values():
+            task['labels'] = [label for label in task['labels']
+                              if label['labelId'] not in label_ids]
+
+    # The software and the render environments.
+
+    def query_software_list(self, body):
+        return {'renderInfoList': [
+            {'cgId': int(cg_id), 'cgName': name}
+            for name, cg_id in sorted(DCC_ID_MAPPINGS.items())]}
+
+    def query_software_detail(self, body):
+        cg_id = int(body['cgId'])
+        return {'cgPlugin': [
+            {'cvId': 19, 'pluginName': 'zblur', 'pluginVersions': [
+                {'pluginId': 1652, 'pluginName': 'zblur',
+                 'pluginVersion': 'zblur 2.02.019'}]}],
+            'cgVersion': [{'id': cg_id * 10 + index, 'cgId': cg_id,
+                           'cgVersion': version}
+                          for index, version in enumerate(
+                              ('2018', '2019', '2020', '2022'))]}
+
+    def query_analyse_error_detail(self, body):
+        codes = body.get('codes') or [body.get('code')]
+        return [{'id': index, 'code': str(code), 'type': 1,
+                 'languageFlag': body.get('language', 0),
+                 'desDescriptionCn': 'error {}'.format(code),
+                 'desSolutionCn': '', 'isRepair': 0, 'isOpen': 1}
+                for index, code in enumerate(codes) if code]
+
+    def hardware_config(self, body):
+        return [{'id': 9, 'status': 1, 'platform': 2, 'model': 'Default',
+                 'ram': '64GB', 'gpuNum': None, 'notSupportCgId': [],
+                 'notSupportCode': [], 'notSupportPluginList': []}]
+
+    def add_render_env(self, body):
+        name = body['editName']
+        if name in self.render_envs:
+            raise FarmError(608, 'Render env {} already exists.'.format(name))
+        self.render_envs[name] = dict(body, isDefault=0)
+        return {'editName': name}
+
+    def edit_render_env(self, body):
+        if body['editName'] not in self.render_envs:
+            raise FarmError(609, 'Render env {} does not exist.'.format(
+                body['editName']))
+        self.render_envs[body['editName']].update(body)
+
+    def delete_render_env(self, body):
+        if self.render_envs.pop(body['editName'], None) is None:
+            raise FarmError(609, 'Render env {} does not exist.'.format(
+                body['editName']))
+
+    def set_default_render_env(self, body):
+        if body['editName'] not in self.render_envs:
+            raise FarmError(609, 'Render env {} does not exist.'.format(
+                body['editName']))
+        for name, env in self.render_envs.items():
+            env['isDefault'] = int(name == body['editName'])
+
+    def get_render_env(self, body):
+        cg_ids = set(str(cg_id) for cg_id in body.get('cgIds') or [])
+        if body.get('cgId'):
+            cg_ids.add(str(body['cgId']))
+        return [dict(env) for env in self.render_envs.values()
+                if not cg_ids or str(env.get('cgId')) in cg_ids]
+
+    # The transfer.
+
+    def get_transfer_config(self, body):
+        return {'resqEngines': [], 'inputBid': '10206', 'outputBid': '20206'}
+
+    def get_server_info(self, body):
+        return {'raysyncTransfer': {'serverIp': '127.0.0.1',
+                                    'serverPort': 2121}}
+
+    def get_raysync_user_key(self, body):
+        return {'userKey': 'mock-user-key', 'platform': 2}
+
+    def get_output_files(self, body):
+        return []
+
+
+# The method of ``FarmState`` answering each route.
+_ROUTES = {
+    ApiUrl.queryPlatforms: 'query_platforms',
+    ApiUrl.queryUserProfile: 'query_user_profile',
+    ApiUrl.queryUserSetting: 'query_user_setting',
+    ApiUrl.updateUserSetting: 'update_user_setting',
+    ApiUrl.getBid: 'get_bid',
+    ApiUrl.createTask: 'create_task',
+    ApiUrl.task: 'submit_task',
+    ApiUrl.queryAnalyseErrorDetail: 'query_analyse_error_detail',
+    ApiUrl.getTaskList: 'get_task_list',
+    ApiUrl.stopTask: 'stop_task',
+    ApiUrl.startTask: 'start_task',
+    ApiUrl.abandonTask: 'abandon_task',
+    ApiUrl.deleteTask: 'delete_task',
+    ApiUrl.queryTaskFrames: 'query_task_frames',
+    ApiUrl.queryAllFrameStats: 'query_all_frame_stats',
+    ApiUrl.recommitTasks: 'recommit_tasks',
+    ApiUrl.recommitTaskFrames: 'recommit_task_frames',
+    ApiUrl.queryTaskInfo: 'query_task_info',
+    ApiUrl.add: 'add_label',
+    ApiUrl.delete: 'delete_label',
+    ApiUrl.getList: 'label_list',
+    ApiUrl.querySoftwareList: 'query_software_list',
+    ApiUrl.querySoftwareDetail: 'query_software_detail',
+    ApiUrl.addUserPluginConfig: 'add_render_env',
+    ApiUrl.editUserPluginConfig: 'edit_render_env',
+    ApiUrl.deleteUserPluginConfig: 'delete_render_env',
+    ApiUrl.setDefaultUserPluginConfig: 'set_default_render_env',
+    ApiUrl.getUserPluginConfig: 'get_render_env',
+    ApiUrl.updateTaskUserLevel: 'update_task_user_level',
+    ApiUrl.getRaySyncUserKey: 'get_raysync_user_key',
+    ApiUrl.getServerInfo: 'get_server_info',
+    ApiUrl.loadTaskProcessImg: 'load_task_process_img',
+    ApiUrl.setTaskOverTimeStop: 'set_task_over_time_stop',
+    ApiUrl.loadingFrameThumbnail: 'loading_frame_thumbnail',
+    ApiUrl.fullSpeedRendering: 'full_speed_rendering',
+    ApiUrl.taskJsonFile: 'task_json_file',
+    ApiUrl.getConfig: 'get_transfer_config',
+    ApiUrl.addTaskLabel: 'add_task_label',
+    ApiUrl.deleteTaskLabel: 'delete_task_label',
+    ApiUrl.list: 'label_list',
+    ApiUrl.getOutputUserDirFile: 'get_output_files',
+    ApiUrl.stopTaskFrames: 'stop_task_frames',
+    ApiUrl.hardwareConfig: 'hardware_config',
+    ApiUrl.showLog: 'show_log',
+}
+ROUTES = dict((url.value, method) for url, method in _ROUTES.items())
+
+
+class _FarmServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+    # Accept the connections of many clients opened at once.
+    request_queue_size = 128
+
+
+class _FarmHandler(BaseHTTPRequestHandler):
+    """Verify, delay and dispatch the requests to the farm."""
+
+    protocol_version = 'HTTP/1.1'
+    # The headers and the body are written apart, do not delay the body.
+    disable_nagle_algorithm = True
+
+    def do_POST(self):  # pylint: disable=invalid-name
+        farm = self.server.farm
+        length = int(self.headers.get('Content-Length') or 0)
+        content = self.rfile.read(length)
+        status, payload = farm.handle(self.path, self.headers, content)
+        if isinstance(payload, dict):
+            body = json.dumps(payload).encode('utf-8')
+            content_type = 'application/json'
+        else:
+            body = payload.encode('utf-8')
+            content_type = 'text/html'
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):  # pylint: disable=arguments-differ
+        pass
+
+
+class MockFarm(object):
+    """A local render farm speaking the signed protocol of the API."""
+
+    def __init__(self, access_id='test_access_id',
+                 access_key='test_access_key', host='127.0.0.1', port=0,
+                 latency=0, jitter=0, error_rate=0,
+                 error_statuses=(503,), max_page_size=None,
+                 frames_per_task=10, max_clock_skew=300, seed=None,
+                 state=None):
+        """Initialize instance.
+
+        Args:
+            access_id (str, optional): The access id accepted.
+            access_key (str, optional): The access key verifying the
+                signatures.
+            host (str, optional): The address listened.
+            port (int, optional): The port listened, a free port by default.
+            latency (float, optional): Seconds waited before answering.
+            jitter (float, optional): Random seconds added to the latency.
+            error_rate (float, optional): The probability to answer with one
+                of the ``error_statuses`` instead of handling the request.
+            error_statuses (tuple of int, optional): The transient HTTP
+                statuses answered at the ``error_rate``.
+            max_page_size (int, optional): The largest page served by the
+                list routes.
+            frames_per_task (int, optional): The frames of a submitted task.
+            max_clock_skew (int, optional): Seconds a signed timestamp may
+                differ from the local clock, None to accept any.
+            seed (int, optional): Seed the random errors and jitter.
+            state (FarmState, optional): The state of the farm.
+
+        """
+        self.access_id = access_id
+        self.access_key = access_key
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_statuses = tuple(error_statuses)
+        self.max_clock_skew = max_clock_skew
+        self.state = state or FarmState(frames_per_task=frames_per_task,
+                                        max_page_size=max_page_size)
+        self._random = random.Random(seed)
+        self._stats_lock = threading.Lock()
+        self._stats = {'requests': 0, 'injected_errors': 0,
+                       'bad_signatures': 0, 'routes': {}}
+        self._server = _FarmServer((host, port), _FarmHandler)
+        self._server.farm = self
+        self._thread = None
+
+    @property
+    def domain(self):
+        """str: The ``host:port`` to give as domain to the client."""
+        return '{}:{}'.format(*self._server.server_address)
+
+    @property
+    def stats(self):
+        """dict: The requests, injected errors, bad signatures and routes."""
+        with self._stats_lock:
+            stats = dict(self._stats)
+            stats['routes'] = dict(self._stats['routes'])
+        return stats
+
+    def advance(self, frames=1, fail_every=0):
+        """Render the next frames, see ``FarmState.advance``."""
+        self.state.advance(frames=frames, fail_every=fail_every)
+
+    def start(self):
+        """Serve in a background thread.
+
+        Returns:
+            MockFarm: The farm itself.
+
+        """
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._server.serve_forever)
+            self._thread.daemon = True
+            self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop serving and close the socket."""
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def _count(self, path, key=None):
+        with self._stats_lock:
+            self._stats['requests'] += 1
+            routes = self._stats['routes']
+            routes[path] = routes.get(path, 0) + 1
+            if key:
+                self._stats[key] += 1
+
+    def _delay(self):
+        delay = self.latency
+        if self.jitter:
+            with self._stats_lock:
+                delay += self._random.uniform(0, self.jitter)
+        if delay > 0:
+            time.sleep(delay)
+
+    def _inject_error(self):
+        if not self.error_rate:
+            return None
+        with self._stats_lock:
+            if self._random.random() >= self.error_rate:
+                return None
+            return self._random.choice(self.error_statuses)
+
+    def verify(self, path, headers, body):
+        """Check the access id, the timestamp and the signature.
+
+        Args:
+            path (str): The api url.
+            headers (dict): The request headers.
+            body (dict): The request data.
+
+        Returns:
+            bool: The request is signed by the access key.
+
+        """
+        if headers.get('accessId') != self.access_id:
+            return False
+        try:
+            timestamp = int(headers.get('UTCTimestamp'))
+        except (TypeError, ValueError):
+            return False
+        if self.max_clock_skew is not None and \
+                abs(time.time() - timestamp) > self.max_clock_skew:
+            return False
+        signed = dict((key, headers.get(key, '')) for key in SIGNED_HEADERS)
+        msg = signature.generate_headers_body_str(headers.get('Host'), path,
+                                                  signed, body)
+        expected = signature.generate_signature(self.access_key, msg)
+        return expected.decode('utf-8') == headers.get('signature')
+
+    def handle(self, path, headers, content):
+        """Answer a request.
+
+        Args:
+            path (str): The api url.
+            headers (dict or email.message.Message): The request headers.
+            content (bytes): The request body.
+
+        Returns:
+            tuple: The HTTP status and the response, a dict for the API
+                responses or a str for the transient errors.
+
+        """
+        self._delay()
+        status = self._inject_error()
+        if status:
+            self._count(path, 'injected_errors')
+            return status, '<html>Service Unavailable</html>'
+        try:
+            body = json.loads(content.decode('utf-8') or '{}')
+        except ValueError:
+            self._count(path)
+            return 200, {'code': 400, 'data': {},
+                         'message': 'The body is not json.'}
+        if not self.verify(path, headers, body):
+            self._count(path, 'bad_signatures')
+            return 200, {'code': 401, 'data': {},
+                         'message': 'Signature verification failed.'}
+        self._count(path)
+        method = ROUTES.get(path)
+        if method is None:
+            return 200, {'code': 404, 'data': {}, 'message': 'Not found.'}
+        try:
+            with self.state.lock:
+                data = getattr(self.state, method)(body)
+        except FarmError as err:
+            return 200, {'code': err.code, 'data': {},
+                         'message': err.message}
+        except (KeyError, TypeError, ValueError) as err:
+            return 200, {'code': 400, 'data': {},
+                         'message': 'Bad request: {}'.format(err)}
+        return 200, {'code': 200, 'message': 'success', 'data': data}
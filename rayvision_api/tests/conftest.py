@@ -7,9 +7,20 @@ References:
     https://docs.pytest.org/en/2.7.3/plugins.html
 
 """
+import json
 import os
 import re
 import sys
+import threading
+
+try:
+    from http.server import BaseHTTPRequestHandler
+    from http.server import HTTPServer
+    from socketserver import ThreadingMixIn
+except ImportError:  # Python 2.
+    from BaseHTTPServer import BaseHTTPRequestHandler
+    from BaseHTTPServer import HTTPServer
+    from SocketServer import ThreadingMixIn
 
 # pylint: disable=import-error
 import pytest
@@ -44,6 +55,36 @@ def mock_requests(requests_mock, user_info_dict):
     return _mock_requests
 
 
+@pytest.fixture()
+def mock_task_frames(requests_mock, user_info_dict):
+    """Simulate the paginated ``queryTaskFrames`` API.
+
+    Frame ``n`` has the frame id ``1000 + n`` and the frame index ``str(n)``.
+
+    """
+
+    def _mock_task_frames(total, page_count=True):
+        def _callback(request, context):
+            body = json.loads(request.body)
+            page_num, page_size = body['pageNum'], body['pageSize']
+            start = (page_num - 1) * page_size
+            items = [{'id': 1000 + index, 'frameIndex': str(index),
+                      'frameStatus': 4}
+                     for index in range(start, min(start + page_size, total))]
+            data = {'pageNum': page_num, 'size': page_size, 'items': items}
+            if page_count:
+                data.update(pageCount=(total + page_size - 1) // page_size,
+                            total=total)
+            return {'code': 200, 'message': 'success', 'data': data}
+
+        return requests_mock.register_uri(
+            'POST',
+            re.compile('.+{}.+queryTaskFrames'.format(user_info_dict['domain'])),
+            json=_callback)
+
+    return _mock_task_frames
+
+
 @pytest.fixture()
 def header():
     """Get the request header information."""
@@ -108,3 +149,49 @@ def check(task, tmpdir):
     else:
         os.environ["HOME"] = str(tmpdir)
     return RayvisionCheck(task)
+
+
+class _ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+    # Accept the connections of many threads opened at once.
+    request_queue_size = 128
+
+
+class _EchoHandler(BaseHTTPRequestHandler):
+    """Answer every POST with the request path, body and signature headers.
+
+    The connections are kept alive.
+
+    """
+
+    protocol_version = 'HTTP/1.1'
+    # The headers and the body are written apart, do not delay the body.
+    disable_nagle_algorithm = True
+
+    def do_POST(self):  # pylint: disable=invalid-name
+        length = int(self.headers.get('Content-Length') or 0)
+        body = json.loads(self.rfile.read(length) or b'{}')
+        headers = dict((key, self.headers.get(key)) for key in (
+            'UTCTimestamp', 'nonce', 'signature'))
+        content = json.dumps({'code': 200, 'message': 'success', 'data': {
+            'path': self.path, 'body': body, 'headers': headers}}).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, *args):  # pylint: disable=arguments-differ
+        pass
+
+
+@pytest.fixture()
+def local_server():
+    """Start a local keep-alive HTTP server, return its ``host:port``."""
+    server = _ThreadingHTTPServer(('127.0.0.1', 0), _EchoHandler)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+    yield '{}:{}'.format(*server.server_address)
+    server.shutdown()
+    server.server_close()
@@ -0,0 +1,267 @@
+"""Test the rayvision_api.aio asynchronous client against a local server."""
+
+import asyncio
+import json
+
+# pylint: disable=import-error
+import pytest
+
+aiohttp = pytest.importorskip('aiohttp')
+
+# pylint: disable=wrong-import-position
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from rayvision_api import signature
+from rayvision_api.aio import AsyncConnect
+from rayvision_api.aio import AsyncQueryOperator
+from rayvision_api.aio import AsyncRayvisionAPI
+from rayvision_api.aio import AsyncSingleFlight
+from rayvision_api.cache import ReferenceCache
+from rayvision_api.exception import RayvisionAPIError
+from rayvision_api.metrics import MetricsAggregator
+from rayvision_api.response_cache import CachePolicy
+from rayvision_api.response_cache import ResponseCache
+from rayvision_api.url import ApiUrl
+
+ACCESS_KEY = 'test_access_key'
+# The frames of this task are answered without the page count.
+PAGELESS_TASK_ID = 4321
+
+RESPONSES = {
+    '/api/render/setUp/queryUserProfile': {'userId': 100093088,
+                                           'userName': 'rayvision'},
+    '/api/render/setUp/queryUserSetting': {'taskOverTime': 12},
+    '/api/render/transfer/getBid': {'config_bid': '30201',
+                                    'input_bid': '10201'},
+    '/api/render/project/list': {'projectNameList': [
+        {'projectId': 3671, 'projectName': 'myLabel'}]},
+    '/api/render/plugin/querySoftwareList': {'renderInfoList': [
+        {'cgId': 2000}]},
+}
+
+
+async def _handler(request):
+    """Verify the signature and answer with the canned response."""
+    body = json.loads(await request.text())
+    headers = dict(request.headers)
+    msg = signature.generate_headers_body_str(
+        request.host, request.path,
+        {key: headers[key] for key in ('accessId', 'channel', 'platform',
+                                       'UTCTimestamp', 'nonce', 'version')},
+        body)
+    if signature.generate_signature(ACCESS_KEY, msg).decode() != \
+            headers['signature']:
+        return web.json_response({'code': 401, 'data': {},
+                                  'message': 'Bad signature.'})
+    if request.path == '/api/render/handle/queryTaskInfo/v2':
+        return web.json_response({'code': 200, 'message': 'success', 'data': {
+            'items': [{'id': task_id} for task_id in body['taskIds']]}})
+    if request.path == '/api/render/handle/queryTaskFrames':
+        start = (body['pageNum'] - 1) * body['pageSize']
+        items = [{'id': 1000 + index, 'frameIndex': str(index)}
+                 for index in range(start, min(start + body['pageSize'], 250))]
+        data = {'items': items}
+        if body['taskId'] != PAGELESS_TASK_ID:
+            data.update(pageCount=3, total=250)
+        return web.json_response({'code': 200, 'message': 'success',
+                                  'data': data})
+    if request.path not in RESPONSES:
+        return web.json_response({'code': 404, 'data': {},
+                                  'message': 'Not found.'})
+    return web.json_response({'code': 200, 'message': 'success',
+                              'data': RESPONSES[request.path]})
+
+
+def _run(coroutine_function):
+    """Run the coroutine function against a fresh local server."""
+
+    async def _main():
+        app = web.Application()
+        app.router.add_post('/{tail:.*}', _handler)
+        async with TestServer(app) as server:
+            domain = '{}:{}'.format(server.host, server.port)
+            return await coroutine_function(domain)
+
+    return asyncio.run(_main())
+
+
+def test_async_api_login():
+    """Test the login requests are signed and merged into the user info."""
+
+    async def _login(domain):
+        async with AsyncRayvisionAPI(access_id='test_access_id',
+                                     access_key=ACCESS_KEY,
+                                     domain=domain,
+                                     platform='2',
+                                     protocol='http') as api:
+            return api.user_info, await api.get_user_id(), \
+                await api.check_and_add_project_name('myLabel')
+
+    user_info, user_id, project_id = _run(_login)
+    assert user_info['user_id'] == user_id == 100093088
+    assert user_info['config_bid'] == '30201'
+    assert project_id == '3671'
+
+
+def test_async_many_in_flight():
+    """Test many queries can be kept in flight on one event loop."""
+
+    async def _query(domain):
+        async with AsyncConnect('test_access_id', ACCESS_KEY, 'http',
+                                domain, '2') as connect:
+            query = AsyncQueryOperator(connect)
+            return await asyncio.gather(
+                *[query.task_info([task_id]) for task_id in range(200)])
+
+    results = _run(_query)
+    assert [result['items'][0]['id'] for result in results] == list(range(200))
+
+
+def test_async_api_error():
+    """Test the error code is mapped to ``RayvisionAPIError``."""
+
+    async def _query(domain):
+        async with AsyncConnect('test_access_id', ACCESS_KEY, 'http',
+                                domain, '2') as connect:
+            await AsyncQueryOperator(connect).platforms()
+
+    with pytest.raises(RayvisionAPIError) as err:
+        _run(_query)
+    assert 'Not found.' in str(err.value)
+
+
+@pytest.mark.parametrize('concurrency', [None, 3])
+@pytest.mark.parametrize('task_id', [1234, PAGELESS_TASK_ID])
+def test_async_get_all_frames(concurrency, task_id):
+    """Test the frame pages are merged in order."""
+
+    async def _frames(domain):
+        async with AsyncConnect('test_access_id', ACCESS_KEY, 'http',
+                                domain, '2') as connect:
+            return await AsyncQueryOperator(connect).get_all_frames(
+                task_id, concurrency=concurrency)
+
+    assert list(_run(_frames)) == [str(index) for index in range(250)]
+
+
+def test_async_task_info_bulk():
+    """Test the bulk task details are chunked and merged."""
+
+    async def _query(domain):
+        async with AsyncConnect('test_access_id', ACCESS_KEY, 'http',
+                                domain, '2') as connect:
+            return await AsyncQueryOperator(connect).task_info_bulk(
+                list(range(120)) * 2, chunk_size=50, concurrency=2)
+
+    assert list(_run(_query)) == list(range(120))
+
+
+def test_async_reference_cache():
+    """Test the awaited reference data is cached."""
+
+    async def _query(domain):
+        cache = ReferenceCache()
+        async with AsyncConnect('test_access_id', ACCESS_KEY, 'http', domain,
+                                '2', reference_cache=cache) as connect:
+            query = AsyncQueryOperator(connect)
+            first = await query.supported_software()
+            first['renderInfoList'].append('changed')
+            second = await query.supported_software()
+            return first, second, cache.stats
+
+    first, second, stats = _run(_query)
+    assert second == {'renderInfoList': [{'cgId': 2000}]}
+    assert first != second
+    assert (stats['hits'], stats['misses'], stats['size']) == (1, 1, 1)
+
+
+def test_async_instrumentation():
+    """Test the asynchronous requests are measured."""
+
+    async def _query(domain):
+        metrics = MetricsAggregator()
+        async with AsyncConnect('test_access_id', ACCESS_KEY, 'http', domain,
+                                '2', instrumentation=metrics) as connect:
+            query = AsyncQueryOperator(connect)
+            await query.supported_software()
+            with pytest.raises(RayvisionAPIError):
+                await query.platforms()
+        return metrics.snapshot()
+
+    snapshot = _run(_query)
+    software = snapshot['/api/render/plugin/querySoftwareList']
+    assert software['codes'] == {200: 1}
+    assert software['response_bytes'] > 0
+    assert software['phases']['network']['count'] == 1
+    assert snapshot['/api/render/common/queryPlatforms']['codes'] == {404: 1}
+
+
+def test_async_response_cache():
+    """Test the asynchronous responses are cached."""
+
+    async def _query(domain):
+        cache = ResponseCache({ApiUrl.querySoftwareList: CachePolicy(),
+                               ApiUrl.queryPlatforms: CachePolicy()})
+        async with AsyncConnect('test_access_id', ACCESS_KEY, 'http', domain,
+                                '2', response_cache=cache) as connect:
+            query = AsyncQueryOperator(connect)
+            results = [await query.supported_software() for _ in range(3)]
+            with pytest.raises(RayvisionAPIError):
+                await query.platforms()
+            return results, cache.stats
+
+    results, stats = _run(_query)
+    assert results == [{'renderInfoList': [{'cgId': 2000}]}] * 3
+    assert (stats['hits'], stats['misses'], stats['size']) == (2, 2, 1)
+
+
+def test_async_single_flight():
+    """Test the identical coroutines in flight share one request."""
+
+    async def _query(domain):
+        metrics = MetricsAggregator()
+        flight = AsyncSingleFlight()
+        async with AsyncConnect('test_access_id', ACCESS_KEY, 'http', domain,
+                                '2', instrumentation=metrics,
+                                single_flight=flight) as connect:
+            query = AsyncQueryOperator(connect)
+            first = asyncio.ensure_future(query.task_info([1]))
+            await asyncio.sleep(0)
+            first.cancel()
+            results = await asyncio.gather(
+                *[query.task_info([1]) for _ in range(50)])
+            results[0]['items'].append('changed')
+        calls = metrics.snapshot()['/api/render/handle/queryTaskInfo/v2']
+        return results, calls['calls'], flight.stats
+
+    results, calls, stats = _run(_query)
+    assert calls == 1
+    assert results[1:] == [{'items': [{'id': 1}]}] * 49
+    assert stats == {'requests': 1, 'coalesced': 50, 'in_flight': 0}
+
+
+def test_async_single_flight_leader_mutation(user_info_dict):
+    """Test the waiting coroutines never see the changes of the first one."""
+
+    async def _query():
+        flight = AsyncSingleFlight()
+        connect = AsyncConnect(**user_info_dict)
+        followers = []
+
+        async def _lead():
+            followers.extend(asyncio.ensure_future(flight.call(
+                connect, '/api/render/handle/queryTaskInfo/v2', {}, None))
+                             for _ in range(5))
+            await asyncio.sleep(0)
+            return {'items': [{'id': 1}]}
+
+        result = await flight.call(
+            connect, '/api/render/handle/queryTaskInfo/v2', {}, _lead)
+        # The followers resume after the first caller.
+        result['items'].append('changed')
+        return await asyncio.gather(*followers), flight.stats
+
+    results, stats = asyncio.run(_query())
+    assert results == [{'items': [{'id': 1}]}] * 5
+    assert stats == {'requests': 1, 'coalesced': 5, 'in_flight': 0}
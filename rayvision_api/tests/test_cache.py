@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+"""Test the reference data cache."""
+
+import re
+import threading
+
+# pylint: disable=import-error
+import pytest
+
+from rayvision_api.cache import ReferenceCache
+from rayvision_api.cache import scoped_cache
+from rayvision_api.connect import Connect
+from rayvision_api.operators import QueryOperator
+from rayvision_api.operators import UserOperator
+
+
+@pytest.fixture(name='clock')
+def fixture_clock():
+    """Get a controllable clock."""
+    return [1000]
+
+
+@pytest.fixture(name='cache')
+def fixture_cache(clock):
+    """Get a small reference cache."""
+    return ReferenceCache(maxsize=2, ttl=60, clock=lambda: clock[0])
+
+
+def test_ttl(cache, clock):
+    """Test the entries expire."""
+    cache.set('a', {'value': 1})
+    assert cache.get('a') == (True, {'value': 1})
+    clock[0] += 60
+    assert cache.get('a') == (False, None)
+    assert cache.stats == {'hits': 1, 'misses': 1, 'evictions': 0, 'size': 0}
+
+
+def test_lru(cache):
+    """Test the least recently used entry is evicted."""
+    cache.set('a', 1)
+    cache.set('b', 2)
+    cache.get('a')
+    cache.set('c', 3)
+    assert cache.get('b') == (False, None)
+    assert cache.get('a') == (True, 1)
+    assert cache.get('c') == (True, 3)
+    assert cache.stats['evictions'] == 1
+
+
+def test_values_are_copied(cache):
+    """Test the callers can not modify the cached values."""
+    value = {'items': [1]}
+    cache.set('a', value)
+    value['items'].append(2)
+    cache.get('a')[1]['items'].append(3)
+    assert cache.get('a')[1] == {'items': [1]}
+
+
+def test_persistence(tmpdir, clock):
+    """Test the entries are loaded by another cache until they expire."""
+    path = str(tmpdir.join('cache', 'reference.json'))
+    ReferenceCache(path=path, clock=lambda: clock[0],
+                   save_delay=0).set('a', [1])
+    assert ReferenceCache(path=path, clock=lambda: clock[0]).get('a') == (
+        True, [1])
+    clock[0] += 3600
+    assert len(ReferenceCache(path=path, clock=lambda: clock[0])) == 0
+
+
+def test_delayed_save(tmpdir, monkeypatch):
+    """Test the changes made during the save delay are saved at once."""
+    writes = []
+    monkeypatch.setattr('rayvision_api.cache.write_json_atomic',
+                        lambda path, data: writes.append(data))
+    cache = ReferenceCache(path=str(tmpdir.join('reference.json')),
+                           save_delay=60)
+    for index in range(100):
+        cache.set(str(index), index)
+    cache.invalidate()
+    cache.set('a', 1)
+    assert writes == []
+    cache.save()
+    cache.save()
+    assert len(writes) == 1
+    assert [key for key, _, _ in writes[0]['entries']] == ['a']
+
+
+def test_scoped_by_connect(user_info_dict, requests_mock):
+    """Test the accounts and platforms sharing a cache get their entries."""
+    cache = ReferenceCache()
+    matcher = requests_mock.register_uri(
+        'POST', re.compile('.+hardwareConfig/list'),
+        json={'code': 200, 'data': [{'modelId': 1}]})
+    for kwargs in ({}, {}, {'platform': '6'}, {'access_id': 'other'}):
+        connect = Connect(reference_cache=cache,
+                          **dict(user_info_dict, **kwargs))
+        UserOperator(connect).get_hardware_config()
+    assert matcher.call_count == 3
+    assert len(cache) == 3
+
+
+def test_scoped_cache(user_info_dict, requests_mock):
+    """Test a scoped cache is only used by the current thread."""
+    matcher = requests_mock.register_uri(
+        'POST', re.compile('.+hardwareConfig/list'),
+        json={'code': 200, 'data': [{'modelId': 1}]})
+    connect = Connect(**user_info_dict)
+    user = UserOperator(connect)
+    cache = ReferenceCache()
+    with scoped_cache(connect, cache):
+        user.get_hardware_config()
+        user.get_hardware_config()
+        thread = threading.Thread(target=user.get_hardware_config)
+        thread.start()
+        thread.join()
+    user.get_hardware_config()
+    assert connect.reference_cache is None
+    assert matcher.call_count == 3
+    assert len(cache) == 1
+
+
+def test_cached_operators(user_info_dict, requests_mock):
+    """Test the reference data is requested once until invalidated."""
+    cache = ReferenceCache()
+    connect = Connect(reference_cache=cache, **user_info_dict)
+    query = QueryOperator(connect)
+    user = UserOperator(connect)
+    software = requests_mock.register_uri(
+        'POST', re.compile('.+querySoftwareDetail'),
+        json={'code': 200, 'data': {'cgVersion': []}})
+    hardware = requests_mock.register_uri(
+        'POST', re.compile('.+hardwareConfig/list'),
+        json={'code': 200, 'data': [{'modelId': 1}]})
+    for _ in range(3):
+        assert query.supported_plugin('maya', 'linux') == {'cgVersion': []}
+        assert user.get_hardware_config() == [{'modelId': 1}]
+    query.supported_plugin('houdini', 'linux')
+    assert software.call_count == 2
+    assert hardware.call_count == 1
+
+    cache.invalidate('supported_plugin')
+    query.supported_plugin('maya', 'linux')
+    user.get_hardware_config()
+    assert software.call_count == 3
+    assert hardware.call_count == 1
+
+
+def test_cache_disabled(rayvision_connect, requests_mock):
+    """Test the responses are not cached without a reference cache."""
+    matcher = requests_mock.register_uri(
+        'POST', re.compile('.+querySoftwareList'),
+        json={'code': 200, 'data': {'renderInfoList': []}})
+    query = QueryOperator(rayvision_connect)
+    query.supported_software()
+    query.supported_software()
+    assert matcher.call_count == 2
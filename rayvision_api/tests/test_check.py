@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+"""Test the rayvision_api.task.check functions."""
+
+import json
+import re
+
+from rayvision_api.connect import Connect
+from rayvision_api.operators import QueryOperator
+from rayvision_api.task.check import RayvisionCheck
+
+
+class _API(object):
+    """The operators used by the check."""
+
+    def __init__(self, connect):
+        self.query = QueryOperator(connect)
+
+
+def test_check_error_warn_info(user_info_dict, requests_mock, tmpdir):
+    """Test the error details of all the tips are requested at once."""
+    matcher = requests_mock.register_uri(
+        'POST', re.compile('.+queryAnalyseErrorDetail'),
+        json={'code': 200, 'data': [{'code': '15000', 'type': 1},
+                                    {'code': '10010', 'type': 0}]})
+    check = RayvisionCheck(_API(Connect(**user_info_dict)),
+                           workspace=str(tmpdir))
+    check.tips_info = {'15000': ['scene.ma'], 10010: ['texture.png'],
+                       '20000': []}
+    infos = check.check_error_warn_info()
+    assert matcher.call_count == 1
+    assert sorted(matcher.last_request.json()['codes']) == [
+        '10010', '15000', '20000']
+    assert check.errors_number == 1
+    assert sorted((info['code'], info['details']) for info in infos) == [
+        ('10010', ['texture.png']), ('15000', ['scene.ma'])]
+
+
+class _FakeAPI(object):
+    """The API answers used by ``RayvisionCheck.execute``."""
+
+    platform = '2'
+
+    def __init__(self, connect):
+        self._connect = connect
+        self.query = self
+        self.user = self
+        self.task = self
+
+    @staticmethod
+    def supported_plugin(name):
+        return {'cgVersion': [{'id': 1, 'cgVersion': '2018'}]}
+
+    @staticmethod
+    def error_detail_by_code(codes, language=0):
+        return dict((str(code), [{'code': str(code), 'type': 0}])
+                    for code in codes)
+
+    @staticmethod
+    def get_hardware_catalog():
+        from rayvision_api.task.hardware import HardwareCatalog
+        return HardwareCatalog([{
+            'id': 7, 'status': 1, 'platform': 2, 'model': 'Default',
+            'ram': '64GB', 'gpuNum': None, 'notSupportCgId': [],
+            'notSupportCode': [], 'notSupportPluginList': []}])
+
+    @staticmethod
+    def _generate_task_id():
+        return 1234
+
+    @staticmethod
+    def get_user_id():
+        return 42
+
+
+def _task_json():
+    return {
+        'task_info': {'cg_id': '2000', 'task_id': '', 'user_id': '',
+                      'project_id': '', 'hardwareConfigId': '', 'ram': '',
+                      'graphics_cards_num': '', 'frames_per_task': 1},
+        'software_config': {'cg_name': 'Maya', 'cg_version': '2018',
+                            'plugins': {}},
+        'scene_info': {'defaultRenderLayer': {'renderable': '1'}},
+    }
+
+
+def test_execute_in_memory(user_info_dict, tmpdir):
+    """Test the in memory check gives the file check result without I/O."""
+    hardware = {'model': 'Default', 'ram': '64GB', 'gpuNum': None}
+    api = _FakeAPI(Connect(**user_info_dict))
+    workspace = tmpdir.mkdir('workspace')
+    task_path = workspace.join('task.json')
+    task_path.write(json.dumps(_task_json()))
+    expected = RayvisionCheck(api, workspace=str(workspace)).execute(
+        hardware, str(task_path), only_id=False)
+
+    memory_workspace = tmpdir.mkdir('memory')
+    check = RayvisionCheck(api, workspace=str(memory_workspace))
+    task_info, task_id = check.execute(hardware, _task_json(), only_id=False,
+                                       in_memory=True)
+    assert (task_info, task_id) == expected
+    assert task_info['task_info']['hardwareConfigId'] == '7'
+    assert memory_workspace.listdir() == []
+
+    folder = check.write_json_files()
+    assert folder == str(memory_workspace)
+    assert json.loads(memory_workspace.join('task.json').read()) == task_info
@@ -1,5 +1,10 @@
 """Test the rayvison_api.rayvision_connect functions."""
 
+import logging
+
+# pylint: disable=import-error
+import pytest
+
 
 def test_headers(rayvision_connect):
     """Test we can get correct requests headers."""
@@ -14,3 +19,39 @@ def test_headers(rayvision_connect):
 
     assert rayvision_connect.headers['accessId'] == 'test_access_id'
     assert rayvision_connect.headers['version'] == 'dev'
+
+
+def test_headers_changed(rayvision_connect, mock_requests, requests_mock):
+    """Test the changes of the headers are sent with the next requests."""
+    rayvision_connect.headers['X-Trace'] = 'abc'
+    mock_requests({'data': {'items': []}})
+    rayvision_connect.post(rayvision_connect.url.queryTaskInfo,
+                           {'taskIds': [1]})
+    assert requests_mock.last_request.headers['X-Trace'] == 'abc'
+
+
+@pytest.mark.parametrize('json_backend', ['json', 'auto'])
+def test_post_body_serialized_once(user_info_dict, mock_requests,
+                                   requests_mock, json_backend):
+    """Test the body is sent as bytes with the selected json backend."""
+    from rayvision_api.connect import Connect
+    connect = Connect(json_backend=json_backend, **user_info_dict)
+    mock_requests({'data': {'items': []}})
+    assert connect.post(connect.url.queryTaskInfo,
+                        {'taskIds': [1]}) == {'items': []}
+    request = requests_mock.last_request
+    assert isinstance(request.body, bytes)
+    assert request.json() == {'taskIds': [1]}
+
+
+def test_debug_formatting_skipped(rayvision_connect, mock_requests,
+                                  monkeypatch):
+    """Test the headers are not formatted when DEBUG is disabled."""
+    calls = []
+    monkeypatch.setattr('rayvision_api.connect.pformat', calls.append)
+    rayvision_connect.logger = logging.getLogger('test_connect')
+    rayvision_connect.logger.setLevel(logging.INFO)
+    mock_requests({'data': {}})
+    rayvision_connect.post(rayvision_connect.url.queryTaskInfo,
+                           {'taskIds': [1]})
+    assert calls == []
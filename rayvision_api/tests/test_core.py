@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+"""Test the rayvision_api.core functions."""
+
+import json
+import logging
+import re
+import threading
+
+# pylint: disable=import-error
+import pytest
+
+from rayvision_api import RayvisionAPI
+from rayvision_api.cache import ReferenceCache
+from rayvision_api.exception import RayvisionError
+
+
+@pytest.fixture(name='farm')
+def fixture_farm(requests_mock, user_info_dict):
+    """Simulate the APIs used by the submissions."""
+    state = {'next_id': 5000, 'calls': {}, 'submitted': [], 'uploaded': []}
+    lock = threading.Lock()
+
+    def _register(name, data):
+        def _callback(request, context):
+            with lock:
+                state['calls'][name] = state['calls'].get(name, 0) + 1
+                body = json.loads(request.body) if request.body else {}
+                result = data(body) if callable(data) else data
+            return {'code': 200, 'message': 'success', 'data': result}
+
+        requests_mock.register_uri(
+            'POST', re.compile('.+{}.+/{}$'.format(user_info_dict['domain'],
+                                                   name)), json=_callback)
+
+    def _create_task(body):
+        start = state['next_id']
+        state['next_id'] += body['count']
+        return {'taskIdList': list(range(start, start + body['count']))}
+
+    _register('createTask', _create_task)
+    _register('queryUserProfile', {'userId': 42})
+    _register('queryUserSetting', {})
+    _register('getBid', {})
+    _register('list', {'projectNameList': [
+        {'projectName': 'shots', 'projectId': 7}]})
+    _register('querySoftwareDetail', {'cgVersion': [
+        {'id': 1, 'cgVersion': '2018'}]})
+    _register('hardwareConfig/list', [{
+        'id': 9, 'status': 1, 'platform': 2, 'model': 'Default',
+        'ram': '64GB', 'gpuNum': None, 'notSupportCgId': [],
+        'notSupportCode': [], 'notSupportPluginList': []}])
+    _register('taskJsonFile', lambda body: state['uploaded'].append(
+        body['taskId']))
+    _register('task', lambda body: state['submitted'].append(body['taskId']))
+    return state
+
+
+def _task_info(cg_version='2018'):
+    return {
+        'task_info': {'cg_id': '2000', 'task_id': '', 'user_id': '',
+                      'project_id': '', 'project_name': 'shots',
+                      'hardwareConfigId': '', 'ram': '',
+                      'graphics_cards_num': ''},
+        'software_config': {'cg_name': 'Maya', 'cg_version': cg_version,
+                            'plugins': {}},
+        'scene_info': {'defaultRenderLayer': {'renderable': '1'}},
+    }
+
+
+def test_submit_many(farm, user_info_dict):
+    """Test the ids are created in blocks and a failure is isolated."""
+    api = RayvisionAPI(access_id=user_info_dict['access_id'],
+                       access_key=user_info_dict['access_key'],
+                       domain=user_info_dict['domain'],
+                       platform=user_info_dict['platform'],
+                       logger=logging.getLogger(__name__), lazy_login=True)
+    task_infos = [_task_info() for _ in range(9)]
+    task_infos[4] = _task_info(cg_version='2099')
+    results = api.submit_many(task_infos, {'model': 'Default', 'ram': '64GB',
+                                           'gpuNum': None},
+                              concurrency=3, id_block_size=4)
+
+    assert [result.task_id for result in results] == list(range(5000, 5009))
+    assert isinstance(results[4].error, RayvisionError)
+    assert [result.error for result in results[:4] + results[5:]] == [None] * 8
+    assert results[0].task_info['task_info']['hardwareConfigId'] == '9'
+    assert results[0].task_info['task_info']['project_id'] == '7'
+    assert results[0].task_info['task_info']['user_id'] == '42'
+    assert sorted(farm['submitted']) == [5000, 5001, 5002, 5003, 5005, 5006,
+                                         5007, 5008]
+    assert farm['calls']['createTask'] == 3
+    assert farm['calls']['queryUserProfile'] == 1
+    assert farm['calls']['list'] == 1
+    assert farm['calls']['querySoftwareDetail'] == 1
+    assert farm['calls']['hardwareConfig/list'] == 1
+    assert api.connect.reference_cache is None
+
+
+def test_submit_many_connect_cache(farm, user_info_dict):
+    """Test the cache of the connect is used and kept by the batch."""
+    cache = ReferenceCache()
+    api = RayvisionAPI(access_id=user_info_dict['access_id'],
+                       access_key=user_info_dict['access_key'],
+                       domain=user_info_dict['domain'],
+                       platform=user_info_dict['platform'],
+                       logger=logging.getLogger(__name__), lazy_login=True,
+                       reference_cache=cache)
+    results = api.submit_many([_task_info() for _ in range(3)],
+                              {'model': 'Default', 'ram': '64GB',
+                               'gpuNum': None}, concurrency=3)
+    assert [result.error for result in results] == [None] * 3
+    assert api.connect.reference_cache is cache
+    assert farm['calls']['querySoftwareDetail'] == 1
+    assert len(cache) == 2
+
+
+def test_submit_many_malformed(farm, user_info_dict):
+    """Test a malformed task fails alone and the ids of the failed tasks are
+    given back to the pool."""
+    api = RayvisionAPI(access_id=user_info_dict['access_id'],
+                       access_key=user_info_dict['access_key'],
+                       domain=user_info_dict['domain'],
+                       platform=user_info_dict['platform'],
+                       logger=logging.getLogger(__name__), lazy_login=True)
+    pool = api.task.enable_id_pool(batch_size=4, low_water=0,
+                                   background=False)
+    task_infos = [_task_info(), {'software_config': {}}, 'task.json',
+                  {'task_info': None}, _task_info()]
+    task_infos[4]['task_info']['project_name'] = 'missing'
+    results = api.submit_many(task_infos, {'model': 'Default', 'ram': '64GB',
+                                           'gpuNum': None})
+    assert results[0].error is None
+    assert all(isinstance(result.error, RayvisionError)
+               for result in results[1:4])
+    assert results[4].error is not None
+    assert results[4].task_id is None
+    assert farm['submitted'] == [results[0].task_id]
+    assert api.task.close_id_pool() == [5001, 5002, 5003]
+    assert pool.stats['issued'] == 1
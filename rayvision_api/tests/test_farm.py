@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+"""Test the client against the local mock render farm."""
+
+import logging
+
+# pylint: disable=import-error
+import pytest
+
+from rayvision_api import RayvisionAPI
+from rayvision_api.exception import RayvisionAPIError
+from rayvision_api.retry import RetryPolicy
+from rayvision_api.testing import MockFarm
+from rayvision_api.testing.farm import FRAME_FAILED
+from rayvision_api.testing.farm import ROUTES
+from rayvision_api.testing.farm import TASK_DONE
+from rayvision_api.testing.farm import TASK_FAILED
+from rayvision_api.testing.farm import TASK_STOPPED
+from rayvision_api.url import ApiUrl
+
+
+@pytest.fixture(name='farm')
+def fixture_farm():
+    """Serve a farm paginating by 4."""
+    with MockFarm(max_page_size=4, frames_per_task=6) as farm:
+        yield farm
+
+
+def _api(farm, **kwargs):
+    return RayvisionAPI(access_id=farm.access_id, access_key=farm.access_key,
+                        domain=farm.domain, platform='2', protocol='http',
+                        logger=logging.getLogger(__name__), **kwargs)
+
+
+def _submit(api, count):
+    task_ids = api.task.create_task(count=count)['taskIdList']
+    for task_id in task_ids:
+        api.transmit.upload_json_content(task_id, '{"task_info": {}}')
+        api.task.submit_task(task_id)
+    return task_ids
+
+
+def test_every_route():
+    """Test every api url is answered."""
+    assert sorted(ROUTES) == sorted(url.value for url in ApiUrl)
+
+
+def test_tasks_and_frames(farm):
+    """Test the task and frame state through the client."""
+    api = _api(farm)
+    assert api.user_info['user_id'] == farm.state.user_id
+    task_ids = _submit(api, 10)
+    task_list = api.query.get_task_list(page_size=100)
+    assert (task_list['pageCount'], task_list['size']) == (3, 4)
+    assert [task['id'] for task in task_list['items']] == task_ids[::-1][:4]
+
+    farm.advance(frames=6, fail_every=3)
+    frames = api.query.get_all_frames(task_ids[0], page_size=100,
+                                      concurrency=2)
+    assert sorted(frames) == [str(index) for index in range(6)]
+    info = api.query.task_info([task_ids[0]])['items'][0]
+    assert info['taskStatus'] == TASK_FAILED
+    assert info['failedFrames'] == 2
+
+    api.query.restart_failed_frames([task_ids[0]])
+    farm.advance(frames=6)
+    info = api.query.task_info([task_ids[0]])['items'][0]
+    assert info['taskStatus'] == TASK_DONE
+    assert all(frame['frameStatus'] != FRAME_FAILED
+               for frame in farm.state.frames[task_ids[0]])
+
+    api.task.stop_task([task_ids[1]])
+    assert api.query.get_task_list(status_list=[TASK_STOPPED])['items'][0][
+        'id'] == task_ids[1]
+
+
+def test_labels(farm):
+    """Test the labels are kept."""
+    api = _api(farm)
+    api.tag.add_label('shots')
+    with pytest.raises(RayvisionAPIError) as err:
+        api.tag.add_label('shots')
+    assert err.value.error_code == 606
+    assert api.check_and_add_project_name('shots') == '1'
+    assert [label['projectName'] for label in api.tag.get_project_list()] == [
+        'shots']
+
+
+def test_bad_signature(farm):
+    """Test a request signed by another key is refused."""
+    with pytest.raises(RayvisionAPIError) as err:
+        RayvisionAPI(access_id=farm.access_id, access_key='wrong',
+                     domain=farm.domain, platform='2', protocol='http',
+                     logger=logging.getLogger(__name__))
+    assert err.value.error_code == 401
+    assert farm.stats['bad_signatures'] >= 1
+
+
+def test_injected_errors_retried():
+    """Test the transient errors of the farm are retried by the client."""
+    policy = RetryPolicy(max_attempts=10, backoff=0, max_backoff=0)
+    with MockFarm(error_rate=0.3, seed=1) as farm:
+        api = _api(farm, retry_policy=policy)
+        task_ids = _submit(api, 5)
+        assert len(api.query.task_info_bulk(task_ids)) == 5
+    assert farm.stats['injected_errors'] > 0
+    assert policy.stats['retries'] == farm.stats['injected_errors']
+
+
+def test_submit_by_data(farm):
+    """Test a task is checked in memory, uploaded and submitted."""
+    api = _api(farm)
+    task_info = {
+        'task_info': {'cg_id': '2000', 'task_id': '', 'user_id': '',
+                      'project_id': '', 'project_name': '',
+                      'hardwareConfigId': '', 'ram': '',
+                      'graphics_cards_num': '', 'frames_per_task': '1',
+                      'input_cg_file': 'scene.mb'},
+        'software_config': {'cg_name': 'Maya', 'cg_version': '2018',
+                            'plugins': {}},
+        'scene_info': {},
+    }
+    assert api.submit_by_data(task_info, {'model': 'Default',
+                                          'ram': '64GB', 'gpuNum': None})
+    (task_id, task), = farm.state.tasks.items()
+    assert task['sceneName'] == 'scene.mb'
+    assert farm.state.task_json[task_id]['task.json']['task_info'][
+        'task_id'] == str(task_id)
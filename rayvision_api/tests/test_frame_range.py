@@ -0,0 +1,81 @@
+"""Test the rayvision_api.frame_range functions."""
+
+# pylint: disable=import-error
+import pytest
+
+from rayvision_api.frame_range import FrameSpec
+from rayvision_api.frame_range import index_frames
+
+
+@pytest.mark.parametrize('specs,frames', [
+    (['2-4[1]', '10'], [2, 3, 4, 10]),
+    ('1-10[3],5', [1, 4, 5, 7, 10]),
+    (['1-3', '2-6', '8'], [1, 2, 3, 4, 5, 6, 8]),
+    (['0-20[10]', '5-12[5]', '3-11'], [0, 3, 4, 5, 6, 7, 8, 9, 10, 11, 20]),
+    ('-2-1', [-2, -1, 0, 1]),
+    ([7], [7]),
+    (['1-10[3]', '4-7', '20-30[5]'], [1, 4, 5, 6, 7, 10, 20, 25, 30]),
+])
+def test_frame_spec(specs, frames):
+    """Test the expressions are expanded with the correct semantics."""
+    spec = FrameSpec(specs)
+    assert list(spec) == frames
+    assert len(spec) == len(frames)
+    assert all(str(frame) in spec for frame in frames)
+
+
+def test_frame_spec_membership():
+    """Test frames out of the ranges and non-numeric indexes."""
+    spec = FrameSpec(['1-100000[2]'])
+    assert len(spec) == 50000
+    assert 99999 in spec
+    assert 100000 not in spec
+    assert '0-1' not in spec
+
+
+def test_frame_spec_long_stepped_range():
+    """Test a long stepped range is matched without being expanded."""
+    spec = FrameSpec(['1-100000000[2]', '10-20'])
+    assert len(spec) == 50000006
+    assert 99999999 in spec
+    assert 12 in spec
+    assert 100000000 not in spec
+    assert list(zip(range(5), spec)) == list(enumerate([1, 3, 5, 7, 9]))
+
+
+@pytest.mark.parametrize('specs', ['5-2', '1-5[0]'])
+def test_frame_spec_invalid(specs):
+    """Test the invalid ranges raise a ``ValueError``."""
+    with pytest.raises(ValueError):
+        FrameSpec(specs)
+
+
+def test_select_stops_early():
+    """Test the frames are selected once and the stream stops early."""
+    consumed = []
+
+    def _frames():
+        for index in ['photon', '1', '2', '3', '3', '4', '5']:
+            consumed.append(index)
+            yield {'frameIndex': index}
+
+    selected = FrameSpec(['1-3', 'photon']).select(_frames())
+    assert [per['frameIndex'] for per in selected] == ['photon', '1', '2', '3']
+    assert consumed == ['photon', '1', '2', '3']
+
+
+def test_select_block_frames():
+    """Test the block frames matching the tokens do not stop the stream."""
+    frames = [{'frameIndex': index} for index in ['1-3', '1', '2', '3', '4']]
+    selected = FrameSpec(['1-3', '1']).select(iter(frames))
+    assert [per['frameIndex'] for per in selected] == ['1-3', '1', '2', '3']
+    selected = FrameSpec(['photon', '0-1[2]x']).select(iter(
+        [{'frameIndex': 'photon'}, {'frameIndex': '0-1[2]x'},
+         {'frameIndex': '1'}]))
+    assert [per['frameIndex'] for per in selected] == ['photon', '0-1[2]x']
+
+
+def test_index_frames():
+    """Test the frames are keyed by their numeric frame."""
+    indexed = index_frames([{'frameIndex': '12'}, {'frameIndex': 'photon'}])
+    assert list(indexed) == [12]
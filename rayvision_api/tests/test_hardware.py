@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+"""Test the hardware catalog against the previous linear matching."""
+
+import random
+import re
+
+# pylint: disable=import-error
+import pytest
+
+from rayvision_api.exception import HardwareConfigIdError
+from rayvision_api.exception import NotSupportCGSoftwareError
+from rayvision_api.exception import NotSupportHardwareCodeError
+from rayvision_api.exception import NotSupportPluginError
+from rayvision_api.operators import UserOperator
+from rayvision_api.task.hardware import HardwareCatalog
+
+
+def _legacy_match(hardware_config_list, custom_hardware, platform, cg_id,
+                  plugins, tips_info):
+    """The matching of ``set_custom_hardware`` before the catalog."""
+    check_keys = ['model', 'ram', 'gpuNum']
+    hardware_id = ''
+    exist_not_support_code = False
+    allow_hardware_config = []
+    for one_hardware_config in hardware_config_list:
+        if not one_hardware_config['status']:
+            continue
+        not_support_cgid = one_hardware_config['notSupportCgId']
+        if not_support_cgid and cg_id in not_support_cgid:
+            if all(map(lambda key: custom_hardware[key] == one_hardware_config[key], check_keys)):
+                raise NotSupportCGSoftwareError
+        not_support_code = one_hardware_config['notSupportCode']
+        not_support_code_list = [item for item in tips_info.keys() if item in not_support_code]
+        if (len(not_support_code_list) > 0) and (custom_hardware["model"] == one_hardware_config["model"]):
+            exist_not_support_code = True
+            continue
+        if one_hardware_config['platform'] != int(platform):
+            continue
+        if len(not_support_code_list) == 0:
+            allow_hardware_config.append(str({'model': one_hardware_config["model"], 'ram': one_hardware_config["ram"],
+                                              'gpuNum': one_hardware_config["gpuNum"]}))
+        if not all(map(lambda key: custom_hardware[key] == one_hardware_config[key], check_keys)):
+            continue
+        not_support_plugin_list = one_hardware_config['notSupportPluginList']
+        if not_support_plugin_list:
+            for plugin_str in not_support_plugin_list:
+                new_plugin_str = plugin_str.replace("(", "").replace(")", "")
+                for plugin_name, plugin_ver in plugins.items():
+                    plugin_data = "%s %s" % (plugin_name, plugin_ver)
+                    re_result = re.findall(new_plugin_str, plugin_data, re.I)
+                    if re_result and re_result[0]:
+                        raise NotSupportPluginError(1000000, "%s is not support %s%s" % (custom_hardware, plugin_name, plugin_ver))
+        hardware_id = str(one_hardware_config.get('id', ""))
+    if exist_not_support_code:
+        raise NotSupportHardwareCodeError(1000000, "It was detected that the rendering file does not match the hardware settings, please choose from the following options:%s" % ",".join(
+            allow_hardware_config))
+    if not hardware_id:
+        raise HardwareConfigIdError(1000000, "Allowed Hardware Configuration Information:%s" % ",".join(
+            allow_hardware_config))
+    return hardware_id
+
+
+def _outcome(func, *args):
+    try:
+        return 'id', func(*args)
+    except (NotSupportCGSoftwareError, NotSupportPluginError,
+            NotSupportHardwareCodeError, HardwareConfigIdError) as err:
+        return type(err).__name__, getattr(err, 'error', None)
+
+
+def _random_config(rand, config_id):
+    return {
+        'id': config_id,
+        'status': rand.choice([0, 1, 1, 1]),
+        'platform': rand.choice([2, 21]),
+        'model': rand.choice(['Default', '1080Ti', '2080Ti']),
+        'ram': rand.choice(['64GB', '128GB']),
+        'gpuNum': rand.choice(['1*GPU', '2*GPU']),
+        'notSupportCgId': rand.choice([[], [2000], [2000, 2005]]),
+        'notSupportCode': rand.choice([[], ['15000'], ['15000', '10010']]),
+        'notSupportPluginList': rand.choice([
+            [], ['(redshift)'], ['arnold 5', 'zblur.*']]),
+    }
+
+
+@pytest.mark.parametrize('seed', range(200))
+def test_same_as_legacy(seed):
+    """Test the catalog gives the same result and errors as before."""
+    rand = random.Random(seed)
+    configs = [_random_config(rand, index) for index in range(12)]
+    custom = {'model': rand.choice(['Default', '1080Ti', '2080Ti']),
+              'ram': rand.choice(['64GB', '128GB']),
+              'gpuNum': rand.choice(['1*GPU', '2*GPU'])}
+    platform = rand.choice(['2', '21'])
+    cg_id = rand.choice([2000, 2004])
+    plugins = rand.choice([{}, {'redshift': '3.0'}, {'zblur': '2.02'},
+                           {'mtoa': '3.1'}])
+    tips_info = rand.choice([{}, {'15000': []}, {'10010': [], '20000': []}])
+    assert _outcome(HardwareCatalog(configs).match, custom, platform, cg_id,
+                    plugins, list(tips_info)) == _outcome(
+        _legacy_match, configs, custom, platform, cg_id, plugins, tips_info)
+
+
+def test_catalog_reused(rayvision_connect, monkeypatch):
+    """Test the catalog is only rebuilt when the configurations change."""
+    user = UserOperator(rayvision_connect)
+    configs = [[_random_config(random.Random(1), 1)]]
+    monkeypatch.setattr(user, 'get_hardware_config',
+                        lambda task_ids=None: [dict(configs[0][0])])
+    catalog = user.get_hardware_catalog()
+    assert user.get_hardware_catalog() is catalog
+    configs[0] = [dict(configs[0][0], ram='256GB')]
+    assert user.get_hardware_catalog() is not catalog
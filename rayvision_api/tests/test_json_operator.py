@@ -0,0 +1,26 @@
+# -*- coding: utf-8 -*-
+"""Test the rayvision_api.json_operator functions."""
+
+import json
+
+# pylint: disable=import-error
+import pytest
+
+from rayvision_api.exception import RayvisionError
+from rayvision_api.json_operator import append_to_upload
+
+
+def test_append_to_upload(tmpdir):
+    """Test the assets are merged once and the wrong types are rejected."""
+    path = tmpdir.join('texture.png')
+    path.write('')
+    local = str(path).replace('\\', '/')
+    upload_path = tmpdir.join('upload.json')
+    upload_path.write(json.dumps({'asset': []}))
+    append_to_upload(local, str(upload_path))
+    append_to_upload([local, local], str(upload_path))
+    assert [asset['local'] for asset in json.loads(
+        upload_path.read())['asset']] == [local]
+    for files_paths in ({local: 'x'}, 42):
+        with pytest.raises(RayvisionError):
+            append_to_upload(files_paths, str(upload_path))
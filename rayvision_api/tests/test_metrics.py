@@ -0,0 +1,198 @@
+# -*- coding: utf-8 -*-
+"""Test the instrumentation of the requests."""
+
+import json
+import re
+
+# pylint: disable=import-error
+import pytest
+import requests
+
+from rayvision_api import connect as connect_module
+from rayvision_api.connect import Connect
+from rayvision_api.exception import RayvisionAPIError
+from rayvision_api.metrics import Histogram
+from rayvision_api.metrics import InstrumentationGroup
+from rayvision_api.metrics import MetricsAggregator
+from rayvision_api.metrics import OpenTelemetryInstrumentation
+from rayvision_api.metrics import PHASES
+from rayvision_api.metrics import PrometheusExporter
+from rayvision_api.metrics import RequestSample
+from rayvision_api.retry import RetryPolicy
+from rayvision_api.url import ApiUrl
+
+
+@pytest.fixture(name='metrics')
+def fixture_metrics():
+    """Get an empty aggregator."""
+    return MetricsAggregator()
+
+
+@pytest.fixture(name='connect')
+def fixture_connect(user_info_dict, metrics):
+    """Get an instrumented connect retrying without waiting."""
+    policy = RetryPolicy(max_attempts=3, backoff=0, max_backoff=0)
+    return Connect(retry_policy=policy, instrumentation=metrics,
+                   **user_info_dict)
+
+
+def _register(requests_mock, responses):
+    return requests_mock.register_uri(
+        'POST', re.compile('.+task.renderbus.com.+'), responses)
+
+
+def test_phases_and_sizes(connect, metrics, requests_mock):
+    """Test the phases and the payload sizes are measured per endpoint."""
+    content = json.dumps({'code': 200, 'data': {'items': []}})
+    _register(requests_mock, [{'text': content}])
+    for _ in range(2):
+        connect.post(connect.url.queryTaskInfo, {'taskIds': [1]})
+    endpoint = metrics.snapshot()[connect.url.queryTaskInfo.value]
+    assert endpoint['calls'] == 2
+    assert endpoint['retries'] == 0
+    assert endpoint['codes'] == {200: 2}
+    assert endpoint['request_bytes'] == 2 * len(b'{"taskIds": [1]}')
+    assert endpoint['response_bytes'] == 2 * len(content)
+    assert sorted(endpoint['phases']) == sorted(PHASES)
+    assert all(phase['count'] == 2 for phase in endpoint['phases'].values())
+    assert endpoint['latency']['count'] == 2
+
+
+def test_retries_and_error_codes(connect, metrics, requests_mock):
+    """Test the retried attempts and the error codes are recorded."""
+    _register(requests_mock, [
+        {'exc': requests.ConnectionError},
+        {'json': {'code': 200, 'data': {}}},
+        {'json': {'code': 604, 'data': {}, 'message': 'failed'}}])
+    connect.post(connect.url.queryTaskInfo, {'taskIds': [1]})
+    with pytest.raises(RayvisionAPIError):
+        connect.post(connect.url.queryTaskInfo, {'taskIds': [1]})
+    endpoint = metrics.snapshot()[connect.url.queryTaskInfo.value]
+    assert endpoint['calls'] == 2
+    assert endpoint['attempts'] == 3
+    assert endpoint['retries'] == 1
+    assert endpoint['errors'] == 1
+    assert endpoint['codes'] == {200: 1, 604: 1}
+
+
+def test_disabled(user_info_dict, requests_mock, monkeypatch):
+    """Test nothing is measured without instrumentation."""
+    def _fail(*args):
+        raise AssertionError('measured')
+
+    monkeypatch.setattr(connect_module, 'RequestSample', _fail)
+    _register(requests_mock, [{'json': {'code': 200, 'data': {}}}])
+    connect = Connect(**user_info_dict)
+    assert connect.post(connect.url.queryTaskInfo, {'taskIds': [1]}) == {}
+
+
+def test_failing_instrumentation(connect, requests_mock):
+    """Test a failing instrumentation does not fail the request."""
+    class _Broken(object):
+        def record(self, sample):
+            raise RuntimeError('broken')
+
+    connect.instrumentation = InstrumentationGroup([_Broken()])
+    _register(requests_mock, [{'json': {'code': 200, 'data': {}}}])
+    assert connect.post(connect.url.queryTaskInfo, {'taskIds': [1]}) == {}
+
+
+def test_histogram():
+    """Test the values are counted in the first bucket containing them."""
+    histogram = Histogram((0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3):
+        histogram.observe(value)
+    assert histogram.cumulative() == [(0.1, 2), (1.0, 3), (float('inf'), 4)]
+    assert histogram.sum == pytest.approx(3.65)
+
+
+def _sample(endpoint, attempts=1, error=None):
+    clock = iter([0.0, 0.005, 0.02, 0.5]).__next__
+    sample = RequestSample(endpoint, clock=clock)
+    for _ in range(attempts):
+        sample.attempts += 1
+    sample.mark('signing')
+    sample.mark('network')
+    sample.request_bytes = 10
+    sample.response_bytes = 100
+    sample.finish(error)
+    return sample
+
+
+def test_prometheus_exporter(metrics):
+    """Test the text exposition format."""
+    metrics.record(_sample('/api/a'))
+    metrics.record(_sample('/api/a', attempts=3,
+                           error=RayvisionAPIError(604, 'failed', '/api/a')))
+    text = PrometheusExporter(metrics).render()
+    lines = text.splitlines()
+    assert '# TYPE rayvision_api_requests_total counter' in lines
+    assert 'rayvision_api_requests_total{endpoint="/api/a",code="200"} 1' \
+        in lines
+    assert 'rayvision_api_requests_total{endpoint="/api/a",code="604"} 1' \
+        in lines
+    assert 'rayvision_api_retries_total{endpoint="/api/a"} 2' in lines
+    assert 'rayvision_api_response_bytes_total{endpoint="/api/a"} 200' \
+        in lines
+    assert 'rayvision_api_request_duration_seconds_bucket{endpoint="/api/a",' \
+           'le="0.5"} 2' in lines
+    assert 'rayvision_api_request_duration_seconds_count{endpoint="/api/a"}' \
+           ' 2' in lines
+    assert 'rayvision_api_phase_duration_seconds_bucket{endpoint="/api/a",' \
+           'phase="network",le="0.025"} 2' in lines
+    assert 'phase="decode"' not in text
+    assert text.endswith('\n')
+
+
+def test_api_url_endpoint(connect, metrics, requests_mock):
+    """Test the calls of an ``ApiUrl`` member are labelled by its path."""
+    _register(requests_mock, [{'json': {'code': 200, 'data': []}}])
+    connect.post(ApiUrl.queryPlatforms, {'zone': 1})
+    path = '/api/render/common/queryPlatforms'
+    assert list(metrics.snapshot()) == [path]
+    text = PrometheusExporter(metrics).render()
+    assert 'rayvision_api_requests_total{{endpoint="{0}",code="200"}} 1'.format(
+        path) in text.splitlines()
+    assert 'ApiUrl' not in text
+
+
+class _FakeInstrument(object):
+
+    def __init__(self, name):
+        self.name = name
+        self.values = []
+
+    def add(self, value, attributes):
+        self.values.append((value, attributes))
+
+    record = add
+
+
+class _FakeMeter(object):
+
+    def __init__(self):
+        self.instruments = {}
+
+    def _create(self, name, unit, description):
+        self.instruments[name] = _FakeInstrument(name)
+        return self.instruments[name]
+
+    create_counter = create_histogram = _create
+
+
+def test_opentelemetry_instrumentation():
+    """Test the samples are recorded with the meter instruments."""
+    meter = _FakeMeter()
+    OpenTelemetryInstrumentation(meter=meter).record(
+        _sample('/api/a', attempts=2))
+    instruments = meter.instruments
+    assert instruments['rayvision_api.requests'].values == [
+        (1, {'endpoint': '/api/a', 'code': '200'})]
+    assert instruments['rayvision_api.retries'].values == [
+        (1, {'endpoint': '/api/a'})]
+    assert instruments['rayvision_api.request.duration'].values == [
+        (0.5, {'endpoint': '/api/a'})]
+    assert sorted(attributes['phase'] for _, attributes in instruments[
+        'rayvision_api.phase.duration'].values) == ['network', 'signing']
+    assert instruments['rayvision_api.response.size'].values == [
+        (100, {'endpoint': '/api/a'})]
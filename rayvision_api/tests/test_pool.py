@@ -0,0 +1,80 @@
+"""Test the rayvision_api.pool functions."""
+
+from concurrent.futures import ThreadPoolExecutor
+import socket
+import threading
+
+from rayvision_api.connect import Connect
+from rayvision_api.pool import empty_pool_stats
+from rayvision_api.pool import keepalive_socket_options
+
+
+def _connect(domain, **kwargs):
+    """Create a connect to the local server."""
+    return Connect('test_access_id', 'test_access_key', 'http', domain, '2',
+                   **kwargs)
+
+
+def _closed(session):
+    """bool: Whether the pools of the session were closed."""
+    return not session.get_adapter('http://').poolmanager.pools
+
+
+def test_connection_reused(local_server):
+    """Test the sequential requests reuse one kept alive connection."""
+    connect = _connect(local_server)
+    for task_id in range(5):
+        assert connect.post(connect.url.queryTaskInfo, {
+            'taskIds': [task_id]})['body'] == {'taskIds': [task_id]}
+    stats = connect.pool_stats
+    assert stats['requests'] == 5
+    assert stats['new_connections'] == 1
+    assert stats['reused_connections'] == 4
+    assert stats['idle_connections'] == 1
+
+
+def test_pool_maxsize_block(local_server):
+    """Test the blocking pool never opens more than ``pool_maxsize``."""
+    connect = _connect(local_server, pool_maxsize=2, pool_block=True,
+                       tcp_keepalive=30)
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(
+            lambda task_id: connect.post(connect.url.queryTaskInfo,
+                                         {'taskIds': [task_id]}),
+            range(40)))
+    stats = connect.pool_stats
+    assert stats['requests'] == 40
+    assert stats['new_connections'] <= 2
+    assert stats['maxsize'] == 2
+
+
+def test_keepalive_socket_options():
+    """Test the keep-alive option is enabled."""
+    options = keepalive_socket_options(idle=30)
+    assert (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1) in options
+
+
+def test_exited_thread_sessions(local_server):
+    """Test the sessions of the exited threads are closed, not their stats."""
+    connect = _connect(local_server, session_per_thread=True)
+    assert connect.pool_stats == empty_pool_stats()
+    sessions = []
+
+    def _work(task_id):
+        sessions.append(connect.session)
+        connect.post(connect.url.queryTaskInfo, {'taskIds': [task_id]})
+
+    for task_id in range(3):
+        thread = threading.Thread(target=_work, args=(task_id,))
+        thread.start()
+        thread.join()
+    _work(3)
+    stats = connect.pool_stats
+    assert stats['requests'] == 4
+    assert stats['new_connections'] == 4
+    assert len(connect._thread_sessions) == 1
+    assert all(_closed(session) for session in sessions[:3])
+
+    connect.close()
+    assert not connect._thread_sessions
+    assert _closed(sessions[3])
@@ -1,5 +1,8 @@
 """Test rayvision_api.query.Query functions."""
 
+import json
+import re
+
 # pylint: disable=import-error
 import pytest
 
@@ -116,3 +119,112 @@ def test_get_raysync_user_key(fixture_query, mock_requests):
     assert info['raySyncUserKey'] == '8ccb94d67c1e4c17fd0691c02ab7f753cea64e3d'
     assert info['userName'] == 'test'
     assert info['platform'] == 2
+
+
+@pytest.mark.parametrize('concurrency', [None, 4])
+def test_get_all_frames(fixture_query, mock_task_frames, concurrency):
+    """Test all the pages are merged in order."""
+    matcher = mock_task_frames(total=950)
+    frames = fixture_query.get_all_frames(1234, concurrency=concurrency)
+    assert list(frames) == [str(index) for index in range(950)]
+    assert frames['949']['id'] == 1949
+    assert matcher.call_count == 10
+
+
+def test_get_all_frames_no_page_count(fixture_query, mock_task_frames):
+    """Test the pages are read until an empty one without a page count."""
+    matcher = mock_task_frames(total=250, page_count=False)
+    frames = fixture_query.get_all_frames(1234, concurrency=4)
+    assert list(frames) == [str(index) for index in range(250)]
+    assert matcher.call_count == 4
+
+
+@pytest.mark.parametrize('prefetch', [True, False])
+def test_iter_task_frames(fixture_query, mock_task_frames, prefetch):
+    """Test the frames are streamed page by page."""
+    matcher = mock_task_frames(total=250)
+    frames = fixture_query.iter_task_frames(1234, prefetch=prefetch)
+    assert next(frames)['frameIndex'] == '0'
+    assert [per['id'] for per in frames][-1] == 1249
+    assert matcher.call_count == 3
+
+
+def test_iter_task_frames_submit_error(fixture_query, monkeypatch):
+    """Test the error of the first prefetch is not hidden."""
+
+    class _BrokenExecutor(object):
+        def __init__(self, max_workers):
+            self.max_workers = max_workers
+
+        def submit(self, *args, **kwargs):
+            raise RuntimeError('Executor is shut down.')
+
+        def shutdown(self, wait=True):
+            pass
+
+    monkeypatch.setattr('rayvision_api.operators.query.ThreadPoolExecutor',
+                        _BrokenExecutor)
+    with pytest.raises(RuntimeError):
+        list(fixture_query.iter_task_frames(1234, prefetch=True))
+
+
+def test_get_custome_frames(fixture_query, mock_requests, mock_task_frames,
+                            requests_mock):
+    """Test the frame scan stops once all the frames are found."""
+    mock_requests({'code': 200, 'data': {}})
+    matcher = mock_task_frames(total=1000)
+    fixture_query.get_custome_frames(1234, ['10', '150'])
+    # Two pages read, plus at most the prefetched third one, out of ten.
+    assert matcher.call_count in (2, 3)
+    assert requests_mock.last_request.json()['ids'] == [1010, 1150]
+
+
+def test_frame_number_to_stop_range(fixture_query, mock_requests,
+                                    mock_task_frames, requests_mock):
+    """Test the frame ranges are expanded."""
+    mock_requests({'code': 200, 'data': {}})
+    mock_task_frames(total=100)
+    fixture_query.frame_number_to_stop(1234, ['2-8[3]', '10,12'])
+    assert requests_mock.last_request.json()['ids'] == [
+        1002, 1005, 1008, 1010, 1012]
+
+
+def test_task_info_bulk(fixture_query, requests_mock, user_info_dict):
+    """Test the ids are deduplicated, chunked and merged by task id."""
+    def _callback(request, context):
+        task_ids = json.loads(request.body)['taskIds']
+        assert len(task_ids) <= 40
+        return {'code': 200, 'message': 'success', 'data': {
+            'items': [{'id': task_id} for task_id in task_ids
+                      if task_id != 7]}}
+
+    matcher = requests_mock.register_uri(
+        'POST', re.compile('.+{}.+queryTaskInfo'.format(
+            user_info_dict['domain'])), json=_callback)
+    task_ids = list(range(250, 0, -1)) + list(range(100))
+    task_infos = fixture_query.task_info_bulk(task_ids, chunk_size=40,
+                                              concurrency=3)
+    assert matcher.call_count == 7
+    assert list(task_infos) == [task_id for task_id in range(250, -1, -1)
+                                if task_id != 7]
+    parts = list(fixture_query.iter_task_info_bulk(
+        (task_id for task_id in range(100)), chunk_size=40))
+    assert sorted(len(part) for part in parts) == [20, 39, 40]
+
+
+def test_error_detail_by_code(fixture_query, requests_mock, user_info_dict):
+    """Test the codes are requested in batches and grouped by code."""
+    def _callback(request, context):
+        codes = json.loads(request.body)['codes']
+        return {'code': 200, 'message': 'success', 'data': [
+            {'code': code, 'type': 1} for code in codes if code != '404']}
+
+    matcher = requests_mock.register_uri(
+        'POST', re.compile('.+{}.+queryAnalyseErrorDetail'.format(
+            user_info_dict['domain'])), json=_callback)
+    codes = [15000 + index for index in range(7)] + ['404', 15000]
+    details = fixture_query.error_detail_by_code(codes, chunk_size=3)
+    assert matcher.call_count == 3
+    assert list(details) == [str(code) for code in codes[:-1]]
+    assert details['15003'] == [{'code': '15003', 'type': 1}]
+    assert details['404'] == []
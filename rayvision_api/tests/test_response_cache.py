@@ -0,0 +1,205 @@
+# -*- coding: utf-8 -*-
+"""Test the response cache of the connect."""
+
+import re
+
+# pylint: disable=import-error
+import pytest
+import requests
+
+from rayvision_api.cache import REFERENCE_ENDPOINTS
+from rayvision_api.connect import Connect
+from rayvision_api.exception import RayvisionAPIError
+from rayvision_api.operators import QueryOperator
+from rayvision_api.operators import RenderEnvOperator
+from rayvision_api.response_cache import DEFAULT_POLICIES
+from rayvision_api.response_cache import CacheBackend
+from rayvision_api.response_cache import CachePolicy
+from rayvision_api.response_cache import MemoryBackend
+from rayvision_api.response_cache import ResponseCache
+from rayvision_api.response_cache import SQLiteBackend
+from rayvision_api.retry import RetryPolicy
+from rayvision_api.url import ApiUrl
+
+# The supported software is left to the reference cache by default.
+SOFTWARE_POLICIES = {ApiUrl.querySoftwareList: CachePolicy(ttl=3600,
+                                                           maxsize=16)}
+
+
+@pytest.fixture(name='clock')
+def fixture_clock():
+    """Get a controllable clock."""
+    return [1000]
+
+
+@pytest.fixture(name='backend', params=['memory', 'sqlite'])
+def fixture_backend(request, tmpdir):
+    """Get each backend."""
+    if request.param == 'memory':
+        return MemoryBackend()
+    backend = SQLiteBackend(str(tmpdir.join('cache', 'responses.sqlite3')))
+    request.addfinalizer(backend.close)
+    return backend
+
+
+@pytest.fixture(name='software')
+def fixture_software(requests_mock):
+    """Answer the supported software."""
+    return requests_mock.register_uri(
+        'POST', re.compile('.+querySoftwareList'),
+        json={'code': 200, 'data': {'renderInfoList': [{'cgId': 2000}]}})
+
+
+def _connect(user_info_dict, cache, **kwargs):
+    return Connect(response_cache=cache, **dict(user_info_dict, **kwargs))
+
+
+def test_cached_until_expired(user_info_dict, backend, clock, software):
+    """Test the responses are reused until they expire."""
+    cache = ResponseCache(SOFTWARE_POLICIES, backend=backend,
+                          clock=lambda: clock[0])
+    query = QueryOperator(_connect(user_info_dict, cache))
+    first = query.supported_software()
+    first['renderInfoList'].append('changed')
+    assert query.supported_software() == {'renderInfoList': [{'cgId': 2000}]}
+    assert software.call_count == 1
+    clock[0] += 3600
+    query.supported_software()
+    assert software.call_count == 2
+    assert cache.stats == {'hits': 1, 'misses': 2, 'stale': 0,
+                           'invalidations': 0, 'size': 1}
+
+
+def test_key(user_info_dict, software):
+    """Test the bodies, accounts and platforms get their own entries."""
+    cache = ResponseCache(SOFTWARE_POLICIES)
+    QueryOperator(_connect(user_info_dict, cache)).supported_software()
+    QueryOperator(_connect(user_info_dict, cache)).supported_software()
+    QueryOperator(_connect(user_info_dict, cache,
+                           platform='6')).supported_software()
+    QueryOperator(_connect(user_info_dict, cache,
+                           access_id='other')).supported_software()
+    assert software.call_count == 3
+    connect = _connect(user_info_dict, cache)
+    assert cache.make_key(connect.domain, connect.headers, ApiUrl.getConfig,
+                          {'a': 1, 'b': [1, 2]}) == cache.make_key(
+        connect.domain, connect.headers, ApiUrl.getConfig.value,
+        {'b': [1, 2], 'a': 1})
+
+
+def test_uncached_endpoints(user_info_dict, requests_mock):
+    """Test the endpoints without policy are always requested."""
+    matcher = requests_mock.register_uri(
+        'POST', re.compile('.+queryTaskInfo'),
+        json={'code': 200, 'data': {'items': []}})
+    cache = ResponseCache()
+    query = QueryOperator(_connect(user_info_dict, cache))
+    query.task_info([1])
+    query.task_info([1])
+    assert matcher.call_count == 2
+    assert len(cache.backend) == 0
+
+
+def test_policies(user_info_dict, requests_mock):
+    """Test the per endpoint policies and the least recently used eviction."""
+    matcher = requests_mock.register_uri(
+        'POST', re.compile('.+queryTaskInfo'),
+        json={'code': 200, 'data': {'items': []}})
+    cache = ResponseCache({ApiUrl.queryTaskInfo: CachePolicy(ttl=5,
+                                                             maxsize=2)})
+    query = QueryOperator(_connect(user_info_dict, cache))
+    for task_id in (1, 2, 1, 3, 1, 2):
+        query.task_info([task_id])
+    # 2 is evicted by 3, 1 is kept as it is used again.
+    assert matcher.call_count == 4
+    assert len(cache.backend) == 2
+
+
+def test_mutations_invalidate(user_info_dict, backend, requests_mock):
+    """Test a mutating endpoint removes the entries of the related reads."""
+    config = requests_mock.register_uri(
+        'POST', re.compile('.+getUserPluginConfig'),
+        json={'code': 200, 'data': [{'editName': 'env'}]})
+    requests_mock.register_uri(
+        'POST', re.compile('.+setDefaultUserPluginConfig'),
+        json={'code': 200, 'data': {}})
+    requests_mock.register_uri(
+        'POST', re.compile('.+querySoftwareList'),
+        json={'code': 200, 'data': {'renderInfoList': []}})
+    cache = ResponseCache(dict(DEFAULT_POLICIES, **SOFTWARE_POLICIES),
+                          backend=backend)
+    connect = _connect(user_info_dict, cache)
+    env = RenderEnvOperator(connect)
+    QueryOperator(connect).supported_software()
+    env.get_render_env()
+    env.get_render_env()
+    assert config.call_count == 1
+    env.set_default_render_env('env')
+    env.get_render_env()
+    assert config.call_count == 2
+    assert cache.stats['invalidations'] == 1
+    assert len(backend) == 2
+
+
+def test_stale_if_error(user_info_dict, clock, requests_mock):
+    """Test an expired response is returned on transient errors only."""
+    matcher = requests_mock.register_uri(
+        'POST', re.compile('.+getServerInfo'),
+        [{'json': {'code': 200, 'data': {'host': 'a'}}},
+         {'exc': requests.ConnectionError},
+         {'json': {'code': 600, 'data': {}, 'message': 'Denied.'}}])
+    cache = ResponseCache({ApiUrl.getServerInfo: CachePolicy(
+        ttl=10, stale_if_error=60)}, clock=lambda: clock[0])
+    connect = _connect(user_info_dict, cache,
+                       retry_policy=RetryPolicy(max_attempts=1))
+    assert connect.post(ApiUrl.getServerInfo, {}) == {'host': 'a'}
+    clock[0] += 30
+    assert connect.post(ApiUrl.getServerInfo, {}) == {'host': 'a'}
+    with pytest.raises(RayvisionAPIError):
+        connect.post(ApiUrl.getServerInfo, {})
+    assert matcher.call_count == 3
+    assert cache.stats['stale'] == 1
+    clock[0] += 60
+    assert cache.backend.get(ApiUrl.getServerInfo.value, cache.make_key(
+        connect.domain, connect.headers, ApiUrl.getServerInfo, {}),
+                             clock[0]) is None
+
+
+def test_sqlite_shared(tmpdir, user_info_dict, software):
+    """Test the entries are shared by the backends of the same database."""
+    path = str(tmpdir.join('responses.sqlite3'))
+    first = SQLiteBackend(path)
+    second = SQLiteBackend(path)
+    try:
+        QueryOperator(_connect(user_info_dict, ResponseCache(
+            SOFTWARE_POLICIES, backend=first))).supported_software()
+        QueryOperator(_connect(user_info_dict, ResponseCache(
+            SOFTWARE_POLICIES, backend=second))).supported_software()
+        assert software.call_count == 1
+        ResponseCache(backend=second).invalidate(ApiUrl.querySoftwareList)
+        assert len(first) == 0
+    finally:
+        first.close()
+        second.close()
+
+
+def test_reference_endpoints_not_cached(user_info_dict, software):
+    """Test the reference data is left to the reference cache by default."""
+    assert not REFERENCE_ENDPOINTS.intersection(DEFAULT_POLICIES)
+    cache = ResponseCache()
+    query = QueryOperator(_connect(user_info_dict, cache))
+    query.supported_software()
+    query.supported_software()
+    assert software.call_count == 2
+    assert len(cache.backend) == 0
+
+
+def test_backend_abstract():
+    """Test a backend must implement the whole interface."""
+
+    class _Partial(CacheBackend):
+        def get(self, endpoint, key, now):
+            return None
+
+    with pytest.raises(TypeError):
+        _Partial()
@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+"""Test the retry policy of the requests."""
+
+import re
+
+# pylint: disable=import-error
+import pytest
+import requests
+
+from rayvision_api.connect import Connect
+from rayvision_api.exception import RayvisionAPIError
+from rayvision_api.exception import RayvisionHTTPStatusError
+from rayvision_api.retry import RetryBudget
+from rayvision_api.retry import RetryPolicy
+
+
+@pytest.fixture(name='connect')
+def fixture_connect(user_info_dict):
+    """Get a connect retrying without waiting."""
+    policy = RetryPolicy(max_attempts=3, backoff=0, max_backoff=0)
+    return Connect(retry_policy=policy, **user_info_dict)
+
+
+def _register(requests_mock, responses):
+    return requests_mock.register_uri(
+        'POST', re.compile('.+task.renderbus.com.+'), responses)
+
+
+def test_business_error_not_retried(connect, requests_mock):
+    """Test a business error code is raised at once."""
+    matcher = _register(requests_mock, [
+        {'json': {'code': 604, 'data': {}, 'message': 'failed'}}])
+    with pytest.raises(RayvisionAPIError) as err:
+        connect.post(connect.url.queryTaskInfo, {'taskIds': [1]})
+    assert err.value.error_code == 604
+    assert matcher.call_count == 1
+    assert connect.retry_policy.stats['retries'] == 0
+
+
+def test_validation_error_not_retried(connect, requests_mock):
+    """Test an invalid request data is raised at once."""
+    matcher = _register(requests_mock, [{'json': {'code': 200, 'data': {}}}])
+    with pytest.raises(ValueError):
+        connect.post(connect.url.queryTaskInfo, {'taskIds': 'bad'})
+    assert matcher.call_count == 0
+
+
+def test_transient_errors_retried(connect, requests_mock):
+    """Test the transport errors and retryable statuses are retried."""
+    matcher = _register(requests_mock, [
+        {'exc': requests.ConnectionError},
+        {'status_code': 503, 'text': '<html>Unavailable</html>'},
+        {'json': {'code': 200, 'data': {'items': []}}}])
+    assert connect.post(connect.url.queryTaskInfo,
+                        {'taskIds': [1]}) == {'items': []}
+    assert matcher.call_count == 3
+    assert connect.retry_policy.stats == {'requests': 1, 'retries': 2,
+                                          'gave_up': 0,
+                                          'budget_exhausted': 0}
+
+
+def test_custom_retryable_status(user_info_dict, requests_mock):
+    """Test the HTTP statuses of the policy are retried, not decoded."""
+    policy = RetryPolicy(max_attempts=2, retryable_codes=[408], backoff=0,
+                         max_backoff=0)
+    connect = Connect(retry_policy=policy, **user_info_dict)
+    matcher = _register(requests_mock, [
+        {'status_code': 408, 'text': '<html>Timeout</html>'},
+        {'status_code': 408, 'text': '<html>Timeout</html>'}])
+    with pytest.raises(RayvisionHTTPStatusError) as err:
+        connect.post(connect.url.queryTaskInfo, {'taskIds': [1]})
+    assert err.value.status == err.value.error_code == 408
+    assert matcher.call_count == 2
+
+
+def test_retry_gives_up(connect, requests_mock):
+    """Test the error is raised after the last attempt."""
+    matcher = _register(requests_mock, [
+        {'json': {'code': 502, 'data': {}, 'message': 'Bad gateway'}}])
+    with pytest.raises(RayvisionAPIError) as err:
+        connect.post(connect.url.queryTaskInfo, {'taskIds': [1]})
+    assert err.value.error_code == 502
+    assert matcher.call_count == 3
+    assert connect.retry_policy.stats['gave_up'] == 1
+
+
+def test_retry_budget(user_info_dict, requests_mock):
+    """Test the retries stop when the budget is exhausted."""
+    budget = RetryBudget(ratio=0, initial=2)
+    connect = Connect(retry_policy=RetryPolicy(backoff=0, max_backoff=0,
+                                               budget=budget),
+                      **user_info_dict)
+    matcher = _register(requests_mock, [{'exc': requests.Timeout}])
+    for _ in range(2):
+        with pytest.raises(requests.Timeout):
+            connect.post(connect.url.queryTaskInfo, {'taskIds': [1]})
+    assert matcher.call_count == 4
+    assert connect.retry_policy.stats['budget_exhausted'] == 2
+    assert connect.retry_policy.stats['retries'] == 2
+
+
+def test_budget_deposit():
+    """Test the budget is refilled by the requests up to the maximum."""
+    budget = RetryBudget(ratio=0.5, initial=0, maximum=1)
+    assert not budget.withdraw()
+    for _ in range(3):
+        budget.deposit()
+    assert budget.tokens == 1
+    assert budget.withdraw()
+    assert not budget.withdraw()
+
+
+def test_backoff_without_jitter():
+    """Test the backoff doubles up to the maximum."""
+    policy = RetryPolicy(backoff=1, max_backoff=4, jitter=False)
+    wait = policy.retrying().wait
+    waits = []
+    for attempt in range(1, 6):
+        state = type('State', (object,), {'attempt_number': attempt})
+        waits.append(wait(state))
+    assert waits == [1, 2, 4, 4, 4]
@@ -0,0 +1,30 @@
+"""Test the rayvision_api.serializer functions."""
+
+# pylint: disable=import-error
+import pytest
+
+from rayvision_api.serializer import get_serializer
+
+
+@pytest.mark.parametrize('backend', ['json', 'orjson', 'ujson', 'auto'])
+def test_round_trip(backend):
+    """Test the body is serialized to bytes and decoded back."""
+    if backend in ('orjson', 'ujson'):
+        pytest.importorskip(backend)
+    serializer = get_serializer(backend)
+    data = {'taskIds': [1, 2], 'name': u'渲染', 'flag': None}
+    content = serializer.dumps(data)
+    assert isinstance(content, bytes)
+    assert serializer.loads(content) == data
+
+
+def test_default_wire_format():
+    """Test the standard library keeps the historical wire format."""
+    assert get_serializer().dumps({'taskIds': [1, 2]}) == \
+        b'{"taskIds": [1, 2]}'
+
+
+def test_unknown_backend():
+    """Test an unknown backend raise a ``ValueError``."""
+    with pytest.raises(ValueError):
+        get_serializer('yaml')
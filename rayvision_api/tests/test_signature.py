@@ -1,5 +1,8 @@
 """Test the rayvision_api utils functions."""
 
+import copy
+import random
+
 # pylint: disable=import-error
 import pytest
 
@@ -72,3 +75,87 @@ def test_formatted_headers(test_case, results):
 def test_hump2underline(test_case, results):
     """Test we can get a correct result."""
     assert signature.hump2underline(test_case) == results
+
+
+def _legacy_headers_body_str(domain_name, api_url, header, body):
+    """The reference implementation the signatures must stay identical to."""
+    header = copy.deepcopy(header)
+    body = copy.deepcopy(body)
+    try:
+        header.pop('signature')
+        header.pop('Content-Type')
+    except KeyError:
+        pass
+    header_body_dict = signature.headers_body_sort(header, body)
+    return '[POST]{0}:{1}&{2}'.format(domain_name, api_url, '&'.join([
+        '{0}={1}'.format(key, value)
+        for key, value in header_body_dict.items()]))
+
+
+def _random_value(rand, depth=0):
+    """Generate a random json-like value."""
+    kind = rand.randint(0, 9 if depth < 4 else 5)
+    if kind == 0:
+        return None
+    if kind == 1:
+        return rand.choice([True, False])
+    if kind == 2:
+        return rand.randint(-10 ** 6, 10 ** 6)
+    if kind == 3:
+        return rand.random() * 1000
+    if kind in (4, 5):
+        return rand.choice(['', 'value', u'\u6e32\u67d3', 'a=b&c', 'x.y'])
+    if kind in (6, 7):
+        return [_random_value(rand, depth + 1)
+                for _ in range(rand.randint(0, 4))]
+    return {rand.choice(['a', 'b', 'a0', 'b.c', '', 'nonce', 'taskIds']):
+            _random_value(rand, depth + 1)
+            for _ in range(rand.randint(0, 4))}
+
+
+GOLDEN_BODIES = [
+    {},
+    {'key': 'value'},
+    {'nonce': 'body_nonce', 'accessId': {'nested': 1}},
+    {'signature': 'in_body', 'Content-Type': 'text/plain'},
+    {'taskIds': [1, 2, 3], 'status': []},
+    {'renderEnvs': [{'envId': 1, 'pluginIds': [2, 3, 4]},
+                    {'envId': 3, 'pluginIds': [7, 8, 10]}]},
+    {'a': [[1, 2], [3, {'b': None}]], 'a0': 'collision', 'a1': 'other'},
+    {'': {'x': 1}, 'empty': {}, 'flag': True, 'ratio': 0.1},
+    {'content': u'{"task_info": "\u6e32\u67d3"}'},
+]
+
+
+@pytest.mark.parametrize('headers_update', [
+    {},
+    {'signature': 'sig', 'Content-Type': 'application/json'},
+    {'signature': 'sig'},
+    {'Content-Type': 'application/json'},
+])
+@pytest.mark.parametrize('body', GOLDEN_BODIES)
+def test_canonical_golden(header, headers_update, body):
+    """Test the canonical string is identical to the reference one."""
+    header.update(headers_update)
+    original = (copy.deepcopy(header), copy.deepcopy(body))
+    assert signature.generate_headers_body_str(
+        'tests.com', 'api_url', header, body) == _legacy_headers_body_str(
+            'tests.com', 'api_url', header, body)
+    # The inputs must not be modified.
+    assert (header, body) == original
+
+
+def test_canonical_random(header):
+    """Test random nested bodies against the reference implementation."""
+    rand = random.Random(20201018)
+    header['signature'] = 'sig'
+    header['Content-Type'] = 'application/json'
+    for _ in range(500):
+        body = _random_value(rand, depth=4) if rand.random() < 0.1 else {
+            key: _random_value(rand)
+            for key in rand.sample(['key', 'nonce', 'list', 'a', 'a.b',
+                                    'signature', 'version', 'x'], 4)}
+        if not isinstance(body, dict):
+            body = {'value': body}
+        assert signature.canonical_headers_body(header, body) == \
+            _legacy_headers_body_str('d', 'u', header, body).split('&', 1)[1]
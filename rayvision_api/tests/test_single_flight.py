@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+"""Test the coalescing of the identical calls in flight."""
+
+import re
+import threading
+import time
+
+# pylint: disable=import-error
+import pytest
+
+from rayvision_api.connect import Connect
+from rayvision_api.exception import RayvisionAPIError
+from rayvision_api.operators import QueryOperator
+from rayvision_api.response_cache import CachePolicy
+from rayvision_api.response_cache import ResponseCache
+from rayvision_api import single_flight
+from rayvision_api.single_flight import SingleFlight
+from rayvision_api.url import ApiUrl
+
+
+def _slow(data, code=200):
+    """Answer after the other threads joined the call in flight."""
+
+    def _callback(request, context):  # pylint: disable=unused-argument
+        time.sleep(0.2)
+        return {'code': code, 'data': data, 'message': 'Slow.'}
+
+    return _callback
+
+
+def _concurrently(func, count=50):
+    """Call the function from many threads at the same time."""
+    barrier = threading.Barrier(count)
+    results = [None] * count
+
+    def _worker(index):
+        barrier.wait()
+        try:
+            results[index] = func()
+        except Exception as err:  # pylint: disable=broad-except
+            results[index] = err
+
+    threads = [threading.Thread(target=_worker, args=(index,))
+               for index in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_coalesced(user_info_dict, requests_mock):
+    """Test the identical concurrent calls share one request."""
+    matcher = requests_mock.register_uri(
+        'POST', re.compile('.+queryTaskInfo'),
+        json=_slow({'items': [{'id': 1}]}))
+    flight = SingleFlight()
+    query = QueryOperator(Connect(single_flight=flight, **user_info_dict))
+    results = _concurrently(lambda: query.task_info([1]))
+    assert matcher.call_count == 1
+    assert results == [{'items': [{'id': 1}]}] * 50
+    results[0]['items'].append('changed')
+    assert results[1] == {'items': [{'id': 1}]}
+    assert flight.stats == {'requests': 1, 'coalesced': 49, 'in_flight': 0}
+
+    query.task_info([1])
+    query.task_info([2])
+    assert matcher.call_count == 3
+
+
+class _GatedEvent(threading.Event):
+    """An event whose waiters also wait for the gate once it is set."""
+
+    gate = threading.Event()
+
+    def wait(self, timeout=None):
+        result = threading.Event.wait(self, timeout)
+        self.gate.wait()
+        return result
+
+
+class _GatedFlight(single_flight._Flight):  # pylint: disable=protected-access
+    """A flight whose waiting calls are blocked until the gate is set."""
+
+    def __init__(self):
+        super(_GatedFlight, self).__init__()
+        self.done = _GatedEvent()
+
+
+def test_leader_mutation(user_info_dict, monkeypatch):
+    """Test the waiting calls never see the changes of the first caller."""
+    gate = threading.Event()
+    monkeypatch.setattr(_GatedEvent, 'gate', gate)
+    monkeypatch.setattr(single_flight, '_Flight', _GatedFlight)
+    flight = SingleFlight()
+    connect = Connect(**user_info_dict)
+    results = []
+
+    def _follow():
+        results.append(flight.call(connect, ApiUrl.queryTaskInfo, {},
+                                   lambda: {'items': ['follower']}))
+
+    followers = [threading.Thread(target=_follow) for _ in range(5)]
+
+    def _lead():
+        for thread in followers:
+            thread.start()
+        while flight.stats['coalesced'] < len(followers):
+            time.sleep(0.01)
+        return {'items': [{'id': 1}]}
+
+    result = flight.call(connect, ApiUrl.queryTaskInfo, {}, _lead)
+    # The followers are woken up but blocked by the gate.
+    result['items'].append('changed')
+    gate.set()
+    for thread in followers:
+        thread.join()
+    assert results == [{'items': [{'id': 1}]}] * 5
+    assert len(set(id(item) for item in results)) == 5
+
+
+def test_error_shared(user_info_dict, requests_mock):
+    """Test the error of the request is raised by every call."""
+    matcher = requests_mock.register_uri(
+        'POST', re.compile('.+querySoftwareList'),
+        json=_slow({}, code=600))
+    query = QueryOperator(Connect(single_flight=SingleFlight(),
+                                  **user_info_dict))
+    results = _concurrently(query.supported_software, count=10)
+    assert matcher.call_count == 1
+    assert all(isinstance(result, RayvisionAPIError) for result in results)
+
+
+def test_mutations_not_coalesced(user_info_dict, requests_mock):
+    """Test the calls of the mutating endpoints are all sent."""
+    matcher = requests_mock.register_uri(
+        'POST', re.compile('.+createTask'),
+        json=_slow({'taskIdList': [1]}))
+    connect = Connect(single_flight=SingleFlight(), **user_info_dict)
+    results = _concurrently(lambda: connect.post(
+        ApiUrl.createTask, {'count': 1, 'taskUserLevel': 50}), count=5)
+    assert results == [{'taskIdList': [1]}] * 5
+    assert matcher.call_count == 5
+
+
+def test_with_response_cache(user_info_dict, requests_mock):
+    """Test the response is cached once for the coalesced calls."""
+    matcher = requests_mock.register_uri(
+        'POST', re.compile('.+queryPlatforms'),
+        json=_slow([{'platform': 2}]))
+    cache = ResponseCache({ApiUrl.queryPlatforms: CachePolicy()})
+    query = QueryOperator(Connect(single_flight=SingleFlight(),
+                                  response_cache=cache, **user_info_dict))
+    _concurrently(query.platforms, count=10)
+    query.platforms()
+    assert matcher.call_count == 1
+    assert (cache.stats['misses'], cache.stats['hits']) == (1, 1)
+
+
+@pytest.mark.parametrize('api_url', [ApiUrl.queryTaskInfo,
+                                     ApiUrl.queryTaskInfo.value])
+def test_endpoints(api_url):
+    """Test the coalesced endpoints can be chosen."""
+    assert SingleFlight([api_url]).endpoints == frozenset(
+        [ApiUrl.queryTaskInfo.value])
@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+"""Test the incremental sync of the task list."""
+
+# pylint: disable=import-error
+import pytest
+
+from rayvision_api.sync import TaskListSynchronizer
+
+
+class FakeQuery(object):
+    """The task list of a fake farm."""
+
+    def __init__(self, tasks):
+        self.tasks = tasks
+        self.list_calls = []
+        self.info_calls = []
+
+    def get_task_list(self, page_num=1, page_size=100, status_list=None,
+                      start_time=None, end_time=None, **kwargs):
+        self.list_calls.append((page_num, start_time, end_time))
+        items = [dict(task) for task in self.tasks.values()
+                 if (not status_list or task['taskStatus'] in status_list) and
+                 (start_time is None or task['submit'] >= start_time)]
+        page = items[(page_num - 1) * page_size:page_num * page_size]
+        return {'pageCount': (len(items) + page_size - 1) // page_size,
+                'pageNum': page_num, 'items': page}
+
+    def task_info_bulk(self, task_ids):
+        self.info_calls.append(sorted(task_ids))
+        return dict((task_id, dict(self.tasks[task_id]))
+                    for task_id in task_ids if task_id in self.tasks)
+
+
+def _task(task_id, status, submit='2019'):
+    return {'id': task_id, 'taskStatus': status, 'submit': submit}
+
+
+@pytest.fixture(name='farm')
+def fixture_farm():
+    """Get a farm with 5 finished and 2 running tasks."""
+    tasks = dict((task_id, _task(task_id, 10)) for task_id in range(5))
+    tasks[5] = _task(5, 5)
+    tasks[6] = _task(6, 5)
+    return FakeQuery(tasks)
+
+
+@pytest.fixture(name='clock')
+def fixture_clock():
+    """Get a controllable clock."""
+    now = [1600000000.0]
+    return now
+
+
+def test_first_sync_is_full(farm, clock):
+    """Test the first sync downloads all the pages."""
+    synchronizer = TaskListSynchronizer(farm, page_size=3,
+                                        clock=lambda: clock[0])
+    diff = synchronizer.sync()
+    assert sorted(task['id'] for task in diff.added) == list(range(7))
+    assert diff.updated == [] and diff.removed == []
+    assert [call[0] for call in farm.list_calls] == [1, 2, 3]
+    assert len(synchronizer) == 7 and 5 in synchronizer
+
+
+def test_incremental_sync(farm, clock):
+    """Test only the new and active tasks are requested."""
+    synchronizer = TaskListSynchronizer(farm, final_statuses=[10],
+                                        time_format='%Y',
+                                        clock=lambda: clock[0])
+    synchronizer.sync()
+    farm.list_calls = []
+    farm.tasks[5]['taskStatus'] = 10
+    farm.tasks[7] = _task(7, 0, submit='2021')
+    del farm.tasks[6]
+    clock[0] += 30
+    diff = synchronizer.sync()
+    assert [task['id'] for task in diff.added] == [7]
+    assert [task['id'] for task in diff.updated] == [5]
+    assert [task['id'] for task in diff.removed] == [6]
+    assert farm.info_calls == [[5, 6]]
+    assert [call[1] for call in farm.list_calls] == ['2020']
+    assert synchronizer.get(5)['taskStatus'] == 10
+
+    farm.info_calls = []
+    clock[0] += 30
+    assert synchronizer.sync() == ([], [], [])
+    assert farm.info_calls == []
+
+
+def test_full_sync_detects_removed(farm, clock):
+    """Test the periodic full sync removes the deleted finished tasks."""
+    synchronizer = TaskListSynchronizer(farm, final_statuses=[10],
+                                        full_sync_interval=100,
+                                        time_format='%Y',
+                                        clock=lambda: clock[0])
+    synchronizer.sync()
+    del farm.tasks[0]
+    clock[0] += 50
+    assert synchronizer.sync().removed == []
+    clock[0] += 50
+    assert [task['id'] for task in synchronizer.sync().removed] == [0]
+    assert 0 not in synchronizer
+
+
+def test_status_filter(farm, clock):
+    """Test the tasks leaving the tracked statuses are removed."""
+    synchronizer = TaskListSynchronizer(farm, status_list=[5],
+                                        time_format='%Y',
+                                        clock=lambda: clock[0])
+    assert len(synchronizer.sync().added) == 2
+    farm.tasks[5]['taskStatus'] = 10
+    clock[0] += 30
+    diff = synchronizer.sync()
+    assert [task['id'] for task in diff.removed] == [5]
+    assert list(synchronizer.tasks) == [6]
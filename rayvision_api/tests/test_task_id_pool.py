@@ -0,0 +1,214 @@
+# -*- coding: utf-8 -*-
+"""Test the task id pool."""
+
+import asyncio
+import gc
+import threading
+import time
+import weakref
+
+# pylint: disable=import-error
+import pytest
+
+from rayvision_api.exception import RayvisionError
+from rayvision_api.operators import TaskOperator
+from rayvision_api import task_id_pool
+from rayvision_api.task_id_pool import TaskIdPool
+
+
+class _FakeTaskOperator(object):
+    """Create sequential task ids."""
+
+    def __init__(self, delay=0, fail=False, limit=None):
+        self.delay = delay
+        self.fail = fail
+        self.limit = limit
+        self.calls = []
+        self._next = 1
+        self._lock = threading.Lock()
+
+    def reserve_task_ids(self, count, block_size=100, **kwargs):
+        time.sleep(self.delay)
+        if self.fail:
+            raise RayvisionError(1000000, 'Failed to create task number!')
+        if self.limit is not None:
+            count = min(count, self.limit)
+        with self._lock:
+            self.calls.append(count)
+            start, self._next = self._next, self._next + count
+        return list(range(start, start + count))
+
+
+def test_concurrent_get():
+    """Test the concurrent submitters get distinct task ids."""
+    operator = _FakeTaskOperator(delay=0.01)
+    pool = TaskIdPool(operator, batch_size=10, low_water=3)
+    task_ids = []
+    lock = threading.Lock()
+
+    def _take():
+        for _ in range(25):
+            task_id = pool.get(timeout=5)
+            with lock:
+                task_ids.append(task_id)
+
+    threads = [threading.Thread(target=_take) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(task_ids) == 200
+    assert len(set(task_ids)) == 200
+    assert pool.stats['issued'] == 200
+    unused = pool.close()
+    assert sorted(task_ids + unused) == list(range(1, sum(operator.calls) + 1))
+
+
+def test_background_refill():
+    """Test the pool is refilled below the low-water mark."""
+    operator = _FakeTaskOperator()
+    pool = TaskIdPool(operator, batch_size=5, low_water=2)
+    assert pool.get_many(3) == [1, 2, 3]
+    for _ in range(100):
+        if pool.stats['refills'] == 2:
+            break
+        time.sleep(0.01)
+    assert operator.calls == [5, 5]
+    assert len(pool) == 7
+    assert pool.close() == [4, 5, 6, 7, 8, 9, 10]
+
+
+def test_put_and_report_unused(caplog):
+    """Test the given back ids are reused and reported when unused."""
+    pool = TaskIdPool(_FakeTaskOperator(), batch_size=3, low_water=0,
+                      background=False)
+    assert pool.get() == 1
+    pool.put(1)
+    pool.put(1)
+    assert pool.get() == 1
+    pool.put(1)
+    assert pool.close() == [1, 2, 3]
+    assert '3 task ids were created but not used' in caplog.text
+    with pytest.raises(RayvisionError):
+        pool.get()
+
+
+def test_refill_error():
+    """Test a failed refill is raised to the waiting submitter."""
+    pool = TaskIdPool(_FakeTaskOperator(fail=True), batch_size=3)
+    with pytest.raises(RayvisionError):
+        pool.get(timeout=5)
+    pool.close()
+
+
+def test_taken_ids_given_back():
+    """Test the ids taken before a failed refill are given back."""
+    operator = _FakeTaskOperator()
+    pool = TaskIdPool(operator, batch_size=3, low_water=0, background=False)
+    assert pool.get() == 1
+    operator.fail = True
+    with pytest.raises(RayvisionError):
+        pool.get_many(5)
+    assert len(pool) == 2
+    operator.fail = False
+    assert pool.get_many(2) == [2, 3]
+    pool.close()
+
+
+def test_timeout_total():
+    """Test the timeout bounds the whole call, not each wait."""
+    pool = TaskIdPool(_FakeTaskOperator(delay=0.05, limit=1), batch_size=1,
+                      low_water=0)
+    started = time.time()
+    with pytest.raises(RayvisionError):
+        pool.get_many(20, timeout=0.2)
+    assert time.time() - started < 0.6
+    time.sleep(0.1)
+    unused = pool.close()
+    assert unused == list(range(1, len(unused) + 1))
+
+
+def test_task_operator_pool(rayvision_connect, monkeypatch):
+    """Test the task operator hands out the ids of its pool."""
+    operator = TaskOperator(rayvision_connect)
+    fake = _FakeTaskOperator()
+    monkeypatch.setattr(operator, 'reserve_task_ids', fake.reserve_task_ids)
+    operator.enable_id_pool(batch_size=4, low_water=0, background=False)
+    assert [operator._generate_task_id() for _ in range(3)] == [1, 2, 3]
+    assert operator.take_task_ids(2) == [4, 5]
+    assert operator.close_id_pool() == [6, 7, 8]
+    assert operator.task_id_pool is None
+
+
+def test_closed_pool_released():
+    """Test a closed pool is not kept alive by the exit report."""
+    pool = TaskIdPool(_FakeTaskOperator(), background=False)
+    assert pool in task_id_pool._OPEN_POOLS
+    pool.close()
+    assert pool not in task_id_pool._OPEN_POOLS
+    reference = weakref.ref(pool)
+    del pool
+    gc.collect()
+    assert reference() is None
+
+
+class _FakeAsyncTaskOperator(_FakeTaskOperator):
+    """Create sequential task ids on the event loop."""
+
+    async def reserve_task_ids(self, count, block_size=100, **kwargs):
+        await asyncio.sleep(self.delay)
+        return _FakeTaskOperator.reserve_task_ids(self, count, block_size)
+
+
+def test_async_pool():
+    """Test the coroutines get distinct ids and share the refills."""
+    pytest.importorskip('aiohttp')
+    from rayvision_api.aio.task_id_pool import AsyncTaskIdPool
+
+    async def _take():
+        operator = _FakeAsyncTaskOperator(delay=0.01)
+        pool = AsyncTaskIdPool(operator, batch_size=10, low_water=3)
+        task_ids = await asyncio.gather(*[pool.get() for _ in range(25)])
+        pool.put(task_ids[-1])
+        assert await pool.get() == task_ids[-1]
+        await asyncio.sleep(0.05)
+        return task_ids, operator.calls, pool.close()
+
+    task_ids, calls, unused = asyncio.run(_take())
+    assert sorted(task_ids) == list(range(1, 26))
+    assert sorted(task_ids + unused) == list(range(1, sum(calls) + 1))
+
+
+def test_async_pool_refill_error():
+    """Test a failed refill is raised and the taken ids are given back."""
+    pytest.importorskip('aiohttp')
+    from rayvision_api.aio.task_id_pool import AsyncTaskIdPool
+
+    async def _take():
+        operator = _FakeAsyncTaskOperator()
+        pool = AsyncTaskIdPool(operator, batch_size=2, low_water=0)
+        await pool.get()
+        operator.fail = True
+        with pytest.raises(RayvisionError):
+            await pool.get_many(3)
+        return pool.close()
+
+    assert asyncio.run(_take()) == [2]
+
+
+def test_async_task_operator_pool(user_info_dict):
+    """Test the asynchronous task operator hands out the ids of its pool."""
+    pytest.importorskip('aiohttp')
+    from rayvision_api.aio import AsyncConnect
+    from rayvision_api.aio import AsyncTaskOperator
+
+    async def _take():
+        operator = AsyncTaskOperator(AsyncConnect(**user_info_dict))
+        fake = _FakeAsyncTaskOperator()
+        operator.reserve_task_ids = fake.reserve_task_ids
+        operator.enable_id_pool(batch_size=4, low_water=0)
+        task_ids = [await operator._generate_task_id() for _ in range(3)]
+        task_ids.extend(await operator.take_task_ids(2))
+        return task_ids, operator.close_id_pool()
+
+    assert asyncio.run(_take()) == ([1, 2, 3, 4, 5], [6, 7, 8])
@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+"""Test one API instance shared by many threads."""
+
+from concurrent.futures import ThreadPoolExecutor
+import itertools
+import logging
+import threading
+
+# pylint: disable=import-error
+import pytest
+
+from rayvision_api import signature
+from rayvision_api.core import RayvisionAPI
+
+THREADS = 64
+REQUESTS_PER_THREAD = 5
+
+
+def _api(domain, **kwargs):
+    """Create an API of the local server, logging in on first use."""
+    return RayvisionAPI(access_id='test_access_id',
+                        access_key='test_access_key', domain=domain,
+                        platform='2', protocol='http', lazy_login=True,
+                        logger=logging.getLogger(__name__),
+                        pool_maxsize=THREADS, **kwargs)
+
+
+def _signature(connect, api_url, response):
+    """Sign the request echoed by the local server again."""
+    headers = dict(connect.headers)
+    headers['UTCTimestamp'] = response['headers']['UTCTimestamp']
+    headers['nonce'] = response['headers']['nonce']
+    msg = signature.generate_headers_body_str(connect.domain, api_url,
+                                              headers, response['body'])
+    return signature.generate_signature('test_access_key', msg).decode('utf-8')
+
+
+@pytest.mark.parametrize('session_per_thread', [False, True])
+def test_shared_api_stress(local_server, session_per_thread):
+    """Test 64 threads sharing one API, login once and sign each request."""
+    api = _api(local_server, session_per_thread=session_per_thread)
+    logins = []
+    login = api.user._login
+
+    def _login():
+        logins.append(1)
+        return login()
+
+    api.user._login = _login
+    base_headers = dict(api.connect.headers)
+    barrier = threading.Barrier(THREADS)
+    api_url = api.connect.url.queryTaskInfo
+
+    def _work(thread_index):
+        barrier.wait()
+        assert api.user_info['domain'] == local_server
+        for index in range(REQUESTS_PER_THREAD):
+            task_ids = [thread_index * 1000 + index]
+            response = api.connect.post(api_url, {'taskIds': task_ids})
+            assert response['body'] == {'taskIds': task_ids}
+            assert response['headers']['signature'] == _signature(
+                api.connect, api_url, response)
+        return thread_index
+
+    with ThreadPoolExecutor(max_workers=THREADS) as executor:
+        assert sorted(executor.map(_work, range(THREADS))) == list(
+            range(THREADS))
+
+    assert len(logins) == 1
+    stats = api.connect.pool_stats
+    # The three login requests and the requests of the threads.
+    assert stats['requests'] == THREADS * REQUESTS_PER_THREAD + 3
+    assert api.connect.headers == base_headers
+    if session_per_thread:
+        assert stats['pools'] >= 2
+
+
+def test_task_id_per_thread(local_server, monkeypatch):
+    """Test the threads never share the task ID reused until submitted."""
+    api = _api(local_server)
+    counter = itertools.count(1)
+    monkeypatch.setattr(api.task, 'create_task', lambda **kwargs: {
+        'taskIdList': [next(counter)]})
+    barrier = threading.Barrier(16)
+
+    def _work(_):
+        barrier.wait()
+        task_id = api.task._generate_task_id()
+        assert api.task._generate_task_id() == task_id
+        return task_id
+
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        task_ids = list(executor.map(_work, range(16)))
+    assert sorted(task_ids) == list(range(1, 17))
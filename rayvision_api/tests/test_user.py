@@ -1,10 +1,15 @@
 """Test rayvision_api.UserOperator.UserOperator functions."""
 
+import logging
+import re
+
 # pylint: disable=import-error
 import pytest
 
+from rayvision_api import RayvisionAPI
 from rayvision_api.exception import RayvisionAPIError
 from rayvision_api.operators import UserOperator
+from rayvision_api.user_cache import UserInfoCache
 
 
 @pytest.fixture()
@@ -58,3 +63,62 @@ def test_update_user_setting(user_operator, mock_requests):
         task_over_time = 2582
         user_operator.update_user_settings(task_over_time)
     assert 'Update UserOperator setting failed.' in str(str(err.value))
+
+
+@pytest.fixture()
+def mock_login(requests_mock, user_info_dict):
+    """Simulate the three login APIs."""
+    responses = {
+        'queryUserProfile': {'userId': 10001136, 'userName': 'rayvision'},
+        'queryUserSetting': {'taskOverTime': 12},
+        'getBid': {'config_bid': '30201'},
+    }
+    return dict(
+        (name, requests_mock.register_uri(
+            'POST', re.compile('.+{}.+{}'.format(user_info_dict['domain'],
+                                                 name)),
+            json={'code': 200, 'message': 'success', 'data': data}))
+        for name, data in responses.items())
+
+
+def _create_api(user_info_dict, **kwargs):
+    return RayvisionAPI(access_id=user_info_dict['access_id'],
+                        access_key=user_info_dict['access_key'],
+                        domain=user_info_dict['domain'],
+                        platform=user_info_dict['platform'],
+                        logger=logging.getLogger(__name__), **kwargs)
+
+
+def test_login(user_info_dict, mock_login):
+    """Test the login merges the three responses."""
+    api = _create_api(user_info_dict)
+    assert api.user_info['user_id'] == 10001136
+    assert api.user_info['task_over_time'] == 12
+    assert api.user_info['config_bid'] == '30201'
+    assert all(matcher.call_count == 1 for matcher in mock_login.values())
+
+
+def test_lazy_login(user_info_dict, mock_login):
+    """Test the lazy login requests the user info on the first access."""
+    api = _create_api(user_info_dict, lazy_login=True)
+    assert all(matcher.call_count == 0 for matcher in mock_login.values())
+    assert api.user_info['user_name'] == 'rayvision'
+    assert api.user_info['config_bid'] == '30201'
+    assert all(matcher.call_count == 1 for matcher in mock_login.values())
+
+
+def test_login_cache(user_info_dict, mock_login, tmpdir):
+    """Test the cached user info is reused until it expires."""
+    now = [1000]
+    cache = UserInfoCache(str(tmpdir), ttl=60, clock=lambda: now[0])
+    _create_api(user_info_dict, user_info_cache=cache)
+    api = _create_api(user_info_dict, user_info_cache=cache)
+    assert api.user_info['user_id'] == 10001136
+    assert mock_login['queryUserProfile'].call_count == 1
+    assert user_info_dict['access_id'] not in tmpdir.listdir()[0].basename
+
+    now[0] += 60
+    _create_api(user_info_dict, user_info_cache=cache)
+    assert mock_login['queryUserProfile'].call_count == 2
+    assert cache.get(user_info_dict['access_id'], user_info_dict['domain'],
+                     'other') is None
@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+"""Test the rayvision_api.utils functions."""
+
+import json
+
+# pylint: disable=import-error
+import pytest
+
+from rayvision_api.exception import RayvisionError
+from rayvision_api.utils import add_upload_assets
+from rayvision_api.utils import append_to_upload
+from rayvision_api.utils import iter_upload_paths
+
+
+def _files(folder, count):
+    """Create the files, return their paths."""
+    paths = []
+    for index in range(count):
+        path = folder.join('texture_{}.png'.format(index))
+        path.write('')
+        paths.append(str(path).replace('\\', '/'))
+    return paths
+
+
+def _upload_json(tmpdir, assets):
+    path = tmpdir.join('upload.json')
+    path.write(json.dumps({'asset': assets}))
+    return str(path)
+
+
+def test_append_to_upload_dedupe(tmpdir):
+    """Test the files already in the upload json are skipped."""
+    paths = _files(tmpdir.mkdir('textures'), 5)
+    upload_path = _upload_json(tmpdir, [{'local': paths[0], 'server': 'x'}])
+    assert append_to_upload(paths + paths[1:3], upload_path) == 4
+    with open(upload_path) as file_obj:
+        assets = json.load(file_obj)['asset']
+    assert [asset['local'] for asset in assets] == paths
+    assert assets[0]['server'] == 'x'
+    assert append_to_upload(paths[2], upload_path) == 0
+
+
+def test_append_to_upload_generator(tmpdir):
+    """Test a generator of paths and the folders are consumed."""
+    folder = tmpdir.mkdir('textures')
+    paths = _files(folder, 3)
+    upload_path = _upload_json(tmpdir, [])
+    assert append_to_upload((path for path in paths), upload_path) == 3
+    assert append_to_upload(str(folder), upload_path) == 0
+
+
+def test_append_to_upload_missing(tmpdir):
+    """Test a missing file is raised unless the check is disabled."""
+    upload_path = _upload_json(tmpdir, [])
+    missing = str(tmpdir.join('missing.png')).replace('\\', '/')
+    with pytest.raises(RayvisionError):
+        append_to_upload([missing], upload_path)
+    assert append_to_upload([missing], upload_path, check_exists=False) == 1
+
+
+def test_add_upload_assets():
+    """Test the windows paths are converted for the server."""
+    upload_info = {}
+    assert add_upload_assets(upload_info, ['D:\\work\\a.jpg', 'D:/work/a.jpg'],
+                             check_exists=False) == 1
+    assert upload_info == {'asset': [{'local': 'D:/work/a.jpg',
+                                      'server': '/D/work/a.jpg'}]}
+
+
+def test_iter_upload_paths_type():
+    """Test the paths must be a string or an iterable."""
+    with pytest.raises(RayvisionError):
+        list(iter_upload_paths(1))
+
+
+@pytest.mark.parametrize('files_paths', [{'texture.png': 1}, 42])
+def test_iter_upload_paths_rejected(files_paths):
+    """Test the dicts and the scalars are not iterated over."""
+    with pytest.raises(RayvisionError):
+        list(iter_upload_paths(files_paths))
@@ -0,0 +1,71 @@
+"""Test the rayvision_api.validator functions."""
+
+import threading
+
+# pylint: disable=import-error
+import pytest
+
+from rayvision_api.validator import SchemaRegistry
+from rayvision_api.validator import validate_data
+
+
+@pytest.fixture()
+def registry():
+    """Get an empty schema registry."""
+    return SchemaRegistry()
+
+
+# pylint: disable=redefined-outer-name
+def test_schema_loaded_once(registry):
+    """Test the schema file is only read and compiled once."""
+    for _ in range(5):
+        validator = registry.get_validator('queryTaskInfo')
+        assert validator.validate({'taskIds': [1, 2]})
+    assert registry.stats == {'hits': 4, 'misses': 1, 'schemas': 1}
+
+
+def test_validator_per_thread(registry):
+    """Test every thread gets its own compiled validator."""
+    validators = []
+
+    def _get_validator():
+        validators.append(registry.get_validator('queryTaskInfo'))
+
+    threads = [threading.Thread(target=_get_validator) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(set(id(validator) for validator in validators)) == 4
+    assert registry.stats['misses'] == 1
+
+
+def test_preload(registry):
+    """Test we can load all the shipped schemas eagerly."""
+    registry.preload()
+    assert registry.stats['misses'] == registry.stats['schemas'] > 0
+
+
+def test_missing_schema(registry):
+    """Test an unknown schema raise a ``ValueError``."""
+    with pytest.raises(ValueError):
+        registry.get_schema('notExists')
+
+
+def test_empty_schema_cached(registry, tmpdir, monkeypatch):
+    """Test an empty schema file is read once and then hit."""
+    path = tmpdir.join('empty.yaml')
+    path.write('')
+    monkeypatch.setattr('rayvision_api.validator.get_schema_file',
+                        lambda schema_name: str(path))
+    for _ in range(3):
+        assert registry.get_schema('empty') is None
+    assert registry.stats == {'hits': 2, 'misses': 1, 'schemas': 1}
+
+
+def test_validate_data_failure():
+    """Test invalid data raise a ``ValueError``."""
+    assert validate_data({'taskIds': [1]}, 'queryTaskInfo') == {'taskIds': [1]}
+    with pytest.raises(ValueError) as err:
+        validate_data({'taskIds': 'abc'}, 'queryTaskInfo')
+    assert 'taskIds' in str(err.value)
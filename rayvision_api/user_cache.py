@@ -0,0 +1,98 @@
+"""Cache the user information on disk between the processes.
+
+The login requests the user profile, the user setting and the transfer bid,
+a short-lived process can reuse the information saved by a previous process
+instead of requesting them again.
+
+Example::
+
+    >>> api = RayvisionAPI(access_id="xxx", access_key="xxx",
+    ...                    user_info_cache=UserInfoCache(ttl=600))
+
+"""
+
+# Import built-in modules
+import hashlib
+import json
+import os
+import time
+
+# Import local modules
+from rayvision_api.file_operator import write_json_atomic
+from rayvision_api.paths import ensure_paths
+
+# The default folder of the cache files.
+DEFAULT_CACHE_FOLDER = os.path.join(os.path.expanduser('~'), '.rayvision',
+                                    'user_info')
+
+
+class UserInfoCache(object):
+    """The user information saved as json files, one file per account."""
+
+    def __init__(self, folder=None, ttl=3600, clock=time.time):
+        """Initialize instance.
+
+        Args:
+            folder (str, optional): The folder of the cache files.
+            ttl (int, optional): Seconds the information is valid.
+            clock (callable, optional): Get the current timestamp.
+
+        """
+        self.folder = folder or DEFAULT_CACHE_FOLDER
+        self.ttl = ttl
+        self._clock = clock
+
+    def path(self, access_id, domain, platform):
+        """Get the cache file of an account.
+
+        The access id is hashed, so it does not appear in the file names.
+
+        Returns:
+            str: The path of the cache file.
+
+        """
+        key = u'{}|{}|{}'.format(access_id, domain, platform)
+        digest = hashlib.sha256(key.encode('utf-8')).hexdigest()
+        return os.path.join(self.folder, '{}.json'.format(digest))
+
+    def get(self, access_id, domain, platform):
+        """Get the cached user information.
+
+        Returns:
+            dict: The user information, None if it is missing, expired or
+                unreadable.
+
+        """
+        try:
+            with open(self.path(access_id, domain, platform)) as file_obj:
+                cached = json.load(file_obj)
+        except (IOError, OSError, ValueError):
+            return None
+        if not isinstance(cached, dict) or cached.get('expires', 0) <= self._clock():
+            return None
+        return cached.get('info')
+
+    def set(self, access_id, domain, platform, info):
+        """Save the user information.
+
+        The file is written to a temporary file then renamed, so that a
+        concurrent process never reads a partial file, and it is only
+        readable by the current user.
+
+        Args:
+            access_id (str): The access id of API.
+            domain (str): The domain address of the API.
+            platform (str): The platform of renderFarm.
+            info (dict): The user information.
+
+        """
+        ensure_paths(self.folder)
+        write_json_atomic(self.path(access_id, domain, platform),
+                          {'expires': self._clock() + self.ttl, 'info': info})
+
+    def delete(self, access_id, domain, platform):
+        """Remove the cached user information of an account."""
+        try:
+            os.remove(self.path(access_id, domain, platform))
+        except OSError:
+            pass
@@ -15,6 +15,7 @@ import sys
 import time
 # import built-in models
 from builtins import bytes
+from past.builtins import basestring
 
 from .exception import RayvisionError
 
@@ -350,13 +351,27 @@ def update_task_info(update_info, task_path):
         task_path ( str or dict): task.json absolute path or dict info.
     """
     task_info = check_and_read(task_path)
+    apply_task_info_update(update_info, task_info)
+    json_save(task_path, task_info)
+
+
+def apply_task_info_update(update_info, task_info):
+    """Update the task Settings of the task information in memory.
+
+    Args:
+        update_info (dict): Information that needs to be updated.
+        task_info (dict): The content of task.json.
+
+    Raises:
+        RayvisionError: A setting to update does not exist.
+
+    """
     for update_key in update_info.keys():
         if update_key not in task_info.get("task_info"):
             raise RayvisionError(1000002,
                                  "{} does not exist in the task setting and cannot be updated".format(update_key))
 
     task_info["task_info"].update(update_info)
-    json_save(task_path, task_info)
 
 
 def append_to_task(additional_info, task_path, cover=True):
@@ -437,12 +452,83 @@ def extract_file(files_path):
         RayvisionError(1000005, "files_paths must be type for list or string")
 
 
-def append_to_upload(files_paths, upload_path):
+def iter_upload_paths(files_paths):
+    """Iterate over the files to upload, the folders are walked lazily.
+
+    Args:
+        files_paths (str or iterable of str): A file or folder path, or any
+            iterable of them, e.g. a generator.
+
+    Yields:
+        str: The file paths.
+
+    Raises:
+        RayvisionError: The paths are neither a string nor an iterable of
+            paths, e.g. a dict.
+
+    """
+    if isinstance(files_paths, basestring):
+        files_paths = [files_paths]
+    elif isinstance(files_paths, dict) or not hasattr(files_paths, '__iter__'):
+        raise RayvisionError(1000005, "files_paths must be type for list or string")
+    for path in files_paths:
+        if os.path.isdir(path):
+            for root, _, files in os.walk(path):
+                for name in files:
+                    yield os.path.normpath(os.path.join(root, name))
+        else:
+            yield path
+
+
+def add_upload_assets(upload_info, files_paths, check_exists=True):
+    """Add the files missing from the upload information in one pass.
+
+    The uploaded ``local`` paths are indexed in a set, so each path is
+    checked in constant time instead of scanning the assets.
+
+    Args:
+        upload_info (dict): Upload json info.
+        files_paths (str or iterable of str): The files or folders to add,
+            see ``iter_upload_paths``.
+        check_exists (bool, optional): Raise if a file does not exist.
+
+    Returns:
+        int: The number of assets added.
+
+    """
+    assets = upload_info.setdefault("asset", [])
+    uploaded = set(asset["local"] for asset in assets)
+    added = 0
+    for files_path in iter_upload_paths(files_paths):
+        files_path = files_path.replace("\\", "/")
+        if check_exists and not os.path.exists(files_path):
+            raise RayvisionError(1000004,
+                                 "{} is not exist".format(files_path))
+        if files_path in uploaded:
+            continue
+        uploaded.add(files_path)
+        assets.append({
+            "local": files_path,
+            "server": convert_path(files_path),
+        })
+        added += 1
+    return added
+
+
+def append_to_upload(files_paths, upload_path, check_exists=True):
     """Add the asset information you need to upload to upload_info.
 
+    The upload json is read once and written once, whatever the number of
+    paths.
+
     Args:
-        files_paths (str or list): You need to add the uploaded asset path.
+        files_paths (str or iterable of str): You need to add the uploaded
+            asset path, a generator of paths is consumed lazily.
         upload_path (str): Upload json path.
+        check_exists (bool, optional): Raise if a file does not exist.
+
+    Returns:
+        int: The number of assets added.
 
     """
     try:
@@ -455,23 +541,10 @@ def append_to_upload(files_paths, upload_path):
         upload_info = {
             "asset": []
         }
-    upload_files = extract_file(files_paths)
-    for files_path in upload_files:
-        files_path = files_path.replace("\\", "/")
-        if not os.path.exists(files_path):
-            raise RayvisionError(1000004,
-                                 "{} is not exist".format(files_path))
-
-        status = check_upload_file(files_path, upload_info)
-        if status:
-            continue
-
-        upload_info.get("asset", []).append({
-            "local": files_path.replace("\\", "/"),
-            "server": convert_path(files_path),
-        })
-
+    added = add_upload_assets(upload_info, files_paths,
+                              check_exists=check_exists)
     json_save(upload_path, upload_info)
+    return added
 
 
 def exists_or_create(folder):
@@ -1,5 +1,7 @@
 # Import built-in modules
+import os
 from pprint import pformat
+import threading
 
 # Import third-party modules
 from cerberus import Validator
@@ -7,25 +9,146 @@ from cerberus import Validator
 # Import local modules
 from rayvision_api.file_operator import read_yaml
 from rayvision_api.paths import get_schema_file
+from rayvision_api.paths import package_root
+
+# The default of the schema lookups, an empty schema file is cached as None.
+_MISSING = object()
+
+
+class SchemaRegistry(object):
+    """Process-wide cache of the request schemas.
+
+    Every schema is read from ``schemas/<name>.yaml`` and parsed only once.
+    The compiled cerberus ``Validator`` keeps per-call state (document,
+    errors), so each thread gets its own instance, compiled once per thread
+    and reused for all later calls.
+
+    """
+
+    def __init__(self):
+        """Initialize instance."""
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._schemas = {}
+        self._hits = 0
+        self._misses = 0
+
+    def get_schema(self, schema_name):
+        """Get the parsed schema by the given name.
+
+        Args:
+            schema_name (str): The name of the schema.
+
+        Returns:
+            dict: The schema data, None if the schema file is empty.
+
+        Raises:
+            ValueError: No schema file matches the given name.
+
+        """
+        schema = self._schemas.get(schema_name, _MISSING)
+        if schema is not _MISSING:
+            with self._lock:
+                self._hits += 1
+            return schema
+        with self._lock:
+            schema = self._schemas.get(schema_name, _MISSING)
+            if schema is not _MISSING:
+                self._hits += 1
+                return schema
+            try:
+                schema = read_yaml(get_schema_file(schema_name))
+            except IOError:
+                raise ValueError("No schema found that matches the current "
+                                 "{}.".format(schema_name))
+            self._misses += 1
+            self._schemas[schema_name] = schema
+            return schema
+
+    def get_validator(self, schema_name):
+        """Get the compiled validator of the current thread.
+
+        Args:
+            schema_name (str): The name of the schema.
+
+        Returns:
+            cerberus.Validator: The validator bound to the schema.
+
+        """
+        validators = getattr(self._local, "validators", None)
+        if validators is None:
+            validators = self._local.validators = {}
+        validator = validators.get(schema_name)
+        if validator is None:
+            validator = Validator(self.get_schema(schema_name))
+            validator.allow_unknown = True
+            validators[schema_name] = validator
+        else:
+            with self._lock:
+                self._hits += 1
+        return validator
+
+    def preload(self, schema_names=None):
+        """Load the schemas eagerly.
+
+        Args:
+            schema_names (list of str, optional): The schemas to load, all
+                the schemas shipped with the package by default.
+
+        """
+        if schema_names is None:
+            schema_dir = os.path.join(package_root(), "schemas")
+            schema_names = [os.path.splitext(name)[0]
+                            for name in os.listdir(schema_dir)
+                            if name.endswith(".yaml")]
+        for schema_name in schema_names:
+            self.get_schema(schema_name)
+
+    def clear(self):
+        """Drop all the cached schemas and reset the counters."""
+        with self._lock:
+            self._schemas = {}
+            self._local = threading.local()
+            self._hits = 0
+            self._misses = 0
+
+    @property
+    def stats(self):
+        """dict: The cache hit and miss counters.
+
+        e.g.:
+            {
+                "hits": 1520,
+                "misses": 6,
+                "schemas": 6
+            }
+
+        """
+        with self._lock:
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "schemas": len(self._schemas),
+            }
+
+
+# The schema registry shared by the whole process.
+SCHEMA_REGISTRY = SchemaRegistry()
 
 
 class DataValidator(object):
     """The validator of data."""
 
-    def __init__(self, data, schema_name, schema=None):
+    def __init__(self, data, schema_name, schema=None, registry=None):
         self._data = data
         self._schema_name = schema_name
         self._api_version = data.get("api_version", 1)
-        self._schema = schema or self._get_schema()
+        self._registry = registry or SCHEMA_REGISTRY
+        self._schema = schema
 
     def _get_schema(self):
         """dict: get the schema form current api version."""
-        file_path = get_schema_file(self._schema_name)
-        try:
-            return read_yaml(file_path)
-        except IOError:
-            raise ValueError("No schema found that matches the current "
-                             "{}.".format(self._schema_name))
+        return self._registry.get_schema(self._schema_name)
 
     def validate(self, ignore_required=False):
         """Validate itself against the internal schema.
@@ -38,8 +161,11 @@ class DataValidator(object):
             ValueError: If validation fails.
 
         """
-        validator = Validator(self._schema)
-        validator.allow_unknown = True
+        if self._schema is not None:
+            validator = Validator(self._schema)
+            validator.allow_unknown = True
+        else:
+            validator = self._registry.get_validator(self._schema_name)
 
         def _validate(dict_, update):
             """Run the actual validator.
@@ -25,6 +25,9 @@ setup(
     },
     entry_points={},
     install_requires=list(parse_requirements('requirements.txt')),
+    extras_require={
+        'aio': ['aiohttp>=3.6; python_version >= "3.6"'],
+    },
     classifiers=[
         'Programming Language :: Python',
         'Programming Language :: Python :: 2',